@@ -0,0 +1,205 @@
+# backend/benchmarks/load_test.py
+"""
+Offline load test: throughput and latency percentiles of the backend endpoints.
+
+The FastAPI app runs in-process (httpx ASGITransport, real lifespan: MCP session
+pools, tool discovery, warm-up) against local stand-ins for Ollama, the four MCP
+servers and the Nominatim / Open-Meteo / DuckDuckGo APIs (see stand_ins.py).
+Each scenario sends `--requests` requests from `--concurrency` closed-loop
+workers and reports requests/s, p50/p95/p99 latency, errors, and how many
+upstream and Ollama requests were made per endpoint request, which is where
+pooling, caching and coalescing regressions show up.
+
+Queries cycle through `--distinct` variants per scenario: fewer variants means
+more cache hits and coalescing.
+
+Usage (from backend/):
+    uv run python benchmarks/load_test.py --requests 200 --concurrency 16
+    uv run python benchmarks/load_test.py --ollama-latency 0.5 --tokens-per-second 30 --json run.json
+    uv run python benchmarks/load_test.py --compare baseline.json   # exit 1 if p95 regressed
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import os
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, List
+
+import httpx
+
+from stand_ins import FakeOllama, FakeUpstreams, LocalServer, build_mcp_stand_ins
+
+CITIES = [
+    "Paris", "Tokyo", "London", "Berlin", "Madrid", "Rome", "Oslo", "Cairo", "Lima", "Sydney",
+    "Toronto", "Nairobi", "Seoul", "Mumbai", "Dublin", "Vienna", "Prague", "Lisbon", "Athens", "Quito",
+]
+TOPICS = ["python", "rust", "fastapi", "ollama", "prometheus", "kubernetes", "sqlite", "httpx", "asyncio", "uvicorn"]
+
+
+def chat_body(i: int) -> Dict[str, Any]:
+    city, topic = CITIES[i % len(CITIES)], TOPICS[i % len(TOPICS)]
+    # Rule-routed weather, LLM-decided search, and a direct answer
+    queries = [f"weather in {city}", f"latest news about {topic}", f"hello, I am planning a trip to {city}"]
+    return {"message": queries[i % len(queries)]}
+
+
+def weather_body(i: int) -> Dict[str, Any]:
+    return {"location": CITIES[i % len(CITIES)]}
+
+
+def search_body(i: int) -> Dict[str, Any]:
+    return {"query": f"{TOPICS[i % len(TOPICS)]} release notes", "max_results": 5}
+
+
+SCENARIOS: Dict[str, tuple[str, Callable[[int], Dict[str, Any]]]] = {
+    "chat": ("/chat", chat_body),
+    "weather": ("/weather/get", weather_body),
+    "search": ("/search/get", search_body),
+}
+
+
+@dataclass
+class Result:
+    scenario: str
+    path: str
+    requests: int
+    errors: int
+    seconds: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    upstream_per_request: Dict[str, float] = field(default_factory=dict)
+
+
+def percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, name: str, total: int, concurrency: int, distinct: int,
+) -> tuple[Result, List[float]]:
+    path, body = SCENARIOS[name]
+    latencies: List[float] = []
+    errors = 0
+    counter = itertools.count()
+
+    async def worker() -> None:
+        nonlocal errors
+        while (i := next(counter)) < total:
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json=body(i % distinct))
+                ok = response.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - start)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    seconds = time.perf_counter() - started
+
+    ms = sorted(x * 1000 for x in latencies)
+    result = Result(
+        scenario=name, path=path, requests=total, errors=errors, seconds=round(seconds, 3),
+        rps=round(total / seconds, 1), p50_ms=round(percentile(ms, 50), 2), p95_ms=round(percentile(ms, 95), 2),
+        p99_ms=round(percentile(ms, 99), 2), max_ms=round(ms[-1], 2) if ms else 0.0,
+    )
+    return result, ms
+
+
+def report(result: Result) -> None:
+    calls = "  ".join(f"{k}={v:.2f}" for k, v in sorted(result.upstream_per_request.items()) if v)
+    print(
+        f"{result.path:<14} n={result.requests:<5} err={result.errors:<4} {result.rps:8.1f} req/s  "
+        f"p50={result.p50_ms:8.2f}ms  p95={result.p95_ms:8.2f}ms  p99={result.p99_ms:8.2f}ms  max={result.max_ms:8.2f}ms"
+    )
+    print(f"{'':<14} upstream calls/request: {calls or 'none'}")
+
+
+def compare(results: List[Result], baseline_path: str, tolerance: float) -> bool:
+    """True if no scenario's p95 exceeds the baseline's by more than `tolerance` (fraction)."""
+    with open(baseline_path) as f:
+        baseline = {r["scenario"]: r for r in json.load(f)}
+    ok = True
+    for result in results:
+        base = baseline.get(result.scenario)
+        if base is None:
+            continue
+        limit = base["p95_ms"] * (1 + tolerance)
+        status = "ok" if result.p95_ms <= limit else "REGRESSION"
+        ok &= status == "ok"
+        print(f"{result.scenario:<8} p95 {result.p95_ms:8.2f}ms vs baseline {base['p95_ms']:8.2f}ms  {status}")
+    return ok
+
+
+async def run(args: argparse.Namespace) -> List[Result]:
+    ollama = FakeOllama(args.ollama_latency, args.tokens_per_second, args.answer_tokens)
+    upstreams = FakeUpstreams(args.upstream_latency)
+    ollama_server = LocalServer(ollama.app)
+    upstream_server = LocalServer(upstreams.app)
+    await ollama_server.start()
+    await upstream_server.start()
+    mcp_servers = {name: LocalServer(mcp.http_app()) for name, mcp in build_mcp_stand_ins(upstream_server.url).items()}
+    for server in mcp_servers.values():
+        await server.start()
+
+    # Point the backend at the stand-ins before it is imported (URLs are read at import time)
+    os.environ["MCP_SERVERS"] = ",".join(f"{name}={server.url}/mcp" for name, server in mcp_servers.items())
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    from backend.app import app
+    from backend.services import ollama_service
+
+    ollama_service.OLLAMA_URL = f"{ollama_server.url}/api/generate"
+    ollama_service.OLLAMA_CHAT_URL = f"{ollama_server.url}/api/chat"
+
+    results: List[Result] = []
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://backend", timeout=600) as client:
+            for name in args.scenarios:
+                before = {**upstreams.requests, **{f"ollama_{k}": v for k, v in ollama.requests.items()}}
+                result, _ = await run_scenario(client, name, args.requests, args.concurrency, args.distinct)
+                after = {**upstreams.requests, **{f"ollama_{k}": v for k, v in ollama.requests.items()}}
+                result.upstream_per_request = {
+                    k: (after[k] - before.get(k, 0)) / args.requests for k in after
+                }
+                report(result)
+                results.append(result)
+
+    for server in [*mcp_servers.values(), upstream_server, ollama_server]:
+        await server.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=200, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--distinct", type=int, default=60, help="distinct request bodies per scenario")
+    parser.add_argument("--ollama-latency", type=float, default=0.05, help="seconds of prompt evaluation")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--answer-tokens", type=int, default=40)
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="seconds per upstream API call")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier --json run")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p95 increase over the baseline")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
+    if args.compare and not compare(results, args.compare, args.tolerance):
+        sys.exit(1)
@@ -0,0 +1,84 @@
+# backend/benchmarks/mcp_pool_latency.py
+"""
+Per-call latency of MCP tool calls: fresh `Client` per call vs. pooled sessions.
+
+Starts a stand-in FastMCP server over streamable HTTP on localhost, then times
+N sequential tool calls both ways.
+
+Usage (from backend/):
+    uv run python benchmarks/mcp_pool_latency.py --calls 200
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import time
+
+import uvicorn
+from fastmcp import Client, FastMCP
+
+from backend.mcp.pool import MCPSessionPool
+
+
+def build_stand_in() -> FastMCP:
+    mcp = FastMCP("stand-in-mcp")
+
+    @mcp.tool
+    async def get_weather_tool(location: str) -> dict:
+        return {"location": location, "temperature_2m": 21.5}
+
+    return mcp
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def summarize(label: str, samples: list[float]) -> None:
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[int(len(ms) * 0.95) - 1]
+    print(f"{label:<14} mean={statistics.mean(ms):7.2f}ms  p50={statistics.median(ms):7.2f}ms  p95={p95:7.2f}ms")
+
+
+async def run(calls: int) -> None:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/mcp"
+    config = uvicorn.Config(build_stand_in().http_app(), host="127.0.0.1", port=port, log_level="warning")
+    server = uvicorn.Server(config)
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    args = {"location": "Paris"}
+
+    fresh = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        async with Client(url) as client:
+            await client.call_tool("get_weather_tool", args)
+        fresh.append(time.perf_counter() - start)
+
+    pool = MCPSessionPool("stand-in", url)
+    await pool.start()
+    pooled = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        async with pool.session() as client:
+            await client.call_tool("get_weather_tool", args)
+        pooled.append(time.perf_counter() - start)
+    await pool.close()
+
+    summarize("fresh client", fresh)
+    summarize("pooled", pooled)
+    print(f"speedup (mean)  {statistics.mean(fresh) / statistics.mean(pooled):.1f}x")
+
+    server.should_exit = True
+    await server_task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100)
+    asyncio.run(run(parser.parse_args().calls))
@@ -0,0 +1,185 @@
+# backend/benchmarks/model_routing.py
+"""
+Decision accuracy and end-to-end latency per model setup, against a real Ollama.
+
+Each setup is `SYNTHESIS` (one model for both passes) or `DECISION>SYNTHESIS`
+(a small decision model that falls back to the synthesis model when its
+decision is unusable, see ChatOrchestrator.decision_model). Every setup
+answers the same fixed query set, whose expected tools are known. For each
+setup the script reports:
+
+  accuracy     final decision requested exactly the expected tools
+  first_pass   the decision model's own decision did (before any fallback)
+  fallback     share of queries retried on the synthesis model
+  decision     p50 / p95 of the decision pass, fallback included
+  e2e          p50 / p95 of process_query (decision, tool calls, synthesis)
+
+The MCP tools are the in-memory stand-ins from stand_ins.py (upstream APIs
+faked on localhost), so only the LLM passes vary between setups. The
+pre-router and the response cache are disabled so that every query reaches
+the decision model.
+
+Usage (from backend/, with Ollama running and the models pulled):
+    uv run python benchmarks/model_routing.py --setups Qwen3:4b 'granite4:350m>Qwen3:4b' --rounds 3
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, FrozenSet, List, Optional
+
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from stand_ins import FakeUpstreams, LocalServer, build_mcp_stand_ins
+
+from backend.llm.orchestrator import ChatOrchestrator, _tool_calls
+from backend.llm.pre_router import PreRouter
+from backend.llm.response_cache import ResponseCache
+from backend.mcp.manager import MCPManager
+from backend.mcp.pool import MCPSessionPool
+from backend.services import ollama_service
+
+WEATHER, GEOCODE, CLOCK, SEARCH = "get_weather_tool", "geocode_tool", "get_current_datetime_tool", "web_search_tool"
+
+# (query, tools the decision should request); an empty set means a direct answer
+QUERIES: List[tuple[str, FrozenSet[str]]] = [
+    ("what's the weather like in Lisbon right now?", frozenset({WEATHER})),
+    ("do I need an umbrella in Seattle today?", frozenset({WEATHER})),
+    ("how cold is it in Oslo and in Helsinki?", frozenset({WEATHER})),
+    ("latitude and longitude of Machu Picchu", frozenset({GEOCODE})),
+    ("where exactly is the Sydney Opera House?", frozenset({GEOCODE})),
+    ("what is today's date?", frozenset({CLOCK})),
+    ("what time is it?", frozenset({CLOCK})),
+    ("latest news about the James Webb telescope", frozenset({SEARCH})),
+    ("who won the most recent Tour de France?", frozenset({SEARCH})),
+    ("what's new in Python 3.14?", frozenset({SEARCH})),
+    ("is it raining in Dublin, and what time is it there?", frozenset({WEATHER, CLOCK})),
+    ("tell me a joke about cats", frozenset()),
+    ("what is 17 times 23?", frozenset()),
+    ("translate 'good morning' into Spanish", frozenset()),
+]
+
+
+@dataclass
+class SetupResult:
+    setup: str
+    queries: int
+    accuracy: float
+    first_pass: float
+    fallback: float
+    decision_p50_ms: float
+    decision_p95_ms: float
+    e2e_p50_ms: float
+    e2e_p95_ms: float
+
+
+class MeasuredOrchestrator(ChatOrchestrator):
+    """Records every decision pass of the last query: (model, parsed decision, seconds)."""
+
+    passes: List[tuple[str, Any, float]]
+
+    async def _run_decision(self, model_name: str, *args, **kwargs) -> Optional[Dict[str, Any]]:
+        started = time.perf_counter()
+        decision = await super()._run_decision(model_name, *args, **kwargs)
+        self.passes.append((model_name, decision, time.perf_counter() - started))
+        return decision
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile."""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1] if ordered else 0.0
+
+
+def requested_tools(orchestrator: ChatOrchestrator, decision: Any) -> Optional[FrozenSet[str]]:
+    """Canonical tool names a parsed decision asks for, or None if it is unusable."""
+    if orchestrator._decision_problem(decision) is not None:
+        return None
+    return frozenset(orchestrator.tool_registry.resolve(call.tool_name).name for call in _tool_calls(decision))
+
+
+async def run_setup(setup: str, manager: MCPManager, rounds: int) -> SetupResult:
+    decision_model, _, synthesis_model = setup.rpartition(">")
+    orchestrator = MeasuredOrchestrator(
+        model_name=synthesis_model,
+        decision_model=decision_model or None,
+        mcp_manager=manager,
+        pre_router=PreRouter(enabled=False),
+        response_cache=ResponseCache(),
+    )
+    await orchestrator.warm_up()
+
+    correct = first_correct = fallbacks = 0
+    decision_seconds: List[float] = []
+    e2e_seconds: List[float] = []
+    for _ in range(rounds):
+        for query, expected in QUERIES:
+            orchestrator.response_cache.clear()
+            orchestrator.passes = []
+            started = time.perf_counter()
+            await orchestrator.process_query(query)
+            e2e_seconds.append(time.perf_counter() - started)
+
+            decision_seconds.append(sum(seconds for _, _, seconds in orchestrator.passes))
+            fallbacks += len(orchestrator.passes) > 1
+            first_correct += requested_tools(orchestrator, orchestrator.passes[0][1]) == expected
+            correct += requested_tools(orchestrator, orchestrator.passes[-1][1]) == expected
+
+    total = rounds * len(QUERIES)
+    decision_ms = [s * 1000 for s in decision_seconds]
+    e2e_ms = [s * 1000 for s in e2e_seconds]
+    return SetupResult(
+        setup=setup, queries=total,
+        accuracy=round(correct / total, 3), first_pass=round(first_correct / total, 3),
+        fallback=round(fallbacks / total, 3),
+        decision_p50_ms=round(percentile(decision_ms, 50), 1), decision_p95_ms=round(percentile(decision_ms, 95), 1),
+        e2e_p50_ms=round(percentile(e2e_ms, 50), 1), e2e_p95_ms=round(percentile(e2e_ms, 95), 1),
+    )
+
+
+def report(result: SetupResult) -> None:
+    print(
+        f"{result.setup:<28} n={result.queries:<4} accuracy={result.accuracy:6.1%}  "
+        f"first_pass={result.first_pass:6.1%}  fallback={result.fallback:6.1%}  "
+        f"decision p50={result.decision_p50_ms:8.1f}ms p95={result.decision_p95_ms:8.1f}ms  "
+        f"e2e p50={result.e2e_p50_ms:8.1f}ms p95={result.e2e_p95_ms:8.1f}ms"
+    )
+
+
+async def run(args: argparse.Namespace) -> List[SetupResult]:
+    ollama_service.OLLAMA_URL = f"{args.url}/api/generate"
+    upstream_server = LocalServer(FakeUpstreams(args.upstream_latency).app)
+    await upstream_server.start()
+    manager = MCPManager()
+    manager.pools = {name: MCPSessionPool(name, mcp) for name, mcp in build_mcp_stand_ins(upstream_server.url).items()}
+
+    results: List[SetupResult] = []
+    try:
+        for setup in args.setups:
+            result = await run_setup(setup, manager, args.rounds)
+            report(result)
+            results.append(result)
+    finally:
+        await manager.close()
+        await ollama_service.close_ollama_client()
+        await upstream_server.stop()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:11434")
+    parser.add_argument("--setups", nargs="+", default=["Qwen3:4b", "granite4:350m>Qwen3:4b"],
+                        help="SYNTHESIS or DECISION>SYNTHESIS model names")
+    parser.add_argument("--rounds", type=int, default=3, help="passes over the query set per setup")
+    parser.add_argument("--upstream-latency", type=float, default=0.05, help="seconds per faked upstream API call")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([asdict(r) for r in results], f, indent=2)
@@ -0,0 +1,98 @@
+# backend/benchmarks/ollama_prefix_cache.py
+"""
+Prompt-eval vs. eval time of the tool-decision pass against a real Ollama.
+
+Runs the same set of queries three ways and reports Ollama's own timing fields
+(prompt_eval_count / prompt_eval_duration / eval_duration / load_duration):
+
+  cold     one flat prompt, keep_alive=0 (model unloaded after every request)
+  flat     one flat prompt with the query embedded, default keep_alive
+  prefix   static instructions as `system` + query as `prompt`, keep_alive pinned
+           (what ChatOrchestrator sends)
+
+A small prompt_eval_count in `prefix` mode means Ollama served the shared
+prefix from its KV cache and only evaluated the query.
+
+Usage (from backend/, with Ollama running):
+    uv run python benchmarks/ollama_prefix_cache.py --url http://localhost:11434 --model Qwen3:4b --rounds 3
+"""
+import argparse
+import asyncio
+import statistics
+
+import httpx
+
+from backend.llm.prompt_templates import TOOL_DECISION_PROMPT, TOOL_DECISION_SYSTEM_PROMPT
+from backend.mcp.manager import MCPManager
+from backend.mcp.registry import ToolRegistry, ToolSpec
+from backend.services.ollama_service import OLLAMA_KEEP_ALIVE
+
+QUERIES = [
+    "weather in Paris",
+    "what time is it in Tokyo?",
+    "coordinates of the Eiffel Tower",
+    "latest news about Python 3.14",
+    "tell me a joke",
+]
+
+
+def system_prompt() -> str:
+    """Decision system prompt rendered with the tools the stack normally exposes."""
+    registry = ToolRegistry(MCPManager())
+    registry.tools = {
+        spec.name: spec for spec in [
+            ToolSpec(server="weather", name="get_weather_tool", description="Return weather data for a location.",
+                     input_schema={"properties": {"location": {"type": "string"}}, "required": ["location"]}),
+            ToolSpec(server="geocoding", name="geocode_tool", description="Geocode an address.",
+                     input_schema={"properties": {"address": {"type": "string"}}, "required": ["address"]}),
+            ToolSpec(server="datetime", name="get_current_datetime_tool", description="Current date and time.",
+                     input_schema={"properties": {}}),
+            ToolSpec(server="ddgs", name="web_search_tool", description="Search the web.",
+                     input_schema={"properties": {"query": {"type": "string"}}, "required": ["query"]}),
+        ]
+    }
+    return TOOL_DECISION_SYSTEM_PROMPT.format(tools=registry.prompt_section())
+
+
+def payload(mode: str, model: str, query: str, system: str) -> dict:
+    user = TOOL_DECISION_PROMPT.format(user_query=query)
+    if mode == "prefix":
+        return {"model": model, "system": system, "prompt": user, "stream": False, "keep_alive": OLLAMA_KEEP_ALIVE}
+    body = {"model": model, "prompt": f"{system}\n\n{user}", "stream": False}
+    if mode == "cold":
+        body["keep_alive"] = 0
+    return body
+
+
+def report(mode: str, samples: list[dict]) -> None:
+    def mean_ms(field: str) -> float:
+        return statistics.mean(s.get(field, 0) for s in samples) / 1e6
+
+    tokens = statistics.mean(s.get("prompt_eval_count", 0) for s in samples)
+    print(
+        f"{mode:<7} prompt_tokens={tokens:7.1f}  prompt_eval={mean_ms('prompt_eval_duration'):8.1f}ms  "
+        f"eval={mean_ms('eval_duration'):8.1f}ms  load={mean_ms('load_duration'):8.1f}ms  "
+        f"total={mean_ms('total_duration'):8.1f}ms"
+    )
+
+
+async def run(url: str, model: str, rounds: int) -> None:
+    system = system_prompt()
+    async with httpx.AsyncClient(base_url=url, timeout=600) as client:
+        for mode in ("cold", "flat", "prefix"):
+            samples = []
+            for _ in range(rounds):
+                for query in QUERIES:
+                    response = await client.post("/api/generate", json=payload(mode, model, query, system))
+                    response.raise_for_status()
+                    samples.append(response.json())
+            report(mode, samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:11434")
+    parser.add_argument("--model", default="Qwen3:4b")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.model, args.rounds))
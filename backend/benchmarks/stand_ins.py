@@ -0,0 +1,261 @@
+# backend/benchmarks/stand_ins.py
+"""
+Local stand-ins for everything the backend talks to, for offline load tests.
+
+  FakeOllama      /api/generate (streaming and not) and /api/chat with a configurable
+                  prompt-eval latency and generation rate (tokens/s). Decision prompts
+                  get a JSON tool decision derived from the query; other prompts get a
+                  plain answer of `answer_tokens` tokens.
+  FakeUpstreams   Nominatim-, Open-Meteo- and DuckDuckGo-shaped JSON endpoints with a
+                  configurable latency, counting the requests they receive.
+  MCP stand-ins   FastMCP servers with the same tool names and arguments as the real
+                  weather / geocoding / ddgs / datetime servers, calling FakeUpstreams.
+
+The real MCP servers need their own dependencies (Open-Meteo's flatbuffer client,
+the DDGS scraper), so the stand-ins mirror their tool surface instead of importing them.
+Every stand-in is an ASGI app served by uvicorn on a free localhost port.
+"""
+import asyncio
+import json
+import re
+import socket
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+import uvicorn
+from fastmcp import Context, FastMCP
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LocalServer:
+    """An ASGI app served by uvicorn on 127.0.0.1 inside the current event loop."""
+
+    def __init__(self, app: Any, port: Optional[int] = None):
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        config = uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="on")
+        self._server = uvicorn.Server(config)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            if self._task.done():
+                self._task.result()  # surface bind errors
+            await asyncio.sleep(0.01)
+
+    async def stop(self) -> None:
+        self._server.should_exit = True
+        if self._task is not None:
+            await self._task
+
+
+# ---------------------------
+# Ollama
+# ---------------------------
+_QUERY = re.compile(r"Now process this user query:\s*(?P<query>.+)", re.S)
+_LOCATION = re.compile(r"\b(?:in|for|at)\s+(?P<location>[A-Za-z][\w\s,.'-]*?)[?.!]*$", re.I)
+
+
+def decide(query: str) -> Dict[str, Any]:
+    """The tool decision a well-behaved model would produce for the benchmark queries."""
+    lowered = query.lower()
+    if "weather" in lowered or "temperature" in lowered:
+        match = _LOCATION.search(query.strip())
+        location = match.group("location").strip() if match else "Paris"
+        return {"tool_required": True, "tool_name": "get_weather_tool", "arguments": {"location": location}, "final_answer": None}
+    if "time" in lowered or "date" in lowered:
+        return {"tool_required": True, "tool_name": "get_current_datetime_tool", "arguments": {}, "final_answer": None}
+    if any(word in lowered for word in ("search", "news", "latest", "who", "what")):
+        return {"tool_required": True, "tool_name": "web_search_tool", "arguments": {"query": query}, "final_answer": None}
+    return {"tool_required": False, "tool_name": None, "arguments": {}, "final_answer": "Hello! How can I help?"}
+
+
+class FakeOllama:
+    """
+    Args:
+        prompt_latency: Seconds before the first token (prompt evaluation)
+        tokens_per_second: Generation rate
+        answer_tokens: Length of non-decision answers
+    """
+
+    def __init__(self, prompt_latency: float = 0.05, tokens_per_second: float = 200.0, answer_tokens: int = 40):
+        self.prompt_latency = prompt_latency
+        self.tokens_per_second = tokens_per_second
+        self.answer_tokens = answer_tokens
+        self.requests: Counter = Counter()
+        self.app = Starlette(routes=[
+            Route("/api/generate", self.generate, methods=["POST"]),
+            Route("/api/chat", self.chat, methods=["POST"]),
+        ])
+
+    def _tokens(self, body: Dict[str, Any]) -> List[str]:
+        if "tool_required" in (body.get("system") or ""):
+            match = _QUERY.search(body.get("prompt", ""))
+            text = json.dumps(decide(match.group("query") if match else ""))
+            return re.findall(r"\S+\s*", text)
+        limit = (body.get("options") or {}).get("num_predict") or self.answer_tokens
+        return [f"token{i} " for i in range(min(limit, self.answer_tokens))]
+
+    def _timings(self, prompt: str, tokens: int, started: float) -> Dict[str, Any]:
+        return {
+            "done": True,
+            "total_duration": int((time.perf_counter() - started) * 1e9),
+            "load_duration": 0,
+            "prompt_eval_count": len(prompt) // 4,
+            "prompt_eval_duration": int(self.prompt_latency * 1e9),
+            "eval_count": tokens,
+            "eval_duration": int(tokens / self.tokens_per_second * 1e9),
+        }
+
+    async def generate(self, request: Request) -> Response:
+        started = time.perf_counter()
+        body = await request.json()
+        tokens = self._tokens(body)
+        self.requests["generate"] += 1
+        await asyncio.sleep(self.prompt_latency)
+
+        if not body.get("stream", True):
+            await asyncio.sleep(len(tokens) / self.tokens_per_second)
+            return JSONResponse({"response": "".join(tokens), **self._timings(body.get("prompt", ""), len(tokens), started)})
+
+        async def chunks():
+            for token in tokens:
+                await asyncio.sleep(1 / self.tokens_per_second)
+                yield json.dumps({"response": token, "done": False}) + "\n"
+            yield json.dumps({"response": "", **self._timings(body.get("prompt", ""), len(tokens), started)}) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    async def chat(self, request: Request) -> Response:
+        started = time.perf_counter()
+        body = await request.json()
+        self.requests["chat"] += 1
+        await asyncio.sleep(self.prompt_latency + self.answer_tokens / self.tokens_per_second)
+        content = " ".join(f"token{i}" for i in range(self.answer_tokens))
+        return JSONResponse({
+            "message": {"role": "assistant", "content": content},
+            **self._timings(json.dumps(body.get("messages", [])), self.answer_tokens, started),
+        })
+
+
+# ---------------------------
+# Upstream APIs
+# ---------------------------
+class FakeUpstreams:
+    """Nominatim (/nominatim/search), Open-Meteo (/open-meteo/forecast) and DuckDuckGo (/ddg/search)."""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.requests: Counter = Counter()
+        self.app = Starlette(routes=[
+            Route("/nominatim/search", self.nominatim),
+            Route("/open-meteo/forecast", self.open_meteo),
+            Route("/ddg/search", self.ddg),
+        ])
+
+    async def nominatim(self, request: Request) -> Response:
+        self.requests["nominatim"] += 1
+        await asyncio.sleep(self.latency)
+        q = request.query_params.get("q", "")
+        seed = sum(map(ord, q))
+        return JSONResponse([{
+            "display_name": q.title(),
+            "lat": str(seed % 180 - 90),
+            "lon": str(seed % 360 - 180),
+            "address": {"city": q.title(), "country": "Benchmark"},
+        }])
+
+    async def open_meteo(self, request: Request) -> Response:
+        self.requests["open_meteo"] += 1
+        await asyncio.sleep(self.latency)
+        return JSONResponse({"current": {
+            "temperature_2m": 18.5, "relative_humidity_2m": 60.0, "apparent_temperature": 17.9, "is_day": True,
+            "precipitation": 0.0, "rain": 0.0, "showers": 0.0, "snowfall": 0.0, "weather_code": 1,
+            "cloud_cover": 20.0, "pressure_msl": 1015.0, "surface_pressure": 1010.0,
+            "wind_speed_10m": 10.0, "wind_direction_10m": 180.0, "wind_gusts_10m": 20.0,
+        }})
+
+    async def ddg(self, request: Request) -> Response:
+        self.requests["ddg"] += 1
+        await asyncio.sleep(self.latency)
+        q = request.query_params.get("q", "")
+        n = int(request.query_params.get("max_results", 5))
+        return JSONResponse([
+            {"title": f"{q} result {i}", "href": f"https://example.com/{i}", "body": f"Snippet {i} about {q}."}
+            for i in range(n)
+        ])
+
+
+# ---------------------------
+# MCP servers
+# ---------------------------
+def build_mcp_stand_ins(upstream_url: str) -> Dict[str, FastMCP]:
+    """MCP servers named like the real ones ("weather", "geocoding", "ddgs", "datetime")."""
+    client = httpx.AsyncClient(base_url=upstream_url, timeout=30)
+
+    async def geocode(address: str) -> Dict[str, Any]:
+        response = await client.get("/nominatim/search", params={"q": address, "format": "json"})
+        first = response.json()[0]
+        return {"address": first["display_name"], "latitude": first["lat"], "longitude": first["lon"],
+                "country": first["address"]["country"], "city": first["address"]["city"], "state": None}
+
+    weather = FastMCP("weather-mcp")
+    geocoding = FastMCP("geocoding-mcp")
+    ddgs = FastMCP("ddgs-mcp")
+    clock = FastMCP("datetime-mcp")
+
+    @weather.tool
+    async def get_weather_tool(location: str):
+        """Return weather data for a location."""
+        coords = await geocode(location)
+        response = await client.get(
+            "/open-meteo/forecast", params={"latitude": coords["latitude"], "longitude": coords["longitude"]},
+        )
+        return {"location": location, "latitude": float(coords["latitude"]),
+                "longitude": float(coords["longitude"]), **response.json()}
+
+    @geocoding.tool
+    async def geocode_tool(address: str):
+        """Return geocoding data (latitude/longitude) for an address."""
+        return await geocode(address)
+
+    @ddgs.tool
+    async def web_search_tool(query: str, max_results: int = 5):
+        """DuckDuckGo web search. Returns title, link, and snippet for top results."""
+        response = await client.get("/ddg/search", params={"q": query, "max_results": max_results})
+        results = [{"title": r["title"], "link": r["href"], "snippet": r["body"]} for r in response.json()]
+        return {"query": query, "results": results, "total_results": len(results)}
+
+    @ddgs.tool
+    async def web_search_stream_tool(query: str, ctx: Context, max_results: int = 5):
+        """Streaming variant of web_search_tool: each progress notification carries the new results as a JSON list."""
+        # Two "engines" searched side by side, each reported as it answers
+        half = (max_results + 1) // 2
+        engines = [client.get("/ddg/search", params={"q": f"{query} {engine}", "max_results": half}) for engine in "ab"]
+        results = []
+        for finished in asyncio.as_completed(engines):
+            batch = [{"title": r["title"], "link": r["href"], "snippet": r["body"]} for r in (await finished).json()]
+            batch = batch[:max_results - len(results)]
+            results.extend(batch)
+            await ctx.report_progress(len(results), max_results, json.dumps(batch))
+        return {"query": query, "results": results, "total_results": len(results)}
+
+    @clock.tool
+    async def get_current_datetime_tool():
+        """Return the current date and time in UTC."""
+        return datetime.now(timezone.utc).isoformat()
+
+    return {"weather": weather, "geocoding": geocoding, "ddgs": ddgs, "datetime": clock}
@@ -1,16 +1,55 @@
 # backend/src/backend/app.py
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
+from backend.logging_setup import bind_request, configure_logging, shutdown_logging
+from backend.mcp.manager import mcp_manager
+from backend.mcp.registry import tool_registry
+from backend.services.ollama_service import close_ollama_client
 from backend.routers.health import router as health_router
-from backend.routers.chat import router as chat_router
+from backend.routers.metrics import router as metrics_router
+from backend.routers.chat import router as chat_router, orchestrator as chat_orchestrator
 from backend.routers.search import router as search_router
 from backend.routers.weather import router as weather_router
 from backend.routers.geocoding import router as geocoding_router
 from backend.routers.datetime import router as datetime_router
 
-app = FastAPI(title="Ollama with MCP Backend")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Log records are written by a background thread, never on the event loop
+    configure_logging()
+    # Open pooled MCP sessions once at startup instead of per tool call
+    await mcp_manager.start()
+    # Discover tool names and schemas once the sessions are up
+    await tool_registry.refresh()
+    # Load the model and evaluate the static prompt prefixes in the background; requests are served meanwhile
+    warm_up = asyncio.create_task(chat_orchestrator.warm_up())
+    try:
+        yield
+    finally:
+        warm_up.cancel()
+        await tool_registry.close()
+        await mcp_manager.close()
+        await close_ollama_client()
+        shutdown_logging()
+
+
+app = FastAPI(title="Ollama with MCP Backend", lifespan=lifespan)
+
+
+@app.middleware("http")
+async def correlate_request(request: Request, call_next):
+    """Tag every log record of a request with its id (the client's X-Request-ID, or a new one)."""
+    request_id = bind_request(request.headers.get("X-Request-ID"))
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 
 # Include routers
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(chat_router)        # <-- updated chat endpoint
 app.include_router(search_router)
 app.include_router(weather_router)
@@ -0,0 +1,130 @@
+# backend/src/backend/llm/answer_templates.py
+"""
+Deterministic answers for structured tool outputs.
+
+For a timestamp or a pair of coordinates the synthesis pass only rephrases
+the tool output as a sentence, which costs a full LLM generation. The
+renderers here build that sentence from a template in microseconds instead.
+
+Renderers take the (compacted, see compaction.py) tool output and return
+None when it does not have the expected shape, in which case the
+orchestrator falls back to LLM synthesis. Which tools are answered this way
+by default is set by TEMPLATE_ANSWER_TOOLS (comma-separated MCP tool names);
+a request can force templates on or off.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.llm.compaction import WMO_CODES
+
+DEFAULT_TEMPLATE_TOOLS = frozenset(
+    name.strip()
+    for name in os.environ.get("TEMPLATE_ANSWER_TOOLS", "get_current_datetime_tool,geocode_tool").split(",")
+    if name.strip()
+)
+
+
+def _number(value: Any) -> str:
+    """18.0 -> '18', 18.5 -> '18.5'"""
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def _coordinate(value: float, positive: str, negative: str) -> str:
+    return f"{abs(value):.4f}° {positive if value >= 0 else negative}"
+
+
+def render_datetime(payload: Any) -> Optional[str]:
+    """'2026-10-17T14:05:09+00:00' -> 'It is 14:05 UTC on Saturday, 17 October 2026.'"""
+    value = payload.get("result") if isinstance(payload, dict) else payload
+    if not isinstance(value, str):
+        return None
+    moment = datetime.fromisoformat(value)
+    zone = moment.tzname() or "local time"
+    return f"It is {moment:%H:%M} {zone} on {moment:%A}, {moment.day} {moment:%B %Y}."
+
+
+def render_geocoding(payload: Any) -> Optional[str]:
+    """{'address': 'Paris, France', 'latitude': 48.8534, ...} -> 'Paris, France is at 48.8534° N, 2.3488° E.'"""
+    if not isinstance(payload, dict) or "latitude" not in payload or "longitude" not in payload:
+        return None
+    place = payload.get("address") or payload.get("city") or "The location"
+    latitude, longitude = float(payload["latitude"]), float(payload["longitude"])
+    return f"{place} is at {_coordinate(latitude, 'N', 'S')}, {_coordinate(longitude, 'E', 'W')}."
+
+
+def _render_current_weather(payload: Dict[str, Any]) -> Optional[str]:
+    if "error" in payload:
+        return f"Weather for {payload.get('location') or 'that location'} is unavailable: {payload['error']}."
+    current = payload.get("current")
+    if not isinstance(current, dict) or "temperature_c" not in current:
+        return None
+
+    conditions = current.get("conditions")
+    if conditions is None and "weather_code" in current:
+        conditions = WMO_CODES.get(int(current["weather_code"]))
+    sentence = f"In {payload.get('location') or 'that location'} it is currently {_number(current['temperature_c'])} °C"
+    if "feels_like_c" in current and current["feels_like_c"] != current["temperature_c"]:
+        sentence += f" (feels like {_number(current['feels_like_c'])} °C)"
+    if conditions:
+        sentence += f" with {conditions}"
+    sentence += "."
+
+    details: List[str] = []
+    if "humidity_pct" in current:
+        details.append(f"humidity is {_number(current['humidity_pct'])}%")
+    if "wind_kmh" in current:
+        wind = f"wind {_number(current['wind_kmh'])} km/h"
+        if current.get("wind_from"):
+            wind += f" from the {current['wind_from']}"
+        if current.get("wind_gusts_kmh"):
+            wind += f", gusting to {_number(current['wind_gusts_kmh'])} km/h"
+        details.append(wind)
+    if current.get("precipitation_mm"):
+        details.append(f"{_number(current['precipitation_mm'])} mm of precipitation")
+    if current.get("snowfall_cm"):
+        details.append(f"{_number(current['snowfall_cm'])} cm of snowfall")
+    if details:
+        text = "; ".join(details)
+        sentence += f" {text[0].upper()}{text[1:]}."
+    return sentence
+
+
+def render_weather(payload: Any) -> Optional[str]:
+    """get_weather_tool output, or get_weather_batch_tool's {"results": [...]} (one line per location)."""
+    if not isinstance(payload, dict):
+        return None
+    if isinstance(payload.get("results"), list):
+        lines = [_render_current_weather(item) if isinstance(item, dict) else None for item in payload["results"]]
+        return None if not lines or None in lines else "\n".join(lines)
+    return _render_current_weather(payload)
+
+
+RENDERERS: Dict[str, Callable[[Any], Optional[str]]] = {
+    "get_current_datetime_tool": render_datetime,
+    "geocode_tool": render_geocoding,
+    "get_weather_tool": render_weather,
+    "get_weather_batch_tool": render_weather,
+}
+
+
+def render_answer(tool_name: str, output: str) -> Optional[str]:
+    """
+    Template answer for one tool output, or None if the tool has no renderer,
+    the output is an error, or it does not have the expected shape.
+    """
+    renderer = RENDERERS.get(tool_name)
+    if renderer is None:
+        return None
+    try:
+        payload = json.loads(output)
+    except (TypeError, ValueError):
+        payload = output
+    if isinstance(payload, dict) and "error" in payload:
+        return None
+    try:
+        return renderer(payload)
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,230 @@
+# backend/src/backend/llm/compaction.py
+"""
+Tool-output compaction before the synthesis prompt.
+
+Tool payloads are pasted into the synthesis prompt, and on a CPU host prompt
+evaluation time grows with their length. `compact_tool_output` shrinks a
+payload in two steps:
+
+1. Per-tool rules (`COMPACTORS`, keyed by MCP tool name). Weather keeps the
+   fields an answer uses, renamed with their units and rounded to a useful
+   precision. Search drops empty and duplicate results and truncates
+   snippets. Geocoding drops empty fields and rounds the coordinates.
+2. A token budget. Trailing items of a "results" list are dropped until the
+   payload fits, keeping at least one. If it still does not fit, the text is
+   cut off.
+
+JSON is re-serialized without spaces and with non-ASCII characters kept
+as-is. Payloads that are not JSON only get the budget step. Errors are never
+rewritten.
+"""
+
+import json
+import re
+from typing import Any, Callable, Dict, List, NamedTuple
+
+from backend.llm.memory import estimate_tokens
+
+TOOL_OUTPUT_TOKEN_BUDGET = 400   # approx. tokens per tool call in the synthesis prompt
+SNIPPET_CHARS = 240              # search snippets are cut at a word boundary past this
+TRUNCATION_MARK = "…"
+
+# Open-Meteo field -> (name shown to the model, decimals). Fields not listed are dropped:
+# surface_pressure duplicates pressure_msl, rain/showers are included in precipitation.
+WEATHER_FIELDS: Dict[str, tuple[str, int]] = {
+    "temperature_2m": ("temperature_c", 1),
+    "apparent_temperature": ("feels_like_c", 1),
+    "relative_humidity_2m": ("humidity_pct", 0),
+    "precipitation": ("precipitation_mm", 1),
+    "snowfall": ("snowfall_cm", 1),
+    "cloud_cover": ("cloud_cover_pct", 0),
+    "pressure_msl": ("pressure_hpa", 0),
+    "wind_speed_10m": ("wind_kmh", 0),
+    "wind_gusts_10m": ("wind_gusts_kmh", 0),
+    "weather_code": ("weather_code", 0),
+    "is_day": ("is_day", 0),
+}
+WEATHER_OMIT_WHEN_ZERO = {"snowfall_cm"}
+COORDINATE_DECIMALS = 2          # ~1 km: plenty to name a place, and the weather is per grid cell
+GEOCODING_COORDINATE_DECIMALS = 4
+
+COMPASS = ("N", "NE", "E", "SE", "S", "SW", "W", "NW")
+
+# WMO weather interpretation codes, as used by Open-Meteo
+WMO_CODES: Dict[int, str] = {
+    0: "clear sky", 1: "mainly clear", 2: "partly cloudy", 3: "overcast",
+    45: "fog", 48: "depositing rime fog",
+    51: "light drizzle", 53: "moderate drizzle", 55: "dense drizzle",
+    56: "light freezing drizzle", 57: "dense freezing drizzle",
+    61: "slight rain", 63: "moderate rain", 65: "heavy rain",
+    66: "light freezing rain", 67: "heavy freezing rain",
+    71: "slight snowfall", 73: "moderate snowfall", 75: "heavy snowfall", 77: "snow grains",
+    80: "slight rain showers", 81: "moderate rain showers", 82: "violent rain showers",
+    85: "slight snow showers", 86: "heavy snow showers",
+    95: "thunderstorm", 96: "thunderstorm with slight hail", 99: "thunderstorm with heavy hail",
+}
+
+
+class Compaction(NamedTuple):
+    text: str
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_before - self.tokens_after)
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _round(value: Any, decimals: int) -> Any:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    return int(round(value)) if decimals == 0 else round(value, decimals)
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Cut `text` at the last word boundary before `limit` characters."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0] or text[:limit]
+    return cut.rstrip(" ,;:.") + TRUNCATION_MARK
+
+
+# ---------------------------
+# Per-tool rules
+# ---------------------------
+def _compact_current_weather(current: Dict[str, Any]) -> Dict[str, Any]:
+    compact: Dict[str, Any] = {}
+    for field, (name, decimals) in WEATHER_FIELDS.items():
+        if field not in current:
+            continue
+        value = _round(current[field], decimals)
+        if name in WEATHER_OMIT_WHEN_ZERO and not value:
+            continue
+        compact[name] = value
+    if "weather_code" in compact:
+        code = compact.pop("weather_code")
+        compact["conditions"] = WMO_CODES.get(code, f"WMO code {code}")
+    if "is_day" in compact:
+        compact["is_day"] = bool(compact["is_day"])
+    direction = current.get("wind_direction_10m")
+    if isinstance(direction, (int, float)):
+        compact["wind_from"] = COMPASS[int((direction % 360) / 45 + 0.5) % 8]
+    return compact
+
+
+def compact_weather(payload: Any) -> Any:
+    """get_weather_tool / get_weather_batch_tool output (a WeatherResponse, or {"results": [...]} of them)."""
+    if isinstance(payload, dict) and isinstance(payload.get("results"), list):
+        return {**payload, "results": [compact_weather(item) for item in payload["results"]]}
+    if not isinstance(payload, dict) or not isinstance(payload.get("current"), dict):
+        return payload
+    return {
+        "location": payload.get("location"),
+        "latitude": _round(payload.get("latitude"), COORDINATE_DECIMALS),
+        "longitude": _round(payload.get("longitude"), COORDINATE_DECIMALS),
+        "current": _compact_current_weather(payload["current"]),
+    }
+
+
+def _link_key(link: str) -> str:
+    return re.sub(r"^https?://(www\.)?", "", link.strip().lower()).rstrip("/")
+
+
+def compact_search(payload: Any) -> Any:
+    """web_search_tool output: no empty or duplicate results (same link or title), short snippets."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("results"), list):
+        return payload
+    results: List[Dict[str, Any]] = []
+    seen = set()
+    for item in payload["results"]:
+        if not isinstance(item, dict):
+            continue
+        title = " ".join(str(item.get("title") or "").split())
+        snippet = " ".join(str(item.get("snippet") or "").split())
+        link = str(item.get("link") or "")
+        if not title and not snippet:
+            continue
+        keys = {k for k in (_link_key(link), title.lower()) if k}
+        if keys & seen:
+            continue
+        seen |= keys
+        results.append({"title": title, "link": link, "snippet": _truncate(snippet, SNIPPET_CHARS)})
+
+    # total_results only restates len(results)
+    compact = {k: v for k, v in payload.items() if k not in ("results", "total_results")}
+    compact["results"] = results
+    return compact
+
+
+def compact_geocoding(payload: Any) -> Any:
+    """geocode_tool output: no empty fields, rounded coordinates."""
+    if not isinstance(payload, dict):
+        return payload
+    return {
+        k: _round(v, GEOCODING_COORDINATE_DECIMALS) if k in ("latitude", "longitude") else v
+        for k, v in payload.items()
+        if v not in (None, "")
+    }
+
+
+COMPACTORS: Dict[str, Callable[[Any], Any]] = {
+    "get_weather_tool": compact_weather,
+    "get_weather_batch_tool": compact_weather,
+    "web_search_tool": compact_search,
+    "web_search_stream_tool": compact_search,
+    "geocode_tool": compact_geocoding,
+}
+
+
+# ---------------------------
+# Budget
+# ---------------------------
+def _fit_to_budget(payload: Any, budget: int) -> str:
+    text = _dumps(payload)
+    if isinstance(payload, dict) and isinstance(payload.get("results"), list):
+        results = list(payload["results"])
+        while len(results) > 1 and estimate_tokens(text) > budget:
+            results.pop()
+            text = _dumps({**payload, "results": results})
+    return _cut(text, budget)
+
+
+def _cut(text: str, budget: int) -> str:
+    if estimate_tokens(text) <= budget:
+        return text
+    return text[: budget * 4] + TRUNCATION_MARK
+
+
+def compact_tool_output(tool_name: str, output: str, budget: int = TOOL_OUTPUT_TOKEN_BUDGET) -> Compaction:
+    """
+    Shrink one tool's output (as it would be pasted into the synthesis prompt).
+
+    Args:
+        tool_name: MCP tool name, selecting the rules in COMPACTORS
+        output: The tool output: JSON text, or any other text
+        budget: Approximate token limit for the result (0 disables the limit)
+    """
+    tokens_before = estimate_tokens(output)
+    try:
+        payload = json.loads(output)
+    except (TypeError, ValueError):
+        payload = None
+
+    if payload is None:
+        text = _cut(output, budget) if budget else output
+    elif isinstance(payload, dict) and "error" in payload:
+        text = output
+    else:
+        compactor = COMPACTORS.get(tool_name)
+        if compactor is not None:
+            payload = compactor(payload)
+        text = _fit_to_budget(payload, budget) if budget else _dumps(payload)
+
+    # Never make things worse (e.g. a short payload already in its most compact form)
+    if estimate_tokens(text) >= tokens_before:
+        text = output
+    return Compaction(text, tokens_before, estimate_tokens(text))
@@ -0,0 +1,234 @@
+# backend/src/backend/llm/memory.py
+"""
+Server-side conversation memory, keyed by session id.
+
+Each session keeps the most recent turns in a ring buffer. When the turns no
+longer fit the token budget, the oldest ones are folded into a rolling digest,
+so the context sent to the LLM stays bounded however long the conversation
+runs. The latest result of each tool is carried forward separately so a
+follow-up such as "and tomorrow?" can be resolved against the previous
+location without asking the user again.
+
+Sessions are evicted after `idle_ttl` seconds without use and the store holds
+at most `max_sessions` (least recently used first out).
+"""
+
+import json
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from backend.llm.schemas import ConversationTurn
+
+MAX_SESSIONS = 1000
+SESSION_IDLE_TTL = 30 * 60       # seconds
+MAX_TURNS = 20                   # ring buffer size per session
+TOKEN_BUDGET = 1500              # approx. tokens of recent turns before folding into the digest
+MAX_DIGEST_TOKENS = 400
+MAX_TURN_CHARS = 2000            # longer messages are truncated when stored
+MAX_TOOL_RESULTS = 5             # latest result per tool, at most this many tools
+MAX_TOOL_RESULT_CHARS = 600
+
+# Folds the turns leaving the window into the existing digest and returns the new digest
+Summarizer = Callable[[str, List[ConversationTurn]], str]
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token), good enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _truncate(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
+
+def extractive_summary(digest: str, turns: List[ConversationTurn]) -> str:
+    """Default summarizer: one short line per folded turn, oldest lines dropped past the cap."""
+    lines = digest.splitlines() if digest else []
+    for turn in turns:
+        line = f"- User asked: {_truncate(turn.user, 160)}"
+        if turn.tool_name:
+            line += f" (used {turn.tool_name})"
+        line += f" / Answer: {_truncate(turn.assistant, 200)}"
+        lines.append(line)
+    while lines and estimate_tokens("\n".join(lines)) > MAX_DIGEST_TOKENS:
+        lines.pop(0)
+    return "\n".join(lines)
+
+
+class ConversationSession:
+    """Turns, digest and carried-forward tool results of one conversation."""
+
+    def __init__(self, session_id: str, max_turns: int, now: float):
+        self.session_id = session_id
+        self.turns: Deque[ConversationTurn] = deque(maxlen=max_turns)
+        self.digest = ""
+        self.tool_results: "OrderedDict[str, str]" = OrderedDict()  # tool -> latest (truncated) output
+        self.last_used = now
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def is_empty(self) -> bool:
+        return not self.turns and not self.digest
+
+    def turn_tokens(self) -> int:
+        return sum(estimate_tokens(t.user) + estimate_tokens(t.assistant) for t in self.turns)
+
+    def render(self) -> str:
+        """Context block for prompts: digest, carried tool results, recent turns."""
+        parts: List[str] = []
+        if self.digest:
+            parts.append(f"Summary of earlier conversation:\n{self.digest}")
+        if self.tool_results:
+            results = "\n".join(f"- {tool}: {output}" for tool, output in self.tool_results.items())
+            parts.append(f"Earlier tool results:\n{results}")
+        if self.turns:
+            recent = "\n".join(f"User: {t.user}\nAssistant: {t.assistant}" for t in self.turns)
+            parts.append(f"Recent turns:\n{recent}")
+        return "\n\n".join(parts)
+
+
+class SessionStore:
+    """
+    Bounded store of conversation sessions.
+
+    Args:
+        max_sessions: Sessions kept at once (least recently used evicted first)
+        idle_ttl: Seconds of inactivity after which a session is dropped
+        max_turns: Recent turns kept verbatim per session
+        token_budget: Approximate tokens of verbatim turns before the oldest are summarized
+        summarizer: Folds old turns into the digest (default: extractive, no LLM call)
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = MAX_SESSIONS,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        max_turns: int = MAX_TURNS,
+        token_budget: int = TOKEN_BUDGET,
+        summarizer: Optional[Summarizer] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_sessions = max_sessions
+        self.idle_ttl = idle_ttl
+        self.max_turns = max_turns
+        self.token_budget = token_budget
+        self.summarizer = summarizer or extractive_summary
+        self._clock = clock
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()  # LRU order
+
+        self.evicted_idle = 0
+        self.evicted_lru = 0
+        self.summarized_turns = 0
+
+    @staticmethod
+    def new_session_id() -> str:
+        return uuid.uuid4().hex
+
+    def get(self, session_id: str) -> ConversationSession:
+        """Return the session, creating it if needed, and mark it as used."""
+        now = self._clock()
+        self._evict_idle(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = ConversationSession(session_id, self.max_turns, now)
+            self._sessions[session_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted_lru += 1
+        else:
+            self._sessions.move_to_end(session_id)
+        session.last_used = now
+        return session
+
+    def context(self, session_id: Optional[str]) -> str:
+        """Prompt context for the session ("" for new or missing sessions)."""
+        if not session_id:
+            return ""
+        return self.get(session_id).render()
+
+    def append(
+        self,
+        session_id: Optional[str],
+        user: str,
+        assistant: str,
+        tool_name: Optional[str] = None,
+        tool_response: Optional[Any] = None,
+    ) -> None:
+        """Record a finished turn; fold old turns into the digest when over budget."""
+        if not session_id:
+            return
+        session = self.get(session_id)
+
+        if len(session.turns) == session.turns.maxlen:
+            # The ring buffer is about to drop the oldest turn: keep its gist
+            self._fold(session, [session.turns[0]])
+        session.turns.append(ConversationTurn(
+            user=_truncate(user, MAX_TURN_CHARS),
+            assistant=_truncate(assistant or "", MAX_TURN_CHARS),
+            tool_name=tool_name,
+        ))
+
+        if tool_name and tool_response is not None:
+            output = tool_response if isinstance(tool_response, str) else json.dumps(tool_response, default=str)
+            session.tool_results[tool_name] = _truncate(output, MAX_TOOL_RESULT_CHARS)
+            session.tool_results.move_to_end(tool_name)
+            while len(session.tool_results) > MAX_TOOL_RESULTS:
+                session.tool_results.popitem(last=False)
+
+        folded: List[ConversationTurn] = []
+        while len(session.turns) > 1 and session.turn_tokens() > self.token_budget:
+            folded.append(session.turns.popleft())
+        if folded:
+            self._fold(session, folded)
+
+    def seed(self, session_id: str, history: List[Dict[str, Any]]) -> None:
+        """Populate an empty session from client-side history ([{"role", "content"}, ...])."""
+        session = self.get(session_id)
+        if not session.is_empty():
+            return
+        pending_user: Optional[str] = None
+        for message in history or []:
+            role, content = message.get("role"), message.get("content")
+            if not isinstance(content, str):
+                continue
+            if role == "user":
+                pending_user = content
+            elif role == "assistant" and pending_user is not None:
+                self.append(session_id, pending_user, content)
+                pending_user = None
+
+    def _fold(self, session: ConversationSession, turns: List[ConversationTurn]) -> None:
+        session.digest = self.summarizer(session.digest, turns)
+        self.summarized_turns += len(turns)
+
+    def _evict_idle(self, now: float) -> None:
+        # Sessions are kept in last-used order, so idle ones sit at the front
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if now - oldest.last_used < self.idle_ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.evicted_idle += 1
+
+    def clear(self, session_id: str) -> None:
+        self._sessions.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self._sessions),
+            "evicted_idle": self.evicted_idle,
+            "evicted_lru": self.evicted_lru,
+            "summarized_turns": self.summarized_turns,
+        }
+
+
+# ---------------------------
+# Shared store used by the chat endpoints
+# ---------------------------
+session_store = SessionStore()
@@ -1,42 +1,123 @@
 # backend/src/backend/llm/orchestrator.py
 
+import asyncio
 import json
 import logging
-from typing import Any, Dict
-
-from backend.llm.prompt_templates import TOOL_DECISION_PROMPT, FINAL_ANSWER_PROMPT
-from fastmcp import Client
+import os
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+
+from pydantic import ValidationError
+
+from backend.llm.answer_templates import DEFAULT_TEMPLATE_TOOLS, render_answer
+from backend.llm.compaction import TOOL_OUTPUT_TOKEN_BUDGET, compact_tool_output
+from backend.llm.memory import SessionStore, estimate_tokens, session_store as shared_session_store
+from backend.llm.prompt_templates import (
+    CONVERSATION_CONTEXT_PROMPT,
+    FINAL_ANSWER_PROMPT,
+    FINAL_ANSWER_SYSTEM_PROMPT,
+    MULTI_TOOL_ANSWER_PROMPT,
+    TOOL_DECISION_PROMPT,
+    TOOL_DECISION_SYSTEM_PROMPT,
+)
+from backend.llm.pre_router import PreRouter
+from backend.llm.response_cache import ResponseCache
+from backend.llm.schemas import PreparedTurn, ToolCall, ToolDecision
+from backend.llm.speculation import Speculation
+from backend.logging_setup import log_payload
 from fastmcp.client.client import CallToolResult
-from backend.mcp.manager import MCPManager
-from backend.services.ollama_service import chat_with_ollama
+from backend.mcp.manager import MCPManager, mcp_manager as shared_mcp_manager
+from backend.metrics import (
+    CHAT_REQUEST_SECONDS,
+    COMPACTION_TOKENS_SAVED,
+    DECISION_FALLBACKS,
+    MCP_CALL_SECONDS,
+    TOOL_OUTPUT_TOKENS,
+    observe_ollama,
+    stage_timer,
+)
+from backend.mcp.registry import ToolRegistry, ToolSpec, tool_registry as shared_tool_registry
+from backend.services.admission import Overloaded
+from backend.services.ollama_service import chat_with_ollama, stream_ollama, warm_ollama
 
 logger = logging.getLogger(__name__)
 DEFAULT_MODEL = "Qwen3:4b"
 
-# MCP server URLs
-MCP_SERVERS = {
-    "weather": "http://weather-mcp:50053/mcp",
-    "geocoding": "http://geocoding-mcp:50054/mcp",
-    "datetime": "http://datetime-mcp:50051/mcp",
-    #"searchxng": "http://searchxng-mcp:50052/mcp",
-    "ddgs": "http://ddgs-mcp:50052/mcp",  # ← Replace searchxng
-}
+# Per-stage models. The decision pass is a classification a small model can handle; a decision
+# it gets wrong (invalid JSON, fails ToolDecision validation, unknown tool) is retried on the
+# synthesis model. DECISION_MODEL unset: both passes use the synthesis model.
+SYNTHESIS_MODEL = os.environ.get("SYNTHESIS_MODEL", DEFAULT_MODEL)
+DECISION_MODEL = os.environ.get("DECISION_MODEL") or None
+
+# Compound queries may fan out to several tools; each call gets its own timeout
+MAX_TOOL_CALLS = 5
+TOOL_CALL_TIMEOUT = 30.0  # seconds
+
+# Tools with a streaming variant: synthesis starts once this many results are in,
+# and results past the token budget are not waited for (0 disables streaming)
+STREAM_TOP_K = 3
+STREAM_TOKEN_BUDGET = 800
+
+# Stream the decision pass and start side-effect-free tool calls as soon as their
+# arguments are complete (see speculation.py)
+SPECULATIVE_TOOL_CALLS = os.environ.get("SPECULATIVE_TOOL_CALLS", "0") == "1"
+
+# Streaming calls abandoned once enough results were in; kept referenced until they finish
+_background_calls: set = set()
+
+def _to_tool_decision(decision: Dict[str, Any]) -> ToolDecision:
+    """
+    ToolDecision from a raw decision dict; omitted keys default to empty.
+
+    Raises:
+        ValidationError: If a key has the wrong type.
+    """
+    return ToolDecision(
+        tool_required=bool(decision.get("tool_required")),
+        tool_name=decision.get("tool_name") or None,
+        arguments=decision.get("arguments") or {},
+        final_answer=decision.get("final_answer"),
+        tool_calls=decision.get("tool_calls") or [],
+    )
+
+
+def _tool_calls(decision: Dict[str, Any]) -> List[ToolCall]:
+    """Tool calls requested by a raw decision dict (single tool_name or a tool_calls list)."""
+    try:
+        return _to_tool_decision(decision).calls()
+    except ValidationError as e:
+        logger.error(f"Invalid tool calls in decision: {e}")
+        return []
+
+
+def _with_context(user_query: str, context: str) -> str:
+    """The user's message, preceded by the conversation so far when there is one."""
+    if not context:
+        return user_query
+    return CONVERSATION_CONTEXT_PROMPT.format(context=context, user_query=user_query)
 
 
-# Mapping from high-level tool_name to actual MCP function names
-TOOL_NAME_TO_MCP_FUNCTION = {
-    "weather": "get_weather_tool",      # ✅ Matches weather_mcp/server.py
-    "get_weather_tool": "get_weather_tool",      # ✅ Matches weather_mcp/server.py
-    "geocoding": "geocode_tool",        # ✅ Matches geocoding_mcp/server.py
-    "geocode_tool": "geocode_tool",        # ✅ Matches geocoding_mcp/server.py
-    "datetime": "get_current_datetime_tool", # ✅ Matches datetime_mcp/server.py
-    "get_current_datetime": "get_current_datetime_tool", # ✅ Matches datetime_mcp/server.py
-    #"searchxng": "search_web",          # ✅ Matches searchxng_mcp/server.py
-    #"search_web": "search_web",          # ✅ Matches searchxng_mcp/server.py
-    "ddgs": "web_search_tool",      # ← Replace searchxng
-    "web_search": "web_search_tool",
+def _observe_request(path: str, started: float) -> None:
+    CHAT_REQUEST_SECONDS.labels(path=path).observe(time.perf_counter() - started)
 
-}
+
+def _path_without_synthesis(turn: PreparedTurn) -> str:
+    """Metrics label for turns answered without a synthesis pass."""
+    if turn.templated:
+        return "template"
+    return "synthesis_cache" if turn.tool_name else "direct"
+
+
+def _finish_background_call(task: asyncio.Task) -> None:
+    _background_calls.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.debug("Abandoned streaming tool call failed: %s", task.exception())
+
+
+def _format_tool_result(result: Dict[str, Any]) -> str:
+    arguments = json.dumps(result["arguments"]) if result["arguments"] else "no arguments"
+    output = result.get("response", f"ERROR: {result.get('error')}")
+    return f"Tool '{result['tool_name']}' ({arguments}) returned:\n{output}"
 
 
 class ChatOrchestrator:
@@ -44,47 +125,216 @@ class ChatOrchestrator:
     Handles multi-step orchestration: user -> LLM -> tool -> LLM final answer
     """
 
-    def __init__(self, model_name: str = "Qwen3:4b"):
+    def __init__(
+        self,
+        model_name: str = SYNTHESIS_MODEL,
+        mcp_manager: MCPManager | None = None,
+        pre_router: PreRouter | None = None,
+        response_cache: ResponseCache | None = None,
+        tool_timeout: float = TOOL_CALL_TIMEOUT,
+        tool_registry: ToolRegistry | None = None,
+        memory: SessionStore | None = None,
+        stream_top_k: int = STREAM_TOP_K,
+        stream_token_budget: int = STREAM_TOKEN_BUDGET,
+        tool_output_budget: int = TOOL_OUTPUT_TOKEN_BUDGET,
+        template_tools: Iterable[str] = DEFAULT_TEMPLATE_TOOLS,
+        speculate: bool = SPECULATIVE_TOOL_CALLS,
+        decision_model: Optional[str] = DECISION_MODEL,
+    ):
+        # Synthesis model; also decides when there is no decision model, or when its decision is unusable
         self.model_name = model_name
-        print("in __init__")
-        self.mcp_manager = MCPManager()
-
-    async def process_query(self, user_query: str) -> str:
+        self.decision_model = decision_model or model_name
+        self.tool_timeout = tool_timeout
+        self.stream_top_k = stream_top_k
+        self.stream_token_budget = stream_token_budget
+        self.tool_output_budget = tool_output_budget
+        # Tools whose output is turned into the answer by a template instead of the synthesis LLM
+        self.template_tools = frozenset(template_tools)
+        # Start cacheable tool calls while the decision pass is still generating
+        self.speculate = speculate
+        # Share the app-wide manager so every orchestrator borrows from the same session pools
+        self.mcp_manager = mcp_manager or shared_mcp_manager
+        # Tool names, schemas and the decision prompt's tool list come from the MCP servers
+        if tool_registry is None:
+            tool_registry = shared_tool_registry if mcp_manager is None else ToolRegistry(self.mcp_manager)
+        self.tool_registry = tool_registry
+        # Rule-based fast path that can settle the tool decision without an LLM call
+        self.pre_router = pre_router or PreRouter()
+        # Answer / decision / synthesis caches with per-tool TTLs
+        self.response_cache = response_cache or ResponseCache()
+        # Per-session conversation memory (recent turns, digest, earlier tool results)
+        self.memory = memory if memory is not None else shared_session_store
+
+    async def process_query(
+        self, user_query: str, session_id: Optional[str] = None, template_answers: Optional[bool] = None,
+    ) -> str:
         """
         Process a user query through the LLM to decide on a tool call,
         execute the tool if required, and synthesize the final answer.
+
+        With a `session_id`, earlier turns of that conversation are given to the
+        LLM so follow-up questions ("and tomorrow?") resolve correctly.
+
+        `template_answers` overrides `template_tools` for this request: True
+        renders the answer from a template whenever the tools have one, False
+        always runs the synthesis pass.
         """
-        print("ChatOrchestrator user_query",user_query)
-        logger.info("\n==================== NEW REQUEST ====================")
-        logger.info(f"User Query: {user_query}")
+        started = time.perf_counter()
+        context = self.memory.context(session_id)
+
+        # Cached answers are keyed on the query alone, so they only apply without conversation context
+        cached_answer = None if context else self.response_cache.get_answer(user_query)
+        if cached_answer is not None:
+            logger.info("[ResponseCache] Answer cache hit")
+            self.memory.append(session_id, user_query, cached_answer)
+            _observe_request("answer_cache", started)
+            return cached_answer
+
+        turn = await self._prepare_turn(user_query, context, template_answers)
+        if turn.final_prompt is None:
+            self._remember_answer(user_query, turn, turn.final_answer, session_id, context)
+            _observe_request(_path_without_synthesis(turn), started)
+            return turn.final_answer
 
-        # 1. Build decision prompt for LLM
-        decision_prompt = TOOL_DECISION_PROMPT.format(user_query=user_query)
-        print(f"\n\n--- DECISION PROMPT SENT TO LLM ---\n{decision_prompt}\n\n")
+        # Step 7: Send tool output back to LLM for final synthesis
+        with stage_timer("synthesis_llm"):
+            final_response = await chat_with_ollama(turn.final_prompt, self.model_name, system=FINAL_ANSWER_SYSTEM_PROMPT)
+        observe_ollama("synthesis", final_response)
+        final_text = final_response.get("message", "")
 
+        log_payload(logger, "Final answer", final_text)
 
-        # 2. Call LLM to decide tool usage
-        #llm_response = await self.call_llm(decision_prompt)
-        llm_response = await chat_with_ollama(decision_prompt, self.model_name)
-        print(f"\n\n--- LLM RESPONSE WITH DECISION ---\n{llm_response}\n\n")
+        #return {"response": final_text, "tool_output": tool_output}
 
+        # Step 8: Direct answer
+        #return {"response": decision.final_answer or raw_message, "tool_output": tool_output}
 
-        # 3. Parse JSON safely
-        try:
-            #decision = json.loads(llm_response)
-            # Extract JSON string from Ollama response format
-            if isinstance(llm_response, dict):
-                llm_response = llm_response.get('message', '{}')
-            decision = json.loads(llm_response)
+        self._remember_answer(user_query, turn, final_text, session_id, context)
+        _observe_request("tool", started)
 
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to parse LLM decision JSON: {e}")
-            return "Sorry, I could not understand the request."
-        # 4. Check if tool_name exists (ignore tool_required)
-        tool_name = decision.get("tool_name")
-        if not tool_name:  # "", null, None
+        #return final_answer
+        return final_text
+
+    async def stream_query(
+        self, user_query: str, session_id: Optional[str] = None, template_answers: Optional[bool] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Same pipeline as process_query, but yields the final answer incrementally.
+
+        The decision pass and tool call run to completion first; the synthesis
+        pass is streamed token by token from Ollama. Answers that need no
+        synthesis (direct answers, cache hits, errors) are yielded as a single chunk.
+        """
+        started = time.perf_counter()
+        context = self.memory.context(session_id)
+
+        cached_answer = None if context else self.response_cache.get_answer(user_query)
+        if cached_answer is not None:
+            logger.info("[ResponseCache] Answer cache hit")
+            self.memory.append(session_id, user_query, cached_answer)
+            _observe_request("answer_cache", started)
+            yield cached_answer
+            return
+
+        turn = await self._prepare_turn(user_query, context, template_answers)
+        if turn.final_prompt is None:
+            self._remember_answer(user_query, turn, turn.final_answer, session_id, context)
+            _observe_request(_path_without_synthesis(turn), started)
+            yield turn.final_answer
+            return
+
+        tokens = []
+        timings: Dict[str, Any] = {}
+        with stage_timer("synthesis_llm"):
+            async for token in stream_ollama(
+                turn.final_prompt, self.model_name, system=FINAL_ANSWER_SYSTEM_PROMPT, timings=timings,
+            ):
+                tokens.append(token)
+                yield token
+        observe_ollama("synthesis", {"timings": timings})
+        self._remember_answer(user_query, turn, "".join(tokens), session_id, context)
+        _observe_request("tool", started)
+
+    def _remember_answer(
+        self,
+        user_query: str,
+        turn: PreparedTurn,
+        answer: str,
+        session_id: Optional[str] = None,
+        context: str = "",
+    ) -> None:
+        """
+        Record the turn in session memory, and cache answers that came from a
+        successful tool call (errors, answers built around a failed tool call,
+        direct answers, template answers and context-dependent answers are not cached).
+        """
+        self.memory.append(session_id, user_query, answer, turn.tool_name, turn.tool_response)
+        # Template answers are cheaper to render again than to cache
+        if not turn.tool_name or not answer or context or turn.templated or turn.degraded:
+            return
+        self.response_cache.put_synthesis(user_query, turn.tool_name, turn.tool_response, answer)
+        self.response_cache.put_answer(user_query, turn.tool_name, answer)
+
+    async def _prepare_turn(
+        self, user_query: str, context: str = "", template_answers: Optional[bool] = None,
+    ) -> PreparedTurn:
+        """
+        Run everything up to the synthesis pass: decision LLM call, JSON parse,
+        MCP tool call. Returns either a final answer (no synthesis needed) or
+        the synthesis prompt to send to the LLM.
+
+        `context` is the rendered conversation memory ("" for a fresh conversation);
+        it is shown to the LLM in both passes.
+
+        Tool outputs that a template can answer (see `_template_answer`) skip
+        the synthesis pass.
+
+        With `speculate`, the decision pass is streamed and tool calls it names
+        may already be running when it finishes; they are reused if the final
+        decision asks for exactly the same call.
+        """
+        logger.info("New query (%d chars, context=%s)", len(user_query), bool(context))
+        log_payload(logger, "User query", user_query)
+
+        # 1-3. Decide tool usage: rule-based fast path first, LLM decision pass otherwise
+        speculation: Optional[Speculation] = None
+        with stage_timer("pre_route"):
+            routed = self.pre_router.route(user_query)
+        if routed is not None:
+            logger.info(
+                f"[PreRouter] rule={routed.rule} tool={routed.decision.tool_name} "
+                f"confidence={routed.confidence:.2f} (skipping LLM decision pass)"
+            )
+            decision = routed.decision.model_dump()
+        else:
+            decision = None if context else self.response_cache.get_decision(user_query)
+            if decision is None:
+                if self.speculate:
+                    speculation = Speculation(self._execute_tool_call, self.tool_registry.resolve)
+                try:
+                    decision = await self._decide_with_llm(user_query, context, speculation)
+                except BaseException:
+                    # Overloaded, or the client went away: nothing will settle the speculative calls
+                    if speculation is not None:
+                        speculation.discard()
+                    raise
+                if decision is None:
+                    if speculation is not None:
+                        speculation.discard()
+                    return PreparedTurn(final_answer="Sorry, I could not understand the request.")
+                # Empty decisions (e.g. Ollama unreachable) are not worth remembering, and
+                # decisions for follow-ups depend on the conversation, not just the query
+                has_content = decision.get("tool_name") or decision.get("tool_calls") or decision.get("final_answer")
+                if has_content and not context:
+                    self.response_cache.put_decision(user_query, decision)
+
+        # 4. Collect the requested tool calls (ignore tool_required)
+        calls = _tool_calls(decision)
+        # Speculative calls the final decision asked for are reused; the others are discarded
+        started = speculation.settle(calls[:MAX_TOOL_CALLS]) if speculation is not None else []
+        if not calls:  # "", null, None
             final_answer = decision.get("final_answer")
-            return final_answer or "No specific answer available."
+            return PreparedTurn(final_answer=final_answer or "No specific answer available.")
 
         #tool_required = decision.get("tool_required", False)
 
@@ -92,33 +342,136 @@ class ChatOrchestrator:
         #    # No tool call – just return the LLM's direct answer
         #    return decision.get("final_answer", "Sorry, I have no answer.")
 
-        # 4. Map high-level tool name to MCP function
-        #tool_name = decision.get("tool_name")
-        mcp_function = TOOL_NAME_TO_MCP_FUNCTION.get(tool_name)
+        if len(calls) > MAX_TOOL_CALLS:
+            logger.warning(f"Decision requested {len(calls)} tool calls; keeping the first {MAX_TOOL_CALLS}")
+            calls = calls[:MAX_TOOL_CALLS]
+
+        # 5. Call the MCP tools concurrently on pooled sessions; wall-clock time is the slowest call
+        await self.tool_registry.ensure_fresh()
+        with stage_timer("tool_calls"):
+            started += [None] * (len(calls) - len(started))
+            results = await asyncio.gather(*(
+                task or self._execute_tool_call(call) for task, call in zip(started, calls)
+            ))
+        COMPACTION_TOKENS_SAVED.observe(sum(r.get("tokens_saved", 0) for r in results))
+
+        if len(results) == 1:
+            result = results[0]
+            if "error" in result:
+                return PreparedTurn(final_answer=result["error"])
+            tool_name = result["server"]
+            tool_response = result["response"]
+            final_prompt = FINAL_ANSWER_PROMPT.format(
+                user_message=_with_context(user_query, context),
+                tool_name=result["tool_name"],
+                tool_response=tool_response,
+            )
+        else:
+            if all("error" in r for r in results):
+                return PreparedTurn(final_answer=results[0]["error"])
+            tool_name = ",".join(r.get("server") or r["tool_name"] for r in results)
+            tool_response = json.dumps([{k: v for k, v in r.items() if k != "tokens_saved"} for r in results])
+            final_prompt = MULTI_TOOL_ANSWER_PROMPT.format(
+                user_message=_with_context(user_query, context),
+                tool_results="\n\n".join(_format_tool_result(r) for r in results),
+            )
 
-        if not mcp_function:
-            logger.error(f"No MCP function mapping found for tool_name={tool_name}")
-            return "Sorry, the requested tool is not available."
+        #final_answer = await self.call_llm(final_prompt)
+
+        # Structured lookups (time, coordinates) are answered from a template, not the LLM
+        templated = self._template_answer(results, template_answers)
+        if templated is not None:
+            return PreparedTurn(final_answer=templated, tool_name=tool_name, tool_response=tool_response, templated=True)
+
+        # A failed call (next to calls that succeeded) must not pin its error into the caches
+        degraded = any("error" in r for r in results)
+
+        # Same question, same tool output -> reuse the earlier synthesis
+        cached_synthesis = None
+        if not context and not degraded:
+            cached_synthesis = self.response_cache.get_synthesis(user_query, tool_name, tool_response)
+        if cached_synthesis is not None:
+            logger.info("[ResponseCache] Synthesis cache hit")
+            return PreparedTurn(final_answer=cached_synthesis, tool_name=tool_name, tool_response=tool_response)
 
-        mcp_url = MCP_SERVERS.get(tool_name)
-        if not mcp_url:
-            logger.error(f"No MCP server URL found for tool_name={tool_name}")
-            return "Sorry, the requested tool server is not available."
-        print("tool_name",tool_name,"mcp_function",mcp_function,"mcp_url",mcp_url)    
-        print("decision.get arguments, {}",decision.get("arguments", {}))
+        log_payload(logger, "Synthesis prompt", final_prompt)
 
-        # 5. Call the MCP tool
+        return PreparedTurn(
+            final_prompt=final_prompt,
+            tool_name=tool_name,
+            tool_response=tool_response,
+            degraded=degraded,
+        )
+
+    def _template_answer(self, results: List[Dict[str, Any]], template_answers: Optional[bool]) -> Optional[str]:
+        """
+        The answer rendered from templates, if every tool call succeeded and
+        has one (and templates are enabled for those tools or this request).
+        """
+        if template_answers is False:
+            return None
+        answers = []
+        for result in results:
+            if "error" in result:
+                return None
+            if template_answers is None and result["tool_name"] not in self.template_tools:
+                return None
+            answer = render_answer(result["tool_name"], result["response"])
+            if answer is None:
+                return None
+            answers.append(answer)
+        return "\n".join(answers)
+
+    async def _execute_tool_call(self, call: ToolCall) -> Dict[str, Any]:
+        """
+        Run one tool call with a timeout.
+
+        Returns {"tool_name", "server", "arguments", "response", "tokens_saved"}
+        on success, where "response" is the compacted output (see
+        llm/compaction.py), or the same with "error" (a user-facing message)
+        instead of "response".
+        """
+        result: Dict[str, Any] = {"tool_name": call.tool_name, "arguments": call.arguments}
+
+        # Resolve the requested name (tool name, alias or server name) to a discovered MCP tool
+        spec = self.tool_registry.resolve(call.tool_name)
+        if spec is None:
+            logger.error(f"No MCP tool found for tool_name={call.tool_name}")
+            return {**result, "error": "Sorry, the requested tool is not available."}
+
+        if spec.server not in self.mcp_manager.pools:
+            logger.error(f"No MCP server registered for tool_name={call.tool_name}")
+            return {**result, "error": "Sorry, the requested tool server is not available."}
+        result.update(tool_name=spec.name, server=spec.server)
+        logger.debug("Calling %s.%s", spec.server, spec.name)
+        log_payload(logger, "Tool arguments", call.arguments)
+
+        # Tools that stream their results return as soon as enough are in;
+        # identical concurrent calls to the others are coalesced by the manager
+        variant = self.tool_registry.streaming_variant(spec) if self.stream_top_k > 0 else None
+        if variant is not None:
+            spec = variant
+            pending = self._call_streaming(variant, call.arguments)
+        else:
+            pending = self.mcp_manager.call_tool_raw(spec.server, spec.name, call.arguments)
+
+        started = time.perf_counter()
+        outcome = "ok"
         try:
-            async with Client(mcp_url) as client:
-                mcp_response: CallToolResult = await client.call_tool(
-                    mcp_function,
-                    decision.get("arguments", {}) or {},
-                )
+            mcp_response: CallToolResult = await asyncio.wait_for(pending, timeout=self.tool_timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logger.error(f"MCP tool {spec.name} timed out after {self.tool_timeout}s")
+            return {**result, "error": f"Error executing tool: {spec.name} timed out"}
         except Exception as e:
+            outcome = "error"
             logger.error(f"Error calling MCP tool: {e}")
-            return f"Error executing tool: {e}"
+            return {**result, "error": f"Error executing tool: {e}"}
+        finally:
+            MCP_CALL_SECONDS.labels(server=spec.server, tool=spec.name, outcome=outcome).observe(
+                time.perf_counter() - started
+            )
 
-        # 6. Synthesize final answer using LLM
         tool_payload = mcp_response.structured_content or mcp_response.content
 
         # Handle FastMCP response types (TextContent, dict, etc.)
@@ -130,33 +483,193 @@ class ChatOrchestrator:
             tool_response = tool_payload if isinstance(tool_payload, str) else json.dumps(tool_payload)
         else:
             tool_response = str(tool_payload)
-            
-        final_prompt = FINAL_ANSWER_PROMPT.format(
-            user_message=user_query,
-            tool_name=tool_name,
-            tool_response=tool_response,
-        )
-
-        #final_answer = await self.call_llm(final_prompt)
 
+        # Only what the answer needs goes into the synthesis prompt
+        compaction = compact_tool_output(spec.name, tool_response, self.tool_output_budget)
+        TOOL_OUTPUT_TOKENS.labels(tool=spec.name, stage="raw").observe(compaction.tokens_before)
+        TOOL_OUTPUT_TOKENS.labels(tool=spec.name, stage="compacted").observe(compaction.tokens_after)
+        logger.debug(
+            "Compacted %s output: ~%d -> ~%d tokens", spec.name, compaction.tokens_before, compaction.tokens_after,
+        )
 
+        return {**result, "response": compaction.text, "tokens_saved": compaction.tokens_saved}
 
-        # Step 7: Send tool output back to LLM for final synthesis
-        print(f"\n--- FINAL SYNTHESIS PROMPT SENT TO LLM ---\n{final_prompt}\n")
+    async def _call_streaming(self, spec: ToolSpec, arguments: Dict[str, Any]) -> CallToolResult:
+        """
+        Call a streaming tool variant and return as soon as enough results are in.
+
+        Each progress notification's message is a JSON list of new results. Once
+        `stream_top_k` results have arrived, or the next one would exceed
+        `stream_token_budget`, the results so far are returned as
+        {"results": [...], "total_results": n, "partial": true} and the call is
+        left to finish in the background (on ddgs-mcp that fills its cache).
+        A call that completes first returns its full result.
+        """
+        results: List[Any] = []
+        tokens = 0
+        enough = asyncio.Event()
+
+        async def on_progress(progress: float, total: Optional[float], message: Optional[str]) -> None:
+            nonlocal tokens
+            if enough.is_set() or not message:
+                return
+            try:
+                batch = json.loads(message)
+            except json.JSONDecodeError:
+                logger.warning(f"Ignoring non-JSON progress message from {spec.name}")
+                return
+            for item in batch if isinstance(batch, list) else [batch]:
+                cost = estimate_tokens(json.dumps(item))
+                if results and tokens + cost > self.stream_token_budget:
+                    enough.set()
+                    return
+                results.append(item)
+                tokens += cost
+            if len(results) >= self.stream_top_k:
+                enough.set()
+
+        call = asyncio.create_task(
+            self.mcp_manager.call_tool_streaming(spec.server, spec.name, arguments, on_progress)
+        )
+        waiter = asyncio.create_task(enough.wait())
+        try:
+            await asyncio.wait({call, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            call.cancel()
+            raise
+        finally:
+            waiter.cancel()
+
+        if not enough.is_set():
+            return call.result()
+        if not call.done():
+            _background_calls.add(call)
+        call.add_done_callback(_finish_background_call)
+        logger.info(f"{spec.name}: synthesizing from {len(results)} streamed results (~{tokens} tokens)")
+        return CallToolResult(
+            content=[],
+            structured_content={"results": results, "total_results": len(results), "partial": True},
+            meta=None,
+        )
 
-        final_response = await chat_with_ollama(final_prompt, self.model_name)
-        final_text = final_response.get("message", "")
+    def decision_system_prompt(self) -> str:
+        """Static part of the decision prompt; changes only when the discovered tools change."""
+        return TOOL_DECISION_SYSTEM_PROMPT.format(tools=self.tool_registry.prompt_section())
+
+    async def warm_up(self) -> None:
+        """Load the models and pre-evaluate the decision and synthesis system prompts (run at startup)."""
+        await self.tool_registry.ensure_fresh()
+        decision_prompt = self.decision_system_prompt()
+        # The synthesis model also gets the decision prompt: it is the decision model's fallback
+        prompts = [
+            (self.decision_model, decision_prompt),
+            (self.model_name, decision_prompt),
+            (self.model_name, FINAL_ANSWER_SYSTEM_PROMPT),
+        ]
+        for model, system_prompt in dict.fromkeys(prompts):
+            await warm_ollama(model, system_prompt)
+
+    async def _decide_with_llm(
+        self, user_query: str, context: str = "", speculation: Optional[Speculation] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Ask the LLM which tool to use. Returns the parsed decision, or None if it is not valid JSON.
 
-        print(f"\n--- FINAL ANSWER FROM LLM ---\n{final_text}\n")
+        With a `speculation`, the decision is streamed into it as it is generated.
+        A decision from a separate `decision_model` that is unusable (see
+        `_decision_problem`) is made again by the synthesis model.
+        """
+        # 1. Build decision prompt for LLM: static instructions + tool list as the system
+        #    prompt (a reusable prefix), the query last
+        await self.tool_registry.ensure_fresh()
+        system_prompt = self.decision_system_prompt()
+        decision_prompt = TOOL_DECISION_PROMPT.format(user_query=_with_context(user_query, context))
+        log_payload(logger, "Decision prompt", decision_prompt)
+
+
+        # 2. Call the decision model; fall back to the synthesis model if its decision is unusable
+        decision = await self._run_decision(self.decision_model, decision_prompt, system_prompt, speculation)
+        if self.decision_model == self.model_name:
+            return decision
+        problem = self._decision_problem(decision)
+        if problem is None:
+            return decision
+        logger.warning(f"[Decision] {self.decision_model} decision unusable ({problem}); retrying with {self.model_name}")
+        DECISION_FALLBACKS.labels(reason=problem).inc()
+        if speculation is not None:
+            speculation.new_stream()
+        return await self._run_decision(self.model_name, decision_prompt, system_prompt, speculation, "decision_fallback")
+
+    async def _run_decision(
+        self,
+        model_name: str,
+        decision_prompt: str,
+        system_prompt: str,
+        speculation: Optional[Speculation],
+        purpose: str = "decision",
+    ) -> Optional[Dict[str, Any]]:
+        """One decision pass on `model_name`. Returns the parsed JSON, or None if it is not valid JSON."""
+        #llm_response = await self.call_llm(decision_prompt)
+        with stage_timer("decision_llm"):
+            if speculation is None:
+                llm_response = await chat_with_ollama(decision_prompt, model_name, system=system_prompt, kind="decision")
+            else:
+                llm_response = await self._stream_decision(model_name, decision_prompt, system_prompt, speculation)
+        observe_ollama(purpose, llm_response)
+        log_payload(logger, "Decision response", llm_response.get("message", llm_response))
 
-        #return {"response": final_text, "tool_output": tool_output}
 
-        # Step 8: Direct answer
-        #return {"response": decision.final_answer or raw_message, "tool_output": tool_output}
+        # 3. Parse JSON safely
+        try:
+            #decision = json.loads(llm_response)
+            # Extract JSON string from Ollama response format
+            if isinstance(llm_response, dict):
+                llm_response = llm_response.get('message', '{}')
+            with stage_timer("json_parse"):
+                return json.loads(llm_response)
 
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse LLM decision JSON: {e}")
+            return None
 
-        #return final_answer
-        return final_text
+    def _decision_problem(self, decision: Any) -> Optional[str]:
+        """
+        Why a decision cannot be used as-is (a DECISION_FALLBACKS reason), or None if it can:
+        invalid_json, invalid_decision (fails ToolDecision validation), empty (neither tool
+        calls nor an answer), unknown_tool.
+        """
+        if not isinstance(decision, dict):
+            return "invalid_json"
+        try:
+            parsed = _to_tool_decision(decision)
+        except ValidationError:
+            return "invalid_decision"
+        calls = parsed.calls()
+        if not calls and not parsed.final_answer:
+            return "empty"
+        if any(self.tool_registry.resolve(call.tool_name) is None for call in calls):
+            return "unknown_tool"
+        return None
+
+    async def _stream_decision(
+        self, model_name: str, prompt: str, system_prompt: str, speculation: Speculation,
+    ) -> Dict[str, Any]:
+        """Streamed decision pass, fed to `speculation` token by token. Same result shape as chat_with_ollama."""
+        timings: Dict[str, Any] = {}
+        tokens: List[str] = []
+        try:
+            async for token in stream_ollama(prompt, model_name, system=system_prompt, timings=timings, kind="decision"):
+                tokens.append(token)
+                speculation.feed(token)
+        except Overloaded:
+            raise
+        except Exception as e:
+            logger.error(f"[Ollama] Error streaming the decision: {e}")
+            return {"error": f"Ollama request failed: {str(e)}"}
+        result: Dict[str, Any] = {"message": "".join(tokens)}
+        if timings:
+            result["timings"] = timings
+        return result
 
     # ---------------------------
     # Stub LLM call (replace with your LLM client)
@@ -166,8 +679,7 @@ class ChatOrchestrator:
         Call your LLM with the given prompt.
         Replace this stub with your actual LLM client call.
         """
-        logger.info(f"LLM prompt: {prompt}")
-        print("call_llm: prompt",prompt)
+        log_payload(logger, "LLM prompt", prompt)
         # This stub returns a valid JSON decision with no tool usage
         return (
             '{"tool_required": false, "tool_name": null, "arguments": {}, '
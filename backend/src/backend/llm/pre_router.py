@@ -0,0 +1,199 @@
+# backend/src/backend/llm/pre_router.py
+"""
+Rule-based fast path for the tool decision.
+
+Most chat queries are trivially classifiable ("what time is it", "weather in
+Paris"). PreRouter tries compiled regex rules (and an optional local
+classifier) first; only when nothing matches with enough confidence does the
+orchestrator fall back to the LLM decision pass (TOOL_DECISION_PROMPT).
+"""
+
+import logging
+import re
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Pattern
+
+from backend.llm.schemas import PreRouteResult, ToolDecision
+from backend.metrics import PRE_ROUTES
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIDENCE_THRESHOLD = 0.8
+
+# A classifier takes the raw query and returns a scored decision (or None)
+Classifier = Callable[[str], Optional[PreRouteResult]]
+
+
+class RouteRule:
+    """
+    A compiled regex that maps a query to a tool call.
+
+    Named groups in the pattern become tool arguments, e.g.
+    r"weather in (?P<location>.+)" -> {"location": "Paris"}. With
+    `reject_compound`, arguments that join several requests ("Paris and the
+    time") disqualify the match so the LLM can handle them; so do arguments
+    matching `reject` (e.g. a time the tool cannot answer for).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tool_name: str,
+        pattern: str,
+        confidence: float,
+        reject_compound: bool = True,
+        reject: Optional[str] = None,
+    ):
+        self.name = name
+        self.tool_name = tool_name
+        self.pattern: Pattern[str] = re.compile(pattern, re.IGNORECASE)
+        self.confidence = confidence
+        self.reject_compound = reject_compound
+        self.reject: Optional[Pattern[str]] = re.compile(reject, re.IGNORECASE) if reject else None
+
+    def match(self, query: str) -> Optional[PreRouteResult]:
+        m = self.pattern.search(query)
+        if not m:
+            return None
+        arguments = {k: v.strip(" ,.?!") for k, v in m.groupdict().items() if v}
+        if len(arguments) != len(m.groupdict()):
+            return None
+        if self.reject_compound and any(_COMPOUND.search(v) for v in arguments.values()):
+            return None
+        if self.reject is not None and any(self.reject.search(v) for v in arguments.values()):
+            return None
+        return PreRouteResult(
+            decision=ToolDecision(
+                tool_required=True,
+                tool_name=self.tool_name,
+                arguments=arguments,
+                final_answer=None,
+            ),
+            confidence=self.confidence,
+            rule=self.name,
+        )
+
+
+# Queries joining several requests are left to the LLM
+_COMPOUND = re.compile(r"\b(?:and|also|then|plus)\b|[&;]", re.IGNORECASE)
+
+# A time other than now: a forecast, which the current-weather tool cannot answer
+_NOT_NOW = (
+    r"\b(?:tomorrow|tonight|later|weekend|next\s+\w+|this\s+(?:week|evening|afternoon|morning)"
+    r"|in\s+(?:a|\d+)\s+(?:few\s+)?(?:hours?|days?|weeks?)|(?:mon|tues|wednes|thurs|fri|satur|sun)day)\b"
+)
+
+_ARG = r"(?P<{name}>[^?!;&]+?)"
+_END = r"\s*[?.!]*\s*$"
+
+DEFAULT_RULES: List[RouteRule] = [
+    RouteRule(
+        "datetime",
+        "datetime",
+        r"^\s*(?:what(?:'s| is)\s+(?:the\s+)?(?:current\s+)?(?:time|date)(?:\s+(?:now|today|right now))?"
+        r"|what\s+time\s+is\s+it(?:\s+now)?"
+        r"|what\s+day\s+is\s+(?:it|today)"
+        r"|(?:current|today'?s)\s+(?:time|date))" + _END,
+        0.95,
+    ),
+    RouteRule(
+        "weather",
+        "weather",
+        r"^\s*(?:(?:what(?:'s| is)|how(?:'s| is))\s+(?:the\s+)?)?(?:current\s+)?(?:weather|temperature|forecast)"
+        r"(?:\s+like)?\s+(?:in|for|at)\s+" + _ARG.format(name="location") + r"(?:\s+(?:right\s+)?now|\s+today)?" + _END,
+        0.9,
+        reject=_NOT_NOW,
+    ),
+    RouteRule(
+        "geocoding",
+        "geocoding",
+        r"^\s*(?:(?:what\s+are\s+)?(?:the\s+)?(?:gps\s+)?(?:coordinates|lat(?:itude)?\s*(?:/|and|,)\s*lon(?:gitude)?)"
+        r"\s+(?:of|for)|geocode)\s+" + _ARG.format(name="address") + _END,
+        0.9,
+    ),
+    RouteRule(
+        "search",
+        "ddgs",
+        r"^\s*(?:search(?:\s+the\s+web)?(?:\s+for)?|look\s+up|google)\s+(?P<query>.+?)" + _END,
+        0.85,
+        reject_compound=False,
+    ),
+]
+
+
+class PreRouter:
+    """
+    Settles the tool decision without an LLM call when a rule (or the optional
+    classifier) is confident enough.
+
+    Args:
+        rules: Ordered rules; every rule is evaluated so conflicting matches can be detected
+        classifier: Optional local classifier consulted when no rule matches
+        threshold: Minimum confidence to accept a pre-routed decision
+        enabled: Set False to always defer to the LLM
+    """
+
+    def __init__(
+        self,
+        rules: Optional[List[RouteRule]] = None,
+        classifier: Optional[Classifier] = None,
+        threshold: float = DEFAULT_CONFIDENCE_THRESHOLD,
+        enabled: bool = True,
+    ):
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.classifier = classifier
+        self.threshold = threshold
+        self.enabled = enabled
+
+        self.hits: Counter = Counter()   # rule/classifier name -> count
+        self.misses = 0                  # nothing matched
+        self.low_confidence = 0          # matched, but below threshold
+        self.ambiguous = 0               # several tools matched
+
+    def route(self, query: str) -> Optional[PreRouteResult]:
+        """Return a confident decision for `query`, or None to fall back to the LLM."""
+        if not self.enabled or not query:
+            return None
+
+        result = self._match_rules(query)
+        if result is None and self.classifier is not None:
+            try:
+                result = self.classifier(query)
+            except Exception as e:
+                logger.warning(f"[PreRouter] Classifier failed: {e}")
+                result = None
+
+        if result is None:
+            self.misses += 1
+            PRE_ROUTES.labels(rule="none", outcome="miss").inc()
+            return None
+        if result.confidence < self.threshold:
+            self.low_confidence += 1
+            PRE_ROUTES.labels(rule=result.rule, outcome="low_confidence").inc()
+            return None
+
+        self.hits[result.rule] += 1
+        PRE_ROUTES.labels(rule=result.rule, outcome="hit").inc()
+        return result
+
+    def _match_rules(self, query: str) -> Optional[PreRouteResult]:
+        matches = [m for m in (rule.match(query) for rule in self.rules) if m is not None]
+        if not matches:
+            return None
+        if len({m.decision.tool_name for m in matches}) > 1:
+            self.ambiguous += 1
+            PRE_ROUTES.labels(rule="none", outcome="ambiguous").inc()
+            return None
+        return max(matches, key=lambda m: m.confidence)
+
+    def stats(self) -> Dict[str, object]:
+        total_hits = sum(self.hits.values())
+        total = total_hits + self.misses + self.low_confidence
+        return {
+            "hits": total_hits,
+            "misses": self.misses,
+            "low_confidence": self.low_confidence,
+            "ambiguous": self.ambiguous,
+            "hit_rate": total_hits / total if total else 0.0,
+            "by_rule": dict(self.hits),
+        }
@@ -1,43 +1,56 @@
 # backend/src/backend/llm/prompt_templates.py
 
-TOOL_DECISION_PROMPT = """You are an assistant that decides whether a user query requires calling a backend tool (MCP server) or can be answered directly.
+# Prompts are split into a static system part and a variable user part. The system part
+# is identical across requests (until the tool list changes), so Ollama can reuse its
+# evaluated KV cache as a prompt prefix; only the short user part is evaluated per request.
+
+TOOL_DECISION_SYSTEM_PROMPT = """You are an assistant that decides whether a user query requires calling a backend tool (MCP server) or can be answered directly.
 
 IMPORTANT:
-- The tool name you output MUST match the actual MCP tool names:
+- "tool_name" MUST be one of the tool names listed below, exactly as written.
 
 Available servers and their tools:
 
-1. Weather Server (weather)
-   - tool: get_weather_tool
-   - args: {{"location": "string"}}
-
-2. Geocoding Server (geocoding)
-   - tool: geocode_tool
-   - args: {{"address": "string"}}
-
-3. Datetime Server (datetime)
-   - tool: get_current_datetime_tool
-   - args: {{}}
-
-4. Search Server (ddgs)
-   - tool: search_web_tool
-   - args: {{"query": "string"}}
+{tools}
 
 Your output MUST be strict JSON:
-{{"tool_required": true/false, "tool_name": "weather/geocoding/datetime/ddgs", "arguments": {{}}, "final_answer": "answer or null"}}
+{{"tool_required": true/false, "tool_name": "<tool name or null>", "arguments": {{}}, "final_answer": "answer or null"}}
+
+If the query needs several tools (or the same tool for several inputs), list them all in "tool_calls" instead of "tool_name"; they run in parallel:
+{{"tool_required": true, "tool_calls": [{{"tool_name": "...", "arguments": {{}}}}, ...], "final_answer": null}}
 
 Examples:
-Weather: {{"tool_required": true, "tool_name": "weather", "arguments": {{"location": "Paris"}}, "final_answer": null}}
-Geocoding: {{"tool_required": true, "tool_name": "geocoding", "arguments": {{"address": "Chicago"}}, "final_answer": null}}
-Datetime: {{"tool_required": true, "tool_name": "datetime", "arguments": {{}}, "final_answer": null}}
-Search: {{"tool_required": true, "tool_name": "ddgs", "arguments": {{"query": "News of the day"}}, "final_answer": null}}
+Weather: {{"tool_required": true, "tool_name": "get_weather_tool", "arguments": {{"location": "Paris"}}, "final_answer": null}}
+Datetime: {{"tool_required": true, "tool_name": "get_current_datetime_tool", "arguments": {{}}, "final_answer": null}}
+No tool needed: {{"tool_required": false, "tool_name": null, "arguments": {{}}, "final_answer": "Hello! How can I help?"}}
+Compound ("weather in Paris and Tokyo and the current time"): {{"tool_required": true, "tool_calls": [{{"tool_name": "get_weather_tool", "arguments": {{"location": "Paris"}}}}, {{"tool_name": "get_weather_tool", "arguments": {{"location": "Tokyo"}}}}, {{"tool_name": "get_current_datetime_tool", "arguments": {{}}}}], "final_answer": null}}"""
 
-Now process this user query:
+TOOL_DECISION_PROMPT = """Now process this user query:
 {user_query}"""
 
+FINAL_ANSWER_SYSTEM_PROMPT = """You turn data returned by backend tools into answers for the user.
+Convert the data you are given into a natural-language answer suitable for the user.
+If several tools were called, combine their results into one answer; if a tool failed, say which part could not be answered."""
+
 FINAL_ANSWER_PROMPT = """The user asked: {user_message}
 
 The tool '{tool_name}' returned this data:
-{tool_response}
+{tool_response}"""
+
+MULTI_TOOL_ANSWER_PROMPT = """The user asked: {user_message}
+
+Several tools were called to answer it:
+
+{tool_results}"""
+
+# System prompt for ToolCallingEngine: tool names, descriptions and argument
+# schemas travel in the /api/chat `tools` array, so the prompt stays short.
+TOOL_CALLING_SYSTEM_PROMPT = """You are a helpful assistant with access to tools for weather, geocoding, the current date/time and web search.
+Call a tool whenever the question needs live or external data; call several tools at once if the question has several parts.
+Once you have the tool results, answer the user in natural language."""
+
+# Wraps the user's message when the session has earlier turns (see llm/memory.py)
+CONVERSATION_CONTEXT_PROMPT = """Conversation so far (use it to resolve follow-up questions such as "and tomorrow?"):
+{context}
 
-Please convert this into a natural-language answer suitable for the user."""
+Current message: {user_query}"""
@@ -0,0 +1,213 @@
+# backend/src/backend/llm/response_cache.py
+"""
+Two-level response cache for ChatOrchestrator.
+
+Level 1 (answers):    normalized query -> final answer
+Level 2 (decisions):  normalized query -> tool decision
+        (synthesis):  (normalized query, tool_name, hash(tool_response)) -> final answer
+
+Entries expire per tool (datetime answers are never reused, geocoding answers
+live for days) and each level is an LRU bounded by approximate memory use.
+Every level exports its hits, misses, evictions and size on /metrics.
+"""
+
+import hashlib
+import json
+import re
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.metrics import (
+    RESPONSE_CACHE_BYTES,
+    RESPONSE_CACHE_ENTRIES,
+    RESPONSE_CACHE_EVICTIONS,
+    RESPONSE_CACHE_LOOKUPS,
+)
+
+# Seconds an answer derived from each tool stays valid. 0 disables caching.
+TOOL_TTLS: Dict[Optional[str], float] = {
+    "datetime": 0,
+    "weather": 10 * 60,
+    "geocoding": 7 * 24 * 3600,
+    "ddgs": 15 * 60,
+    None: 60 * 60,   # direct answers that needed no tool
+}
+DEFAULT_TOOL_TTL = 5 * 60
+DECISION_TTL = 60 * 60
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024  # per level
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, drop punctuation and collapse whitespace: 'Weather in Paris?' -> 'weather in paris'."""
+    return _WHITESPACE.sub(" ", _PUNCTUATION.sub(" ", query.lower())).strip()
+
+
+def _sizeof(value: Any) -> int:
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    return sys.getsizeof(json.dumps(value, default=str))
+
+
+class TTLCache:
+    """
+    LRU cache with per-entry expiry, bounded by the approximate size of its keys and values.
+    A cache with a `level` name records its counters as Prometheus metrics labelled by it.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+        level: Optional[str] = None,
+    ):
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self.level = level
+        self._entries: "OrderedDict[Any, Tuple[Any, float, int]]" = OrderedDict()  # key -> (value, expires_at, size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self._lookup("miss")
+            return None
+        value, expires_at, _ = entry
+        if expires_at <= self._clock():
+            self._remove(key)
+            self._observe_size()
+            self._lookup("miss")
+            return None
+        self._entries.move_to_end(key)
+        self._lookup("hit")
+        return value
+
+    def set(self, key: Any, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        size = _sizeof(key) + _sizeof(value)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, self._clock() + ttl, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+            if self.level:
+                RESPONSE_CACHE_EVICTIONS.labels(level=self.level).inc()
+        self._observe_size()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+        self._observe_size()
+
+    def _lookup(self, result: str) -> None:
+        if result == "hit":
+            self.hits += 1
+        else:
+            self.misses += 1
+        if self.level:
+            RESPONSE_CACHE_LOOKUPS.labels(level=self.level, result=result).inc()
+
+    def _observe_size(self) -> None:
+        if self.level:
+            RESPONSE_CACHE_BYTES.labels(level=self.level).set(self.bytes)
+            RESPONSE_CACHE_ENTRIES.labels(level=self.level).set(len(self._entries))
+
+    def _remove(self, key: Any) -> None:
+        _, _, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class ResponseCache:
+    """
+    Answer, decision and synthesis caches used by ChatOrchestrator.
+
+    Args:
+        tool_ttls: Seconds answers derived from each tool stay valid (None key = no tool)
+        decision_ttl: Seconds an LLM tool decision stays valid
+        max_bytes: Approximate memory bound per level
+    """
+
+    def __init__(
+        self,
+        tool_ttls: Optional[Dict[Optional[str], float]] = None,
+        decision_ttl: float = DECISION_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.tool_ttls = dict(TOOL_TTLS if tool_ttls is None else tool_ttls)
+        self.decision_ttl = decision_ttl
+        self.answers = TTLCache(max_bytes, clock, level="answers")
+        self.decisions = TTLCache(max_bytes, clock, level="decisions")
+        self.syntheses = TTLCache(max_bytes, clock, level="syntheses")
+
+    def ttl_for(self, tool_name: Optional[str]) -> float:
+        # Answers combining several tools ("weather,datetime") live as long as the shortest-lived one
+        if tool_name and "," in tool_name:
+            return min(self.ttl_for(name) for name in tool_name.split(","))
+        return self.tool_ttls.get(tool_name, DEFAULT_TOOL_TTL)
+
+    # Level 1 --------------------------------------------------------------
+    def get_answer(self, query: str) -> Optional[str]:
+        return self.answers.get(normalize_query(query))
+
+    def put_answer(self, query: str, tool_name: Optional[str], answer: str) -> None:
+        if answer:
+            self.answers.set(normalize_query(query), answer, self.ttl_for(tool_name))
+
+    # Level 2 --------------------------------------------------------------
+    def get_decision(self, query: str) -> Optional[Dict[str, Any]]:
+        return self.decisions.get(normalize_query(query))
+
+    def put_decision(self, query: str, decision: Dict[str, Any]) -> None:
+        self.decisions.set(normalize_query(query), decision, self.decision_ttl)
+
+    def get_synthesis(self, query: str, tool_name: str, tool_response: Any) -> Optional[str]:
+        return self.syntheses.get(self._synthesis_key(query, tool_name, tool_response))
+
+    def put_synthesis(self, query: str, tool_name: str, tool_response: Any, answer: str) -> None:
+        if answer:
+            self.syntheses.set(self._synthesis_key(query, tool_name, tool_response), answer, self.ttl_for(tool_name))
+
+    @staticmethod
+    def _synthesis_key(query: str, tool_name: str, tool_response: Any) -> Tuple[str, str, str]:
+        payload = tool_response if isinstance(tool_response, str) else json.dumps(tool_response, sort_keys=True, default=str)
+        return normalize_query(query), tool_name, hashlib.sha256(payload.encode()).hexdigest()
+
+    def clear(self) -> None:
+        self.answers.clear()
+        self.decisions.clear()
+        self.syntheses.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            "answers": self.answers.stats(),
+            "decisions": self.decisions.stats(),
+            "syntheses": self.syntheses.stats(),
+        }
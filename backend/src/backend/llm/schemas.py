@@ -1,8 +1,48 @@
-from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List
+
+
+class ToolCall(BaseModel):
+    """One tool invocation requested by the decision pass."""
+    tool_name: str
+    arguments: Dict[str, Any] = Field(default_factory=dict)
+
 
 class ToolDecision(BaseModel):
     tool_required: bool
     tool_name: Optional[str]
     arguments: Optional[Dict[str, Any]]
     final_answer: Optional[str]  # Optional direct answer if tool not required
+    tool_calls: List[ToolCall] = Field(default_factory=list)  # Several calls for compound queries
+
+    def calls(self) -> List[ToolCall]:
+        """All requested calls; a single tool_name/arguments pair counts as a one-item list."""
+        if self.tool_calls:
+            return self.tool_calls
+        if self.tool_name:
+            return [ToolCall(tool_name=self.tool_name, arguments=self.arguments or {})]
+        return []
+
+
+class PreparedTurn(BaseModel):
+    """Result of the orchestration steps that run before the synthesis pass."""
+    final_answer: Optional[str] = None   # Set when no synthesis pass is needed
+    final_prompt: Optional[str] = None   # Synthesis prompt to send to the LLM
+    tool_name: Optional[str] = None      # Comma-joined names when several tools ran
+    templated: bool = False              # final_answer was rendered from a template (answer_templates.py)
+    degraded: bool = False               # some tool calls failed; the answer is not cached
+    tool_response: Optional[Any] = None
+
+
+class PreRouteResult(BaseModel):
+    """A tool decision settled without the LLM decision pass."""
+    decision: ToolDecision
+    confidence: float
+    rule: str  # Name of the rule/classifier that produced the decision
+
+
+class ConversationTurn(BaseModel):
+    """One user/assistant exchange kept in session memory."""
+    user: str
+    assistant: str
+    tool_name: Optional[str] = None
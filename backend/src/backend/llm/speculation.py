@@ -0,0 +1,161 @@
+# backend/src/backend/llm/speculation.py
+"""
+Speculative tool calls while the decision pass is still generating.
+
+The decision JSON names the tool and its arguments early, e.g.
+`{"tool_required": true, "tool_name": "get_weather_tool", "arguments": {"location": "Paris"}, ...`,
+and the model keeps generating for a while after the arguments object closes.
+`DecisionScanner` reads the streamed tokens and reports each
+tool_name/arguments pair as soon as its arguments object is complete.
+`Speculation` starts those calls right away if the tool is side-effect free
+and cacheable (SPECULATIVE_TOOLS), so the MCP round-trip overlaps with the
+rest of the generation.
+
+Once the decision is final, the orchestrator takes the speculative call
+that matches each requested call: same tool, identical arguments. Calls the
+final decision did not ask for are discarded. They are left to finish, since
+they are harmless and their results warm the MCP servers' caches.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from backend.llm.schemas import ToolCall
+from backend.mcp.registry import ToolSpec
+from backend.metrics import SPECULATIVE_CALLS
+
+logger = logging.getLogger(__name__)
+
+# Side-effect free, and the servers cache or coalesce them: safe to call before the decision is final
+SPECULATIVE_TOOLS = frozenset({
+    "get_weather_tool",
+    "get_weather_batch_tool",
+    "geocode_tool",
+    "get_current_datetime_tool",
+})
+
+# "tool_name": "<name>", "arguments": {   (the key order the decision prompt shows the model)
+_CALL_START = re.compile(r'"tool_name"\s*:\s*"(?P<name>[^"\\]+)"\s*,\s*"arguments"\s*:\s*(?=\{)')
+
+# Discarded calls still running; kept referenced until they finish
+_discarded: set = set()
+
+
+def _object_end(text: str, start: int) -> Optional[int]:
+    """Index just past the JSON object opening at text[start], or None if it is not closed yet."""
+    depth = 0
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+class DecisionScanner:
+    """Incremental reader of a streamed decision: `feed` returns the calls completed by each chunk."""
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+
+    def feed(self, chunk: str) -> List[ToolCall]:
+        self.text += chunk
+        calls: List[ToolCall] = []
+        while (match := _CALL_START.search(self.text, self._pos)) is not None:
+            end = _object_end(self.text, match.end())
+            if end is None:
+                break
+            self._pos = end
+            try:
+                arguments = json.loads(self.text[match.end():end])
+            except json.JSONDecodeError:
+                continue
+            calls.append(ToolCall(tool_name=match.group("name"), arguments=arguments))
+        return calls
+
+
+def _key(tool: str, arguments: Dict[str, Any]) -> str:
+    return tool + json.dumps(arguments, sort_keys=True, default=str)
+
+
+class Speculation:
+    """
+    Tool calls started from a decision that is still streaming.
+
+    Args:
+        start: Runs one tool call (ChatOrchestrator._execute_tool_call)
+        resolve: Maps a tool name from the decision to a ToolSpec (ToolRegistry.resolve)
+        tools: MCP tool names that may be called speculatively
+    """
+
+    def __init__(
+        self,
+        start: Callable[[ToolCall], Awaitable[Dict[str, Any]]],
+        resolve: Callable[[str], Optional[ToolSpec]],
+        tools: frozenset = SPECULATIVE_TOOLS,
+    ):
+        self._start = start
+        self._resolve = resolve
+        self._tools = tools
+        self._scanner = DecisionScanner()
+        self._tasks: Dict[str, tuple[str, asyncio.Task]] = {}
+
+    def feed(self, chunk: str) -> None:
+        """Read more of the decision; start any call whose arguments just became final."""
+        for call in self._scanner.feed(chunk):
+            spec = self._resolve(call.tool_name)
+            if spec is None or spec.name not in self._tools:
+                continue
+            key = _key(spec.name, call.arguments)
+            if key not in self._tasks:
+                logger.debug("Speculatively calling %s", spec.name)
+                self._tasks[key] = (spec.name, asyncio.create_task(self._start(call)))
+
+    def new_stream(self) -> None:
+        """Read a new decision from the start (a retry on another model); calls already started are kept."""
+        self._scanner = DecisionScanner()
+
+    def take(self, call: ToolCall) -> Optional[asyncio.Task]:
+        """The speculative call matching a call of the final decision, if one was started."""
+        spec = self._resolve(call.tool_name)
+        if spec is None:
+            return None
+        entry = self._tasks.pop(_key(spec.name, call.arguments), None)
+        if entry is None:
+            return None
+        SPECULATIVE_CALLS.labels(tool=entry[0], outcome="used").inc()
+        return entry[1]
+
+    def settle(self, calls: List[ToolCall]) -> List[Optional[asyncio.Task]]:
+        """Take the speculative call for each call of the final decision (None where none was started), discard the rest."""
+        started = [self.take(call) for call in calls]
+        self.discard()
+        return started
+
+    def discard(self) -> None:
+        """Give up on the calls the final decision did not make (they finish in the background)."""
+        for tool, task in self._tasks.values():
+            SPECULATIVE_CALLS.labels(tool=tool, outcome="discarded").inc()
+            if not task.done():
+                _discarded.add(task)
+                task.add_done_callback(_discarded.discard)
+        if self._tasks:
+            logger.info(f"Discarded {len(self._tasks)} speculative tool call(s)")
+        self._tasks.clear()
@@ -0,0 +1,163 @@
+# backend/src/backend/llm/tool_calling.py
+"""
+Native tool-calling engine (alternative to ChatOrchestrator).
+
+Instead of asking the model to print a JSON decision inside free text and
+parsing it, this engine sends Ollama's /api/chat a `tools` array built from the
+live MCP `list_tools` schemas (via ToolRegistry). The model answers with structured `tool_calls`,
+the engine runs them on the pooled MCP sessions, appends the results as `tool`
+messages and loops until the model produces a plain answer.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from backend.llm.compaction import TOOL_OUTPUT_TOKEN_BUDGET, compact_tool_output
+from backend.llm.memory import SessionStore, session_store as shared_session_store
+from backend.llm.prompt_templates import TOOL_CALLING_SYSTEM_PROMPT
+from backend.logging_setup import log_payload
+from backend.mcp.manager import MCPManager, mcp_manager as shared_mcp_manager
+from backend.mcp.registry import ToolRegistry, tool_registry as shared_tool_registry
+from backend.metrics import TOOL_OUTPUT_TOKENS
+from backend.services.ollama_service import DEFAULT_MODEL, chat_with_tools, warm_ollama
+
+logger = logging.getLogger(__name__)
+
+MAX_TOOL_ROUNDS = 4        # model -> tools -> model round-trips per query
+TOOL_CALL_TIMEOUT = 30.0   # seconds per tool call
+
+
+class ToolCallingEngine:
+    """
+    Answers queries with Ollama's native tool calling over /api/chat.
+
+    Exposes the same `process_query` / `stream_query` interface as
+    ChatOrchestrator so the chat router can use either.
+
+    Args:
+        model_name: Ollama model; must support tool calling (Qwen3, Llama 3.1+, ...)
+        mcp_manager: Manager whose servers provide the tools (defaults to the shared one)
+        max_rounds: Maximum tool rounds before giving up
+        tool_timeout: Seconds allowed per tool call
+        answer_format: Optional Ollama `format` ("json" or a JSON schema) for structured answers
+        tool_registry: Source of tool schemas (defaults to the shared registry)
+        memory: Conversation memory for `session_id` (defaults to the shared store)
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_MODEL,
+        mcp_manager: MCPManager | None = None,
+        max_rounds: int = MAX_TOOL_ROUNDS,
+        tool_timeout: float = TOOL_CALL_TIMEOUT,
+        answer_format: Optional[Any] = None,
+        tool_registry: ToolRegistry | None = None,
+        memory: SessionStore | None = None,
+    ):
+        self.model_name = model_name
+        self.mcp_manager = mcp_manager or shared_mcp_manager
+        self.max_rounds = max_rounds
+        self.tool_timeout = tool_timeout
+        self.answer_format = answer_format
+
+        if tool_registry is None:
+            tool_registry = shared_tool_registry if mcp_manager is None else ToolRegistry(self.mcp_manager)
+        self.tool_registry = tool_registry
+        self.memory = memory if memory is not None else shared_session_store
+
+    async def tools(self) -> List[Dict[str, Any]]:
+        """Ollama function definitions for every tool the MCP servers expose (see ToolRegistry)."""
+        await self.tool_registry.ensure_fresh()
+        return self.tool_registry.ollama_tools()
+
+    async def process_query(
+        self, user_query: str, session_id: Optional[str] = None, template_answers: Optional[bool] = None,
+    ) -> str:
+        """
+        Run the tool loop for `user_query` and return the model's final answer.
+
+        `template_answers` is accepted for parity with ChatOrchestrator and
+        ignored: the model decides when it has enough to answer, so it writes
+        every answer.
+        """
+        context = self.memory.context(session_id)
+        messages: List[Dict[str, Any]] = [{"role": "system", "content": TOOL_CALLING_SYSTEM_PROMPT}]
+        if context:
+            messages.append({"role": "system", "content": f"Conversation so far:\n{context}"})
+        messages.append({"role": "user", "content": user_query})
+
+        answer = await self._run_loop(messages)
+
+        tool_messages = [m for m in messages if m.get("role") == "tool"]
+        last_tool = tool_messages[-1] if tool_messages else {}
+        self.memory.append(session_id, user_query, answer, last_tool.get("tool_name"), last_tool.get("content"))
+        return answer
+
+    async def stream_query(
+        self, user_query: str, session_id: Optional[str] = None, template_answers: Optional[bool] = None,
+    ) -> AsyncIterator[str]:
+        """Yield the final answer (as a single chunk; the tool loop is not streamed)."""
+        yield await self.process_query(user_query, session_id, template_answers)
+
+    async def warm_up(self) -> None:
+        """Load the model so the first query does not pay for it (run at startup)."""
+        await self.tool_registry.ensure_fresh()
+        await warm_ollama(self.model_name, TOOL_CALLING_SYSTEM_PROMPT)
+
+    async def _run_loop(self, messages: List[Dict[str, Any]]) -> str:
+        """Alternate model and tool rounds on `messages` (extended in place) until the model answers."""
+        tools = await self.tools()
+
+        for _ in range(self.max_rounds):
+            response = await chat_with_tools(messages, tools, self.model_name, format=self.answer_format)
+            if "error" in response:
+                return f"Sorry, the language model is unavailable: {response['error']}"
+
+            message = response["message"]
+            tool_calls = message.get("tool_calls") or []
+            messages.append(message)
+            if not tool_calls:
+                return message.get("content") or "No specific answer available."
+
+            # Independent calls from one round run concurrently
+            results = await asyncio.gather(*(self._run_tool_call(call) for call in tool_calls))
+            messages.extend(results)
+
+        # Out of rounds: ask for an answer from what was gathered, without offering tools
+        response = await chat_with_tools(messages, [], self.model_name, format=self.answer_format)
+        if "error" in response:
+            return f"Sorry, the language model is unavailable: {response['error']}"
+        return response["message"].get("content") or "No specific answer available."
+
+    async def _run_tool_call(self, call: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one Ollama tool call on its MCP server and return the `tool` message for it."""
+        function = call.get("function") or {}
+        name = function.get("name", "")
+        arguments = function.get("arguments") or {}
+        if isinstance(arguments, str):
+            try:
+                arguments = json.loads(arguments)
+            except json.JSONDecodeError:
+                arguments = {}
+
+        spec = self.tool_registry.resolve(name)
+        if spec is None:
+            output: Dict[str, Any] = {"error": f"Unknown tool '{name}'"}
+        else:
+            logger.info("[ToolCallingEngine] Calling %s.%s", spec.server, spec.name)
+            log_payload(logger, "[ToolCallingEngine] Arguments", arguments)
+            try:
+                output = await asyncio.wait_for(
+                    self.mcp_manager.call_tool(spec.server, spec.name, arguments),
+                    timeout=self.tool_timeout,
+                )
+            except asyncio.TimeoutError:
+                output = {"error": f"{name} timed out after {self.tool_timeout}s"}
+
+        tool_name = spec.name if spec is not None else name
+        compaction = compact_tool_output(tool_name, json.dumps(output, default=str), TOOL_OUTPUT_TOKEN_BUDGET)
+        TOOL_OUTPUT_TOKENS.labels(tool=tool_name, stage="raw").observe(compaction.tokens_before)
+        TOOL_OUTPUT_TOKENS.labels(tool=tool_name, stage="compacted").observe(compaction.tokens_after)
+        return {"role": "tool", "tool_name": name, "content": compaction.text}
@@ -0,0 +1,158 @@
+# backend/src/backend/logging_setup.py
+"""
+Logging for the backend: non-blocking, structured, with request correlation.
+
+Records go through a QueueHandler to a background thread that formats and
+writes them, so request handlers never block on stdout. Every record carries
+the id of the request that produced it (taken from an `X-Request-ID` header
+or generated per request), and JSON output can be enabled for log shippers.
+
+Prompts, model responses and tool payloads are large and are only logged via
+`log_payload`, which is a no-op unless payload logging is turned on
+(LOG_PAYLOADS=1). Even then payloads are truncated, and only a sampled
+fraction of requests dump them.
+
+Environment knobs:
+    LOG_LEVEL            root level (default INFO)
+    LOG_FORMAT           "text" (default) or "json"
+    LOG_PAYLOADS         1 to log prompts / responses / tool payloads at DEBUG
+    LOG_PAYLOAD_CHARS    truncate payloads to this many characters (default 500)
+    LOG_PAYLOAD_SAMPLE   fraction of requests whose payloads are logged (default 1.0)
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import uuid
+from contextvars import ContextVar
+from typing import Any, Optional
+
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text")
+LOG_PAYLOADS = os.environ.get("LOG_PAYLOADS", "0").lower() in ("1", "true", "yes")
+LOG_PAYLOAD_CHARS = int(os.environ.get("LOG_PAYLOAD_CHARS", "500"))
+LOG_PAYLOAD_SAMPLE = float(os.environ.get("LOG_PAYLOAD_SAMPLE", "1.0"))
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+_payloads_sampled: ContextVar[bool] = ContextVar("payloads_sampled", default=True)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.Handler] = None
+
+
+# ---------------------------
+# Request correlation
+# ---------------------------
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def bind_request(request_id: Optional[str] = None) -> str:
+    """Set the correlation id (and payload sampling decision) for the current request/task."""
+    request_id = request_id or new_request_id()
+    request_id_var.set(request_id)
+    _payloads_sampled.set(random.random() < LOG_PAYLOAD_SAMPLE)
+    return request_id
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id (on the emitting task, before they are queued)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = request_id_var.get()
+        return True
+
+
+# ---------------------------
+# Payloads
+# ---------------------------
+class Truncated:
+    """Lazily rendered, truncated payload: nothing is serialized unless the record is emitted."""
+
+    __slots__ = ("value", "limit")
+
+    def __init__(self, value: Any, limit: int = LOG_PAYLOAD_CHARS):
+        self.value = value
+        self.limit = limit
+
+    def __str__(self) -> str:
+        text = self.value if isinstance(self.value, str) else json.dumps(self.value, default=str, ensure_ascii=False)
+        if len(text) <= self.limit:
+            return text
+        return f"{text[:self.limit]}… [{len(text) - self.limit} more chars]"
+
+
+def payloads_enabled() -> bool:
+    return LOG_PAYLOADS and _payloads_sampled.get()
+
+
+def log_payload(logger: logging.Logger, label: str, payload: Any) -> None:
+    """Log a prompt / response / tool payload at DEBUG when payload logging is on for this request."""
+    if payloads_enabled() and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s: %s", label, Truncated(payload))
+
+
+# ---------------------------
+# Formatting and setup
+# ---------------------------
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, request_id, message (+ exception)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Keep the message unformatted: the listener thread does the formatting
+        return record
+
+
+def configure_logging(level: str = LOG_LEVEL, fmt: str = LOG_FORMAT) -> None:
+    """Route the root logger through a queue to a background writer. Safe to call more than once."""
+    global _listener, _handler
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _handler = _QueueHandler(log_queue)
+    _handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.addHandler(_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener, _handler
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
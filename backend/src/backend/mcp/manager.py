@@ -1,34 +1,86 @@
+import asyncio
+import json
 import logging
-from typing import Any, Dict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 from fastmcp import Client
 from fastmcp.client.client import CallToolResult
-from backend.mcp_clients import (
-    DATETIME_URL,
-    #SEARCHXNG_URL,
-    DDGS_URL,
-    WEATHER_URL,
-    GEOCODING_URL
+from fastmcp.client.progress import ProgressHandler
+from fastmcp.exceptions import ToolError
+from mcp.types import Tool
+from prometheus_client import REGISTRY
+from backend.logging_setup import log_payload
+from backend.metrics import MCPManagerCollector
+from backend.mcp.pool import (
+    DEFAULT_HEALTH_CHECK_INTERVAL,
+    DEFAULT_MAX_SESSIONS,
+    MCPSessionPool,
 )
+from backend.mcp.singleflight import SingleFlight
+from backend.mcp_clients import MCP_SERVER_URLS
 
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
 
 class MCPManager:
     """
     Multi-Server MCP Manager.
     Provides unified async calls to all registered MCP servers.
+
+    Each registered server gets a pool of long-lived client sessions
+    (see backend.mcp.pool.MCPSessionPool). Call `start()` on application
+    startup and `close()` on shutdown; pools also connect lazily on first use.
     """
 
-    def __init__(self):
-        # Registry of MCP servers
-        self.servers = {
-            "datetime": DATETIME_URL,
-            #"searchxng": SEARCHXNG_URL,
-            "ddgs": DDGS_URL,
-            "weather": WEATHER_URL,
-            "geocoding": GEOCODING_URL,
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+    ):
+        # Registry of MCP servers (tools on them are discovered by backend.mcp.registry)
+        self.servers = dict(MCP_SERVER_URLS)
+        self.pools: Dict[str, MCPSessionPool] = {
+            name: MCPSessionPool(
+                name,
+                url,
+                max_sessions=max_sessions,
+                health_check_interval=health_check_interval,
+            )
+            for name, url in self.servers.items()
         }
+        # Identical concurrent tool calls share one MCP round-trip
+        self.flight = SingleFlight("mcp")
+
+    async def start(self) -> None:
+        """Open a warm session to every registered server. Unreachable servers are logged, not fatal."""
+        await asyncio.gather(*(pool.start() for pool in self.pools.values()))
+
+    async def close(self) -> None:
+        """Close all pooled sessions."""
+        await asyncio.gather(*(pool.close() for pool in self.pools.values()))
+
+    @asynccontextmanager
+    async def session(self, server: str) -> AsyncIterator[Client]:
+        """
+        Borrow a pooled, already-initialized client for `server`.
+
+        Raises:
+            KeyError: If the server is not registered.
+        """
+        if server not in self.pools:
+            raise KeyError(f"MCP server '{server}' is not registered.")
+        async with self.pools[server].session() as client:
+            yield client
+
+    async def list_tools(self, server: str) -> List[Tool]:
+        """
+        Return the tools `server` currently exposes (name, description, JSON input schema).
+
+        Raises:
+            KeyError: If the server is not registered.
+        """
+        async with self.session(server) as client:
+            return await client.list_tools()
 
     async def call_tool(self, server: str, tool: str, args: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -42,43 +94,105 @@ class MCPManager:
         Returns:
             Dict[str, Any]: Normalized MCP response
         """
-        logger.info("========== MCPManager.call_tool ==========")
-        logger.info(f"Server requested: {server}")
-        logger.info(f"Tool requested: {tool}")
-        logger.info(f"Arguments: {args}")
-        logger.info("==========================================")
+        logger.debug("[MCPManager] call_tool %s.%s", server, tool)
+        log_payload(logger, "[MCPManager] Arguments", args)
 
         if server not in self.servers:
             error_msg = f"MCP server '{server}' is not registered."
             logger.error(error_msg)
             return {"error": error_msg, "results": []}
 
-        mcp_url = self.servers[server]
-        logger.info(f"[MCPManager] Using MCP URL: {mcp_url}")
-
         try:
-            async with Client(mcp_url) as client:
-                logger.info(f"[MCPManager] Calling MCP tool: {tool} on server: {server}")
-                result: CallToolResult = await client.call_tool(tool, args)
+            result = await self.call_tool_raw(server, tool, args)
+        except Exception as e:
+            logger.error(f"[MCPManager] Fatal error calling {server}.{tool}: {e}")
+            return {"error": str(e), "results": []}
+
+        raw_structured = result.structured_content
+        raw_content = result.content
 
-                raw_structured = result.structured_content
-                raw_content = result.content
 
-                logger.info(f"[MCPManager] Raw structured_content: {raw_structured}")
-                logger.info(f"[MCPManager] Raw content: {raw_content}")
+        # Normalize output: prefer structured_content, fallback to content
+        normalized = raw_structured or raw_content
 
-                # Normalize output: prefer structured_content, fallback to content
-                normalized = raw_structured or raw_content
+        # Ensure we always return a dict
+        if not isinstance(normalized, dict):
+            normalized = {"result": normalized}
 
-                # Ensure we always return a dict
-                if not isinstance(normalized, dict):
-                    logger.info("[MCPManager] Normalizing non-dict output into dict wrapper")
-                    normalized = {"result": normalized}
+        log_payload(logger, f"[MCPManager] {server}.{tool} output", normalized)
+        return normalized
+
+    async def call_tool_raw(self, server: str, tool: str, args: Dict[str, Any]) -> CallToolResult:
+        """
+        Call a tool and return the raw CallToolResult.
 
-                logger.info(f"[MCPManager] Final normalized output: {normalized}")
-                logger.info("==========================================\n")
-                return normalized
+        Concurrent calls with the same server, tool and normalized arguments are
+        coalesced into one request whose result every caller shares.
 
+        Raises:
+            KeyError: If the server is not registered.
+            Exception: Whatever the MCP call raises (ToolError, connection errors, ...).
+        """
+        if server not in self.pools:
+            raise KeyError(f"MCP server '{server}' is not registered.")
+        key = (server, tool, self._normalize_args(args))
+        return await self.flight.do(key, lambda: self._call_with_reconnect(server, tool, args))
+
+    async def call_tool_streaming(
+        self, server: str, tool: str, args: Dict[str, Any], progress_handler: ProgressHandler,
+    ) -> CallToolResult:
+        """
+        Call a tool, passing its progress notifications to `progress_handler`.
+
+        Not coalesced: every caller needs its own notifications.
+
+        Raises:
+            KeyError: If the server is not registered.
+            Exception: Whatever the MCP call raises (ToolError, connection errors, ...).
+        """
+        if server not in self.pools:
+            raise KeyError(f"MCP server '{server}' is not registered.")
+        return await self._call_with_reconnect(server, tool, args, progress_handler)
+
+    @staticmethod
+    def _normalize_args(args: Dict[str, Any]) -> str:
+        """Stable key for tool arguments: case/whitespace-insensitive strings, sorted keys."""
+        normalized = {
+            k: " ".join(v.lower().split()) if isinstance(v, str) else v
+            for k, v in (args or {}).items()
+        }
+        return json.dumps(normalized, sort_keys=True, default=str)
+
+    async def _call_with_reconnect(
+        self, server: str, tool: str, args: Dict[str, Any], progress_handler: Optional[ProgressHandler] = None,
+    ) -> CallToolResult:
+        """
+        Call the tool on a pooled session. If the session turns out to be broken
+        (anything other than a tool-level error), the pool has already discarded it,
+        so retry once on a fresh connection.
+        """
+        try:
+            async with self.session(server) as client:
+                logger.debug("[MCPManager] Calling MCP tool %s on %s", tool, server)
+                return await client.call_tool(tool, args, progress_handler=progress_handler)
+        except ToolError:
+            raise
         except Exception as e:
-            logger.error(f"[MCPManager] Fatal error calling {server}.{tool}: {e}")
-            return {"error": str(e), "results": []}
+            logger.warning(f"[MCPManager] Session to {server} failed ({e}); reconnecting")
+
+        async with self.session(server) as client:
+            return await client.call_tool(tool, args, progress_handler=progress_handler)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-server pool statistics plus request coalescing counters."""
+        return {
+            "pools": {name: pool.stats() for name, pool in self.pools.items()},
+            "singleflight": self.flight.stats(),
+        }
+
+
+# ---------------------------
+# Shared manager instance (pools are opened/closed by the app lifespan; stats are on /metrics)
+# ---------------------------
+mcp_manager = MCPManager()
+REGISTRY.register(MCPManagerCollector(mcp_manager))
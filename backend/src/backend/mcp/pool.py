@@ -0,0 +1,203 @@
+# backend/src/backend/mcp/pool.py
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Deque, Dict, Optional, Set, Tuple
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 4
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0  # seconds a session may sit idle before it is pinged
+DEFAULT_PING_TIMEOUT = 5.0
+
+
+class MCPSessionPool:
+    """
+    Bounded pool of long-lived FastMCP client sessions for a single MCP server.
+
+    Each session pays the HTTP connect + MCP initialize handshake once and is then
+    reused across tool calls. Sessions that sat idle longer than the health check
+    interval are pinged before being handed out, and a session that fails while
+    borrowed is discarded so the next borrower reconnects.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        target: Any,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        ping_timeout: float = DEFAULT_PING_TIMEOUT,
+        client_factory: Callable[[Any], Client] = Client,
+    ):
+        """
+        Args:
+            name (str): Server key used in logs and stats (e.g. 'weather')
+            target (Any): Anything fastmcp.Client accepts (URL, FastMCP instance, transport)
+            max_sessions (int): Upper bound on concurrently open sessions
+            health_check_interval (float): Idle seconds after which a session is pinged on borrow
+            ping_timeout (float): Seconds to wait for a health check ping
+            client_factory (Callable): Builds a new client for `target`
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be >= 1")
+
+        self.name = name
+        self.target = target
+        self.max_sessions = max_sessions
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self._client_factory = client_factory
+
+        self._idle: Deque[Tuple[Client, float]] = deque()
+        self._open: Set[Client] = set()
+        self._semaphore = asyncio.Semaphore(max_sessions)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.connects = 0
+        self.reuses = 0
+        self.discards = 0
+        self.failed_health_checks = 0
+
+    # ---------------------------
+    # Lifecycle
+    # ---------------------------
+    async def start(self, warm_sessions: int = 1) -> None:
+        """Open `warm_sessions` sessions up front so the first request skips the handshake."""
+        self._bind_loop()
+        for _ in range(min(warm_sessions, self.max_sessions)):
+            try:
+                client = await self._connect()
+            except Exception as e:
+                logger.warning(f"[MCPSessionPool:{self.name}] Warm-up connect failed: {e}")
+                return
+            self._idle.append((client, time.monotonic()))
+
+    async def close(self) -> None:
+        """
+        Close every idle session; sessions still borrowed are closed when they are
+        returned. The pool reconnects lazily if used again.
+        """
+        idle = [client for client, _ in self._idle]
+        self._idle.clear()
+        self._open = set()  # borrowed sessions are no longer the pool's: _checkin closes them
+        for client in idle:
+            await self._close_client(client)
+
+    # ---------------------------
+    # Borrowing
+    # ---------------------------
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Client]:
+        """
+        Borrow a connected client for the duration of the `async with` block.
+
+        Tool-level errors (ToolError) leave the session healthy and it is returned
+        to the pool; any other exception discards it.
+        """
+        self._bind_loop()
+        async with self._semaphore:
+            client = await self._checkout()
+            try:
+                yield client
+            except ToolError:
+                await self._checkin(client)
+                raise
+            except BaseException:
+                await self._discard(client)
+                raise
+            else:
+                await self._checkin(client)
+
+    async def _checkout(self) -> Client:
+        while self._idle:
+            # LIFO: the most recently used session is the least likely to be stale
+            client, last_used = self._idle.pop()
+            if client.is_connected() and await self._is_healthy(client, last_used):
+                self.reuses += 1
+                return client
+            await self._discard(client)
+        return await self._connect()
+
+    async def _checkin(self, client: Client) -> None:
+        if client not in self._open:
+            # The pool was closed (or its loop changed) while the session was borrowed
+            await self._close_client(client)
+            return
+        self._idle.append((client, time.monotonic()))
+
+    async def _is_healthy(self, client: Client, last_used: float) -> bool:
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            async with asyncio.timeout(self.ping_timeout):
+                return await client.ping()
+        except Exception as e:
+            self.failed_health_checks += 1
+            logger.warning(f"[MCPSessionPool:{self.name}] Health check failed: {e}")
+            return False
+
+    async def _connect(self) -> Client:
+        client = self._client_factory(self.target)
+        await client.__aenter__()
+        self._open.add(client)
+        self.connects += 1
+        logger.info(f"[MCPSessionPool:{self.name}] Opened session ({len(self._open)}/{self.max_sessions})")
+        return client
+
+    async def _discard(self, client: Client) -> None:
+        self.discards += 1
+        self._open.discard(client)
+        await self._close_client(client)
+
+    async def _close_client(self, client: Client) -> None:
+        try:
+            async with asyncio.timeout(self.ping_timeout):
+                await client.close()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            logger.debug(f"[MCPSessionPool:{self.name}] Error closing session: {e}")
+
+    def _bind_loop(self) -> None:
+        # Sessions run background tasks on the loop that opened them. If the pool is
+        # used from a different loop (e.g. TestClient spins one per request), the old
+        # sessions are unusable, so forget them and start over on the current loop.
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._loop is not None and self._open:
+            old_loop = self._loop
+            if old_loop.is_running() and not old_loop.is_closed():
+                # Close them on the loop they belong to
+                logger.info(f"[MCPSessionPool:{self.name}] Event loop changed; closing {len(self._open)} session(s)")
+                for client in self._open:
+                    asyncio.run_coroutine_threadsafe(self._close_client(client), old_loop)
+            else:
+                logger.warning(
+                    f"[MCPSessionPool:{self.name}] Event loop changed; abandoning {len(self._open)} session(s) "
+                    f"whose loop is no longer running"
+                )
+        self._loop = loop
+        self._idle.clear()
+        self._open = set()
+        self._semaphore = asyncio.Semaphore(self.max_sessions)
+
+    # ---------------------------
+    # Introspection
+    # ---------------------------
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "open": len(self._open),
+            "idle": len(self._idle),
+            "max_sessions": self.max_sessions,
+            "connects": self.connects,
+            "reuses": self.reuses,
+            "discards": self.discards,
+            "failed_health_checks": self.failed_health_checks,
+        }
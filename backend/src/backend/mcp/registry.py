@@ -0,0 +1,263 @@
+# backend/src/backend/mcp/registry.py
+"""
+Tool registry built from the MCP servers themselves.
+
+At startup (and every `refresh_interval` seconds after) the registry calls
+`list_tools` on every server registered with the MCPManager and caches the
+name, description and JSON input schema of each tool. The orchestrator uses
+it to generate the tool section of the decision prompt and to resolve the
+tool names the model (or the pre-router) produces, so tool names live in
+exactly one place: the server that implements them. Only the first listing
+is awaited by a request; later refreshes run in a background task while
+requests keep using the last good listing, and each server gets at most
+`list_timeout` seconds to answer.
+
+A tool `<name>_stream_tool` next to `<name>_tool` on the same server is that
+tool's streaming variant: it reports results in progress notifications as
+they arrive. Variants are not listed to the model; the orchestrator switches
+to them itself (see `streaming_variant`).
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from backend.mcp.manager import MCPManager, mcp_manager as shared_mcp_manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_INTERVAL = 300.0   # seconds between full re-listings
+RETRY_INTERVAL = 10.0              # seconds before retrying servers that did not answer
+LIST_TIMEOUT = 5.0                 # seconds a server gets to list its tools
+
+# Names the pre-router, cached decisions and older prompts use for a server's main tool.
+# Tool names and names differing only by a "_tool" suffix resolve without an entry here.
+DEFAULT_ALIASES: Dict[str, str] = {
+    "weather": "get_weather_tool",
+    "geocoding": "geocode_tool",
+    "datetime": "get_current_datetime_tool",
+    "ddgs": "web_search_tool",
+    "search_web_tool": "web_search_tool",
+}
+
+STREAM_SUFFIX = "_stream_tool"
+
+
+class ToolSpec(BaseModel):
+    """One tool as advertised by its MCP server."""
+    server: str
+    name: str
+    description: str = ""
+    input_schema: Dict[str, Any] = Field(default_factory=dict)
+
+    def argument_summary(self) -> Dict[str, str]:
+        """{"location": "string", "max_results": "integer (optional)"} from the JSON schema."""
+        properties = self.input_schema.get("properties", {}) or {}
+        required = set(self.input_schema.get("required", []) or [])
+        return {
+            name: (prop.get("type") or "any") + ("" if name in required else " (optional)")
+            for name, prop in properties.items()
+        }
+
+
+class ToolRegistry:
+    """
+    Cached view of the tools exposed by every MCP server.
+
+    Args:
+        mcp_manager: Manager whose registered servers are listed
+        refresh_interval: Seconds a listing stays fresh
+        aliases: Extra names mapped to MCP tool names
+        list_timeout: Seconds each server gets to answer `list_tools`
+    """
+
+    def __init__(
+        self,
+        mcp_manager: MCPManager | None = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+        aliases: Optional[Dict[str, str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        list_timeout: float = LIST_TIMEOUT,
+    ):
+        self.mcp_manager = mcp_manager or shared_mcp_manager
+        self.refresh_interval = refresh_interval
+        self.list_timeout = list_timeout
+        self.aliases = dict(DEFAULT_ALIASES if aliases is None else aliases)
+        self._clock = clock
+
+        self.tools: Dict[str, ToolSpec] = {}   # MCP tool name -> spec
+        self._refreshed_at: Optional[float] = None
+        self._complete = False
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        self.refreshes = 0
+        self.failed_listings = 0
+
+    # ---------------------------
+    # Refresh
+    # ---------------------------
+    async def refresh(self) -> None:
+        """List tools on every server. Servers that fail keep their previously known tools."""
+        servers = list(self.mcp_manager.pools)
+        listings = await asyncio.gather(
+            *(asyncio.wait_for(self.mcp_manager.list_tools(server), self.list_timeout) for server in servers),
+            return_exceptions=True,
+        )
+
+        tools: Dict[str, ToolSpec] = {}
+        complete = True
+        for server, listing in zip(servers, listings):
+            if isinstance(listing, BaseException):
+                logger.warning(f"[ToolRegistry] Could not list tools on {server}: {listing!r}")
+                self.failed_listings += 1
+                complete = False
+                tools.update({name: spec for name, spec in self.tools.items() if spec.server == server})
+                continue
+            for tool in listing:
+                if tool.name in tools and tools[tool.name].server != server:
+                    logger.warning(
+                        f"[ToolRegistry] Tool {tool.name} exists on {tools[tool.name].server} and {server}; using {server}"
+                    )
+                tools[tool.name] = ToolSpec(
+                    server=server,
+                    name=tool.name,
+                    description=(tool.description or "").strip(),
+                    input_schema=tool.inputSchema or {},
+                )
+
+        self.tools = tools
+        self._complete = complete
+        self._refreshed_at = self._clock()
+        self.refreshes += 1
+        logger.info(f"[ToolRegistry] {len(tools)} tools on {len(servers)} servers: {sorted(tools)}")
+
+    async def ensure_fresh(self) -> None:
+        """
+        Make sure there is a listing, and start a background refresh once it is
+        older than the interval (sooner if some servers did not answer). Only the
+        first listing is awaited; after that the last good listing is served
+        while the refresh runs.
+        """
+        if not self._is_stale():
+            return
+        if self._refreshed_at is None:
+            async with self._lock:
+                if self._refreshed_at is None:
+                    await self.refresh()
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.warning(f"[ToolRegistry] Background refresh failed: {e!r}")
+
+    async def close(self) -> None:
+        """Cancel a background refresh that is still running."""
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    def _is_stale(self) -> bool:
+        if self._refreshed_at is None:
+            return True
+        max_age = self.refresh_interval if self._complete else RETRY_INTERVAL
+        return self._clock() - self._refreshed_at >= max_age
+
+    # ---------------------------
+    # Lookup
+    # ---------------------------
+    def resolve(self, name: Optional[str]) -> Optional[ToolSpec]:
+        """
+        Map a tool name as written by the model, the pre-router or a cached
+        decision to a known tool. Tries, in order: the exact MCP tool name, an
+        alias, the name with/without a "_tool" suffix, and a server name whose
+        server exposes exactly one tool.
+        """
+        if not name:
+            return None
+        name = name.strip()
+        candidates = [name, self.aliases.get(name, ""), f"{name}_tool", name.removesuffix("_tool")]
+        for candidate in candidates:
+            if candidate in self.tools:
+                return self.tools[candidate]
+
+        on_server = [spec for spec in self.advertised() if spec.server == name]
+        if len(on_server) == 1:
+            return on_server[0]
+        return None
+
+    def streaming_variant(self, spec: ToolSpec) -> Optional[ToolSpec]:
+        """The streaming variant of a tool (`web_search_tool` -> `web_search_stream_tool`), if its server has one."""
+        variant = self.tools.get(spec.name.removesuffix("_tool") + STREAM_SUFFIX)
+        return variant if variant is not None and variant.server == spec.server else None
+
+    def _is_streaming_variant(self, spec: ToolSpec) -> bool:
+        if not spec.name.endswith(STREAM_SUFFIX):
+            return False
+        base = self.tools.get(spec.name.removesuffix(STREAM_SUFFIX) + "_tool")
+        return base is not None and base.server == spec.server
+
+    def advertised(self) -> List[ToolSpec]:
+        """Tools offered to the model: everything except streaming variants."""
+        return [spec for spec in self.tools.values() if not self._is_streaming_variant(spec)]
+
+    # ---------------------------
+    # Rendering
+    # ---------------------------
+    def prompt_section(self) -> str:
+        """Tool list for the decision prompt, grouped by server."""
+        if not self.tools:
+            return "(No tools are currently available; answer directly.)"
+
+        by_server: Dict[str, List[ToolSpec]] = {}
+        for spec in self.advertised():
+            by_server.setdefault(spec.server, []).append(spec)
+
+        lines: List[str] = []
+        for i, (server, specs) in enumerate(sorted(by_server.items()), start=1):
+            lines.append(f"{i}. Server: {server}")
+            for spec in sorted(specs, key=lambda s: s.name):
+                description = spec.description.splitlines()[0] if spec.description else ""
+                lines.append(f"   - tool: {spec.name}" + (f" — {description}" if description else ""))
+                args = ", ".join(f'"{k}": "{v}"' for k, v in spec.argument_summary().items())
+                lines.append(f"     args: {{{args}}}")
+            lines.append("")
+        return "\n".join(lines).rstrip()
+
+    def ollama_tools(self) -> List[Dict[str, Any]]:
+        """Function definitions for Ollama's /api/chat `tools` parameter."""
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": spec.name,
+                    "description": spec.description,
+                    "parameters": spec.input_schema or {"type": "object", "properties": {}},
+                },
+            }
+            for spec in self.advertised()
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tools": len(self.tools),
+            "complete": self._complete,
+            "age": None if self._refreshed_at is None else round(self._clock() - self._refreshed_at, 1),
+            "refreshes": self.refreshes,
+            "refreshing": self._refresh_task is not None and not self._refresh_task.done(),
+            "failed_listings": self.failed_listings,
+        }
+
+
+# ---------------------------
+# Shared registry (refreshed by the app lifespan, then on demand)
+# ---------------------------
+tool_registry = ToolRegistry()
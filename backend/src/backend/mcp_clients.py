@@ -1,6 +1,6 @@
 # backend/mcp_clients.py
-from typing import Any, Dict
-from fastmcp import Client
+import os
+from typing import Any, Dict, List
 from fastmcp.client.client import CallToolResult
 
 # MCP server host and port (Docker Compose service name)
@@ -29,10 +29,33 @@ DATETIME_MCP_HOST = "datetime-mcp"
 DATETIME_MCP_PORT = 50051
 DATETIME_URL = f"http://{DATETIME_MCP_HOST}:{DATETIME_MCP_PORT}/mcp"
 
+# Every MCP server the backend talks to: name -> URL. Tools are discovered from the
+# servers at runtime (backend.mcp.registry), so a new server only needs an entry here
+# or in the MCP_SERVERS environment variable ("name=url,name=url"), which extends/overrides it.
+MCP_SERVER_URLS: Dict[str, str] = {
+    "datetime": DATETIME_URL,
+    #"searchxng": SEARCHXNG_URL,
+    "ddgs": DDGS_URL,
+    "weather": WEATHER_URL,
+    "geocoding": GEOCODING_URL,
+}
+for _entry in filter(None, os.environ.get("MCP_SERVERS", "").split(",")):
+    _name, _, _url = _entry.partition("=")
+    if _name.strip() and _url.strip():
+        MCP_SERVER_URLS[_name.strip()] = _url.strip()
 
 
-# NOTE: The Client instance must be used within an async context manager.
-# Do not create it at the module level for direct use.
+
+# NOTE: Sessions are borrowed from the shared MCPManager pool (backend.mcp.manager)
+# instead of opening a new Client (connection + initialize handshake) per call.
+
+
+async def _call_pooled(server: str, tool: str, args: Dict[str, Any]) -> Any:
+    """Call `tool` on a pooled (and coalesced) session for `server` and return its raw CallToolResult."""
+    # Imported here because backend.mcp.manager imports the URL constants above.
+    from backend.mcp.manager import mcp_manager
+
+    return await mcp_manager.call_tool_raw(server, tool, args)
 
 #async def call_searchxng(query: str) -> Dict[str, Any]:
 #    """
@@ -64,9 +87,18 @@ async def call_weather(location: str) -> Dict[str, Any]:
     if not location or not isinstance(location, str):
         return {"error": "Location must be a non-empty string", "results": []}
     try:
-        async with Client(WEATHER_URL) as client:
-            response: CallToolResult = await client.call_tool("get_weather_tool", {"location": location})
-            return response.structured_content
+        response: CallToolResult = await _call_pooled("weather", "get_weather_tool", {"location": location})
+        return response.structured_content
+    except Exception as e:
+        return {"error": str(e), "results": []}
+
+async def call_weather_batch(locations: List[str]) -> Dict[str, Any]:
+    """Weather for several locations via one weather-mcp call (one Open-Meteo request upstream)."""
+    if not locations or not all(isinstance(loc, str) and loc for loc in locations):
+        return {"error": "Locations must be a non-empty list of non-empty strings", "results": []}
+    try:
+        response: CallToolResult = await _call_pooled("weather", "get_weather_batch_tool", {"locations": locations})
+        return response.structured_content
     except Exception as e:
         return {"error": str(e), "results": []}
 
@@ -84,9 +116,8 @@ async def call_geocoding(address: str) -> Dict[str, Any]:
         return {"error": "Address must be a non-empty string", "results": []}
     
     try:
-        async with Client(GEOCODING_URL) as client:
-            mcp_response: CallToolResult = await client.call_tool("geocode_tool", {"address": address})
-            return mcp_response.structured_content or mcp_response.content
+        mcp_response: CallToolResult = await _call_pooled("geocoding", "geocode_tool", {"address": address})
+        return mcp_response.structured_content or mcp_response.content
     except Exception as e:
         return {"error": str(e), "results": []}
 
@@ -102,20 +133,18 @@ async def call_get_current_datetime() -> Dict[str, Any]:
     """
     
     try:
-        async with Client(DATETIME_URL) as client:
-            mcp_response: CallToolResult = await client.call_tool("get_current_datetime_tool", {})
-            return mcp_response.structured_content or mcp_response.content
+        mcp_response: CallToolResult = await _call_pooled("datetime", "get_current_datetime_tool", {})
+        return mcp_response.structured_content or mcp_response.content
     except Exception as e:
         return {"error": str(e), "results": []}
 
 async def call_ddgs(query: str, max_results: int = 5) -> Dict[str, Any]:
     """Call DDGS MCP web_search_tool."""
     try:
-        async with Client(DDGS_URL) as client:
-            response = await client.call_tool("web_search_tool", {
-                "query": query,
-                "max_results": max_results
-            })
-            return response.structured_content or response.content
+        response = await _call_pooled("ddgs", "web_search_tool", {
+            "query": query,
+            "max_results": max_results
+        })
+        return response.structured_content or response.content
     except Exception as e:
         return {"error": str(e), "results": []}
\ No newline at end of file
@@ -0,0 +1,214 @@
+# backend/src/backend/metrics.py
+"""
+Prometheus metrics for the chat pipeline, served on GET /metrics.
+
+Stage latencies of ChatOrchestrator (decision LLM, JSON parse, MCP calls,
+synthesis LLM) are histograms labelled by stage; MCP calls are additionally
+labelled by server/tool/outcome, and Ollama's own timing fields are recorded
+per purpose (decision / synthesis) so model time can be told apart from
+queueing and network time. Tool output sizes before and after compaction
+(llm/compaction.py) show how much synthesis prompt it saves. Queue depth,
+queue wait and rejections of the Ollama admission controller
+(services/admission.py) show whether the model host keeps up. Pre-router
+outcomes (llm/pre_router.py) show how often the LLM decision pass is skipped,
+and the response cache (llm/response_cache.py) reports hits, misses,
+evictions and memory use per level. The MCP session pools and request
+coalescing of the shared MCPManager are read from its stats() at scrape time
+(MCPManagerCollector).
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# Seconds; LLM stages on a CPU host can take minutes, tool calls usually well under a second
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+TOKEN_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+CHAT_REQUEST_SECONDS = Histogram(
+    "chat_request_seconds",
+    "End-to-end latency of a chat query",
+    ["path"],  # answer_cache | direct | synthesis_cache | template | tool
+    buckets=LATENCY_BUCKETS,
+)
+CHAT_STAGE_SECONDS = Histogram(
+    "chat_stage_seconds",
+    "Latency of each chat pipeline stage",
+    ["stage"],  # pre_route | decision_llm | json_parse | tool_calls | synthesis_llm
+    buckets=LATENCY_BUCKETS,
+)
+MCP_CALL_SECONDS = Histogram(
+    "mcp_tool_call_seconds",
+    "Latency of MCP tool calls as seen by the backend",
+    ["server", "tool", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_SECONDS = Histogram(
+    "ollama_duration_seconds",
+    "Durations reported by Ollama (total, load, prompt_eval, eval)",
+    ["purpose", "phase"],
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_TOKENS = Histogram(
+    "ollama_tokens",
+    "Token counts reported by Ollama (prompt_eval = input tokens evaluated, eval = generated)",
+    ["purpose", "phase"],
+    buckets=TOKEN_BUCKETS,
+)
+TOOL_OUTPUT_TOKENS = Histogram(
+    "tool_output_tokens",
+    "Approximate tokens of a tool output before and after compaction",
+    ["tool", "stage"],  # stage: raw | compacted
+    buckets=TOKEN_BUCKETS,
+)
+COMPACTION_TOKENS_SAVED = Histogram(
+    "chat_compaction_tokens_saved",
+    "Approximate synthesis-prompt tokens saved by tool-output compaction, per chat request",
+    buckets=TOKEN_BUCKETS,
+)
+DECISION_FALLBACKS = Counter(
+    "decision_fallbacks_total",
+    "Decisions of the decision model retried on the synthesis model",
+    ["reason"],  # reason: invalid_json | invalid_decision | empty | unknown_tool
+)
+PRE_ROUTES = Counter(
+    "pre_route_total",
+    "Pre-router outcomes; a hit skips the LLM decision pass",
+    ["rule", "outcome"],  # outcome: hit | low_confidence | ambiguous | miss (rule "none" when nothing matched)
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total",
+    "Response cache lookups",
+    ["level", "result"],  # level: answers | decisions | syntheses; result: hit | miss
+)
+RESPONSE_CACHE_EVICTIONS = Counter(
+    "response_cache_evictions_total",
+    "Response cache entries evicted to stay within the level's memory bound",
+    ["level"],
+)
+RESPONSE_CACHE_BYTES = Gauge(
+    "response_cache_bytes",
+    "Approximate memory held by a response cache level",
+    ["level"],
+)
+RESPONSE_CACHE_ENTRIES = Gauge(
+    "response_cache_entries",
+    "Entries held by a response cache level",
+    ["level"],
+)
+SPECULATIVE_CALLS = Counter(
+    "speculative_tool_calls_total",
+    "Tool calls started while the decision pass was still generating",
+    ["tool", "outcome"],  # outcome: used | discarded
+)
+OLLAMA_QUEUE_DEPTH = Gauge(
+    "ollama_queue_depth",
+    "Ollama requests waiting for a generation slot",
+    ["kind"],  # decision | tool_loop | warm_up | synthesis
+)
+OLLAMA_RUNNING = Gauge(
+    "ollama_running",
+    "Ollama generations holding a slot",
+)
+OLLAMA_QUEUE_WAIT_SECONDS = Histogram(
+    "ollama_queue_wait_seconds",
+    "Time an admitted Ollama request waited for a generation slot",
+    ["kind"],
+    buckets=LATENCY_BUCKETS,
+)
+OLLAMA_REJECTIONS = Counter(
+    "ollama_rejections_total",
+    "Ollama requests shed by admission control",
+    ["kind", "reason"],  # reason: queue_full | displaced | deadline
+)
+OLLAMA_ERRORS = Counter(
+    "ollama_errors_total",
+    "Failed Ollama requests",
+    ["purpose"],
+)
+
+# MCPSessionPool.stats() counter -> event label
+_POOL_EVENTS = {
+    "connects": "connect",
+    "reuses": "reuse",
+    "discards": "discard",
+    "failed_health_checks": "failed_health_check",
+}
+
+
+class MCPManagerCollector:
+    """Exports an MCPManager's session pool and coalescing counters (see MCPManager.stats)."""
+
+    def __init__(self, manager: Any):
+        self.manager = manager
+
+    def collect(self) -> Iterator[Any]:
+        stats = self.manager.stats()
+        sessions = GaugeMetricFamily(
+            "mcp_pool_sessions", "MCP client sessions per server", labels=["server", "state"],  # state: open | idle
+        )
+        events = CounterMetricFamily(
+            "mcp_pool_events", "MCP session pool events per server", labels=["server", "event"],
+        )
+        for server, pool in stats["pools"].items():
+            sessions.add_metric([server, "open"], pool["open"])
+            sessions.add_metric([server, "idle"], pool["idle"])
+            for field, event in _POOL_EVENTS.items():
+                events.add_metric([server, event], pool[field])
+
+        flight = stats["singleflight"]
+        calls = CounterMetricFamily(
+            "mcp_singleflight_calls",
+            "MCP tool calls that ran, or joined an identical call already in flight",
+            labels=["result"],  # executed | coalesced
+        )
+        calls.add_metric(["executed"], flight["executed"])
+        calls.add_metric(["coalesced"], flight["coalesced"])
+        in_flight = GaugeMetricFamily("mcp_singleflight_in_flight", "Distinct MCP tool calls in flight")
+        in_flight.add_metric([], flight["in_flight"])
+        yield from (sessions, events, calls, in_flight)
+
+
+# Ollama timing field -> phase label
+_DURATION_FIELDS = {
+    "total_duration": "total",
+    "load_duration": "load",
+    "prompt_eval_duration": "prompt_eval",
+    "eval_duration": "eval",
+}
+_COUNT_FIELDS = {
+    "prompt_eval_count": "prompt_eval",
+    "eval_count": "eval",
+}
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Observe the duration of the enclosed block as `stage` (also when it raises)."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        CHAT_STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - start)
+
+
+def observe_ollama(purpose: str, response: Dict[str, Any]) -> None:
+    """Record the `timings` of a chat_with_ollama/stream_ollama result (durations are in ns)."""
+    if "error" in response:
+        OLLAMA_ERRORS.labels(purpose=purpose).inc()
+        return
+    timings = response.get("timings") or {}
+    for field, phase in _DURATION_FIELDS.items():
+        if field in timings:
+            OLLAMA_SECONDS.labels(purpose=purpose, phase=phase).observe(timings[field] / 1e9)
+    for field, phase in _COUNT_FIELDS.items():
+        if field in timings:
+            OLLAMA_TOKENS.labels(purpose=purpose, phase=phase).observe(timings[field])
+
+
+def render_latest() -> tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type."""
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -1,7 +1,12 @@
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
 
 class ChatRequest(BaseModel):
     message: str
+    session_id: Optional[str] = None                  # Omit to start a new conversation
+    history: Optional[List[Dict[str, Any]]] = None    # Client-side history ({"role", "content"}), used to seed unknown sessions
+    template_answers: Optional[bool] = None           # True/False: force template answers on/off; None: per-tool default
 
 class ChatResponse(BaseModel):
     response: str
+    session_id: Optional[str] = None
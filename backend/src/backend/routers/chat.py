@@ -1,23 +1,47 @@
 # backend/src/backend/routers/chat.py
+import json
 import logging
-from fastapi import APIRouter, HTTPException
+import os
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from backend.logging_setup import log_payload
 from backend.models.chat import ChatRequest, ChatResponse
-from backend.llm.orchestrator import ChatOrchestrator
+from backend.llm.memory import session_store
+from backend.llm.orchestrator import SYNTHESIS_MODEL, ChatOrchestrator
+from backend.llm.tool_calling import ToolCallingEngine
+from backend.services.admission import Overloaded, request_deadline
 
 # Set up logger
 logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
 
 # FastAPI router
 router = APIRouter()
 
 # Single orchestrator instance reused across requests
-print("routers\chat.py initialize orchestrator = ChatOrchestrator()")
-orchestrator = ChatOrchestrator(model_name="Qwen3:4b")
-print("routers\chat.py done initialize orchestrator = ChatOrchestrator()")
+# CHAT_ENGINE=tools switches to native Ollama tool calling over /api/chat
+CHAT_ENGINE = os.environ.get("CHAT_ENGINE", "prompt")
+if CHAT_ENGINE == "tools":
+    orchestrator = ToolCallingEngine(model_name=SYNTHESIS_MODEL)
+else:
+    orchestrator = ChatOrchestrator(model_name=SYNTHESIS_MODEL)   # decision model: DECISION_MODEL
+
+def _open_session(request: ChatRequest) -> str:
+    """Session id for the request: the client's, or a new one. Unknown sessions are seeded from `history`."""
+    session_id = request.session_id or session_store.new_session_id()
+    if request.history:
+        session_store.seed(session_id, request.history)
+    return session_id
+
+
+def _overloaded(e: Overloaded) -> HTTPException:
+    """429 (queue full) or 503 (deadline cannot be met), with Retry-After."""
+    logger.warning(f"Chat request shed: {e}")
+    return HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
 
 @router.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+async def chat(request: ChatRequest, timeout: Optional[float] = Header(None, alias="X-Request-Timeout")):
     """
     Orchestrated chat endpoint.
 
@@ -27,32 +51,112 @@ async def chat(request: ChatRequest):
     3. Calls the appropriate tool via MCPManager if needed.
     4. Returns the final answer generated by LLM, along with optional tool output.
 
+    Pass the returned `session_id` with the next message to continue the
+    conversation; earlier turns are kept server-side.
+
+    An `X-Request-Timeout` header (seconds) tells the backend how long the
+    client will wait; requests that cannot get the model within it are shed.
+
     Args:
         request (ChatRequest): User query wrapped in Pydantic model.
+        timeout (float, optional): Seconds the client will wait (X-Request-Timeout).
 
     Returns:
-        ChatResponse: Contains the final answer string from LLM.
+        ChatResponse: Contains the final answer string from LLM and the session id.
 
     Raises:
-        HTTPException: If any step in orchestration fails.
+        HTTPException: 429/503 with Retry-After if the model host is overloaded,
+            500 if any other step in orchestration fails.
     """
-    logger.info(f"Received chat request: {request.message}")
-    print("routers\chat.py ",request.message)
+    logger.info("Chat request (%d chars, session=%s)", len(request.message), request.session_id or "new")
 
     try:
         # Process the user query using the orchestrator
-        result = await orchestrator.process_query(request.message)
-        logger.info(f"Orchestrator raw result: {result}")
+        session_id = _open_session(request)
+        with request_deadline(timeout):
+            result = await orchestrator.process_query(request.message, session_id, request.template_answers)
 
         # result is already a plain string from the orchestrator
         response_text = result
-        logger.info(f"Returning chat response: {response_text}")
+        log_payload(logger, "Chat response", response_text)
 
-        return ChatResponse(response=response_text)
+        return ChatResponse(response=response_text, session_id=session_id)
 
+    except Overloaded as e:
+        raise _overloaded(e)
     except Exception as e:
         logger.error(f"Chat orchestration failed: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Chat orchestration failed: {str(e)}"
         )
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest, timeout: Optional[float] = Header(None, alias="X-Request-Timeout")):
+    """
+    Streaming variant of /chat.
+
+    Runs the same orchestration, but the final answer is sent as Server-Sent
+    Events while the LLM generates it:
+
+        event: token   data: {"token": "..."}     (repeated)
+        event: done    data: {"response": "...", "session_id": "..."}  (full answer)
+        event: error   data: {"detail": "..."}    (on failure, instead of done)
+
+    The stream starts once the first token is ready. Every model request has
+    been admitted by then, so an overloaded model host is reported as a plain
+    429/503 with Retry-After (see /chat), not as an error event.
+
+    Args:
+        request (ChatRequest): User query wrapped in Pydantic model.
+        timeout (float, optional): Seconds the client will wait (X-Request-Timeout).
+
+    Returns:
+        StreamingResponse: text/event-stream of answer tokens.
+    """
+    logger.info("Streaming chat request (%d chars, session=%s)", len(request.message), request.session_id or "new")
+
+    session_id = _open_session(request)
+    answer = orchestrator.stream_query(request.message, session_id, request.template_answers)
+
+    # Run up to the first token before responding, so a shed request still gets its status code
+    first: Optional[str] = None
+    failure: Optional[str] = None
+    try:
+        with request_deadline(timeout):
+            first = await anext(answer, None)
+    except Overloaded as e:
+        raise _overloaded(e)
+    except Exception as e:
+        logger.error(f"Streaming chat orchestration failed: {str(e)}", exc_info=True)
+        failure = str(e)
+
+    async def event_stream() -> AsyncIterator[str]:
+        if failure is not None:
+            yield _sse("error", {"detail": f"Chat orchestration failed: {failure}"})
+            return
+        tokens = []
+        try:
+            if first is not None:
+                tokens.append(first)
+                yield _sse("token", {"token": first})
+            async for token in answer:
+                tokens.append(token)
+                yield _sse("token", {"token": token})
+        except Exception as e:
+            logger.error(f"Streaming chat orchestration failed: {str(e)}", exc_info=True)
+            yield _sse("error", {"detail": f"Chat orchestration failed: {str(e)}"})
+            return
+        yield _sse("done", {"response": "".join(tokens), "session_id": session_id})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,12 @@
+# backend/src/backend/routers/metrics.py
+from fastapi import APIRouter, Response
+
+from backend.metrics import render_latest
+
+router = APIRouter()
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint (see backend/metrics.py for what is recorded)."""
+    content, content_type = render_latest()
+    return Response(content=content, media_type=content_type)
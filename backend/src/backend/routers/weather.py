@@ -1,6 +1,7 @@
 # backend/src/backend/routers/weather.py
 from fastapi import APIRouter, HTTPException
-from backend.mcp_clients import call_weather
+from typing import List
+from backend.mcp_clients import call_weather, call_weather_batch
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/weather", tags=["weather"])
@@ -8,6 +9,9 @@ router = APIRouter(prefix="/weather", tags=["weather"])
 class WeatherRequest(BaseModel):
     location: str
 
+class WeatherBatchRequest(BaseModel):
+    locations: List[str]
+
 @router.post("/get")
 async def get_weather(request: WeatherRequest):
     """
@@ -19,3 +23,18 @@ async def get_weather(request: WeatherRequest):
         raise HTTPException(status_code=400, detail=result.get("error", "Unknown error"))
     
     return result
+
+
+@router.post("/batch")
+async def get_weather_batch(request: WeatherBatchRequest):
+    """
+    Weather for several locations in one call. Locations are geocoded
+    concurrently and all forecasts come from a single Open-Meteo request.
+    Per-location failures are reported inline in `results`.
+    """
+    result = await call_weather_batch(request.locations)
+
+    if not result or "error" in result:
+        raise HTTPException(status_code=400, detail=result.get("error", "Unknown error"))
+
+    return result
@@ -0,0 +1,216 @@
+# backend/src/backend/services/admission.py
+"""
+Admission control in front of Ollama.
+
+The model host runs one or a few generations at a time. Requests beyond
+that wait here, in a bounded priority queue, instead of piling up on the
+HTTP client for minutes:
+
+* Short decision passes outrank long synthesis passes (PRIORITIES). Within a
+  priority, requests are served first come, first served.
+* A request that would wait longer than its deadline is shed at once, before
+  it takes a queue place. The deadline is the request's own (see
+  `request_deadline`), capped at `max_wait`. The wait is estimated from the
+  queue ahead of it and the measured service time of each kind. A queued
+  request still waiting at its deadline is shed as well.
+* When the queue is full, a new request displaces the lowest-priority queued
+  one if it outranks it. Otherwise the new request is rejected.
+
+Rejections raise `Overloaded`, which the chat router turns into HTTP 429
+(queue full) or 503 (deadline cannot be met) with a Retry-After header.
+"""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+from backend.metrics import OLLAMA_QUEUE_DEPTH, OLLAMA_QUEUE_WAIT_SECONDS, OLLAMA_REJECTIONS, OLLAMA_RUNNING
+
+# Lower runs first
+PRIORITIES: Dict[str, int] = {
+    "decision": 0,
+    "tool_loop": 1,
+    "warm_up": 1,
+    "synthesis": 2,
+}
+
+ADMISSION_MAX_QUEUE = 32       # requests waiting for a slot
+ADMISSION_MAX_WAIT = 60.0      # seconds a request may wait for a slot, whatever its deadline
+
+# Seconds a generation holds its slot, until measured (then an EWMA per kind)
+INITIAL_SERVICE_TIME: Dict[str, float] = {"decision": 1.0, "tool_loop": 2.0, "warm_up": 1.0, "synthesis": 4.0}
+SERVICE_TIME_SMOOTHING = 0.2
+
+# Absolute deadline (time.monotonic()) of the request being served, if the client gave one
+_deadline_var: ContextVar[Optional[float]] = ContextVar("ollama_deadline", default=None)
+
+
+@contextmanager
+def request_deadline(seconds: Optional[float]) -> Iterator[None]:
+    """Generations started inside the block must get a slot within `seconds` from now (None: no deadline)."""
+    token = _deadline_var.set(None if seconds is None else time.monotonic() + seconds)
+    try:
+        yield
+    finally:
+        _deadline_var.reset(token)
+
+
+class Overloaded(Exception):
+    """Ollama cannot take the request now. `status_code` is 429 (queue full) or 503 (deadline)."""
+
+    def __init__(self, reason: str, retry_after: float):
+        self.reason = reason
+        self.retry_after = max(1, math.ceil(retry_after))
+        self.status_code = 503 if reason == "deadline" else 429
+        super().__init__(f"Ollama is overloaded ({reason}); retry after {self.retry_after}s")
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    kind: str = field(compare=False)
+    enqueued: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class AdmissionController:
+    """
+    Args:
+        slots: Generations that may run at once
+        max_queue: Requests that may wait for a slot
+        max_wait: Longest wait for a slot, in seconds
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        max_wait: float = ADMISSION_MAX_WAIT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.slots = slots
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._clock = clock
+        self._queue: List[_Waiter] = []
+        self._seq = itertools.count()
+        self.running = 0
+        self.service_time = dict(INITIAL_SERVICE_TIME)
+        self.admitted = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self, kind: str) -> AsyncIterator[None]:
+        """
+        Hold a generation slot for the block.
+
+        Raises:
+            Overloaded: If the request was shed.
+        """
+        await self.acquire(kind)
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self._observe_service(kind, self._clock() - started)
+            self.release()
+
+    async def acquire(self, kind: str) -> None:
+        priority = PRIORITIES[kind]
+        now = self._clock()
+        deadline = now + self.max_wait
+        if _deadline_var.get() is not None:
+            deadline = min(deadline, _deadline_var.get())
+
+        if self.running < self.slots and not self._queue:
+            self._grant(kind, waited=0.0)
+            return
+
+        expected = self.estimated_wait(priority)
+        if expected > deadline - now:
+            self._reject(kind, "deadline", expected)
+        if len(self._queue) >= self.max_queue:
+            lowest = max(self._queue)
+            if lowest.priority <= priority:
+                self._reject(kind, "queue_full", expected)
+            self._remove(lowest)
+            OLLAMA_REJECTIONS.labels(kind=lowest.kind, reason="displaced").inc()
+            self.rejected += 1
+            lowest.future.set_exception(Overloaded("queue_full", self.estimated_wait(lowest.priority)))
+
+        waiter = _Waiter(priority, next(self._seq), kind, now, asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, waiter)
+        OLLAMA_QUEUE_DEPTH.labels(kind=kind).inc()
+        try:
+            await asyncio.wait_for(waiter.future, timeout=max(0.0, deadline - now))
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            future = waiter.future
+            granted = future.done() and not future.cancelled() and future.exception() is None
+            if isinstance(e, asyncio.TimeoutError):
+                if granted:
+                    return  # handed over at the last moment
+                self._remove(waiter)
+                self._reject(kind, "deadline", self.estimated_wait(priority))
+            if granted:
+                self.release()  # handed over just as the caller gave up
+            else:
+                self._remove(waiter)
+            raise
+
+    def release(self) -> None:
+        """Hand the slot to the highest-priority waiter, or free it."""
+        while self._queue:
+            waiter = heapq.heappop(self._queue)
+            OLLAMA_QUEUE_DEPTH.labels(kind=waiter.kind).dec()
+            if not waiter.future.done():
+                waiter.future.set_result(None)
+                self.admitted += 1
+                OLLAMA_QUEUE_WAIT_SECONDS.labels(kind=waiter.kind).observe(self._clock() - waiter.enqueued)
+                return
+        self.running -= 1
+        OLLAMA_RUNNING.dec()
+
+    def estimated_wait(self, priority: int) -> float:
+        """Seconds a new request of this priority would wait: the work queued ahead of it plus half the running work."""
+        ahead = sum(self.service_time[w.kind] for w in self._queue if w.priority <= priority)
+        mean = sum(self.service_time.values()) / len(self.service_time)
+        running = self.running * mean / 2 if self.running >= self.slots else 0.0
+        return (ahead + running) / self.slots
+
+    def _grant(self, kind: str, waited: float) -> None:
+        self.running += 1
+        self.admitted += 1
+        OLLAMA_RUNNING.inc()
+        OLLAMA_QUEUE_WAIT_SECONDS.labels(kind=kind).observe(waited)
+
+    def _reject(self, kind: str, reason: str, retry_after: float) -> None:
+        self.rejected += 1
+        OLLAMA_REJECTIONS.labels(kind=kind, reason=reason).inc()
+        raise Overloaded(reason, retry_after)
+
+    def _remove(self, waiter: _Waiter) -> None:
+        if waiter in self._queue:
+            self._queue.remove(waiter)
+            heapq.heapify(self._queue)
+            OLLAMA_QUEUE_DEPTH.labels(kind=waiter.kind).dec()
+
+    def _observe_service(self, kind: str, seconds: float) -> None:
+        previous = self.service_time[kind]
+        self.service_time[kind] = previous + SERVICE_TIME_SMOOTHING * (seconds - previous)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "slots": self.slots,
+            "running": self.running,
+            "queued": len(self._queue),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "service_time": {k: round(v, 3) for k, v in self.service_time.items()},
+        }
@@ -1,4 +1,5 @@
 import logging
+from backend.logging_setup import log_payload
 from backend.models.chat import ChatRequest, ChatResponse
 from backend.services.ollama_service import chat_with_ollama
 
@@ -12,7 +13,7 @@ async def chat_reply(request: ChatRequest,model_name: str = DEFAULT_MODEL) -> Ch
     # Await the async Ollama call
     response_data = await chat_with_ollama(request.message,model_name)
 
-    logger.info(f"[chat_reply] Received from Ollama: {response_data}")
+    log_payload(logger, "[chat_reply] Received from Ollama", response_data)
 
     # response_data from the real API uses the key "message"
     return ChatResponse(
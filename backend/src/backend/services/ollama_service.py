@@ -1,38 +1,292 @@
+import asyncio
+import json
 import httpx
 import logging
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, List, Optional
+
+from backend.logging_setup import log_payload
+from backend.services.admission import AdmissionController, Overloaded
 
 logger = logging.getLogger(__name__)
 
 OLLAMA_URL = "http://host.docker.internal:11434/api/generate"
+OLLAMA_CHAT_URL = "http://host.docker.internal:11434/api/chat"
 
 DEFAULT_MODEL = "Qwen3:4b"
 
+# Timeouts (seconds). Connecting to the host should be quick; generation on a CPU
+# host can legitimately take minutes, so only the read timeout is long.
+OLLAMA_CONNECT_TIMEOUT = 5.0
+OLLAMA_READ_TIMEOUT = 600.0
+OLLAMA_WRITE_TIMEOUT = 30.0
+OLLAMA_POOL_TIMEOUT = 30.0
+
+# How long Ollama keeps the model loaded after a request. Pinning it avoids reloading the
+# weights (and losing the cached prompt prefix) between chats; -1 keeps it loaded indefinitely.
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Timing/count fields Ollama reports on the final response (durations are in nanoseconds)
+OLLAMA_TIMING_FIELDS = (
+    "total_duration",
+    "load_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+)
+
+# Keep-alive connection pool and cap on concurrent generations sent to the model host;
+# further generations queue in the admission controller (services/admission.py)
+OLLAMA_MAX_CONNECTIONS = 8
+OLLAMA_MAX_KEEPALIVE = 8
+OLLAMA_MAX_INFLIGHT = 2
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_admission: Optional[AdmissionController] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(
+            connect=OLLAMA_CONNECT_TIMEOUT,
+            read=OLLAMA_READ_TIMEOUT,
+            write=OLLAMA_WRITE_TIMEOUT,
+            pool=OLLAMA_POOL_TIMEOUT,
+        ),
+        limits=httpx.Limits(
+            max_connections=OLLAMA_MAX_CONNECTIONS,
+            max_keepalive_connections=OLLAMA_MAX_KEEPALIVE,
+        ),
+    )
+
 
-async def chat_with_ollama(message: str, model_name: str = DEFAULT_MODEL) -> Dict[str, Any]:
+def get_ollama_client() -> httpx.AsyncClient:
     """
-    Send a message to an Ollama model running on the HOST.
-    Allows custom model names; defaults to Qwen3:4b.
+    Return the shared, connection-pooled Ollama client, creating it on first use.
+
+    The client (and the admission controller's queue) belong to the event loop that
+    created them; if called from a different loop a fresh client is built.
+    """
+    global _client, _client_loop, _admission
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = _build_client()
+        _client_loop = loop
+        _admission = AdmissionController(slots=OLLAMA_MAX_INFLIGHT)
+    return _client
+
+
+async def close_ollama_client() -> None:
+    """Close the shared Ollama client (called at application shutdown)."""
+    global _client, _client_loop, _admission
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client, _client_loop, _admission = None, None, None
+
+
+def _generate_payload(
+    message: str,
+    model_name: str,
+    stream: bool,
+    system: Optional[str] = None,
+    context: Optional[List[int]] = None,
+    options: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
     """
-    payload = {
+    /api/generate payload. The static instructions go in `system`, which the model
+    template places before the prompt, so consecutive requests share a token prefix
+    that Ollama can serve from its KV cache instead of re-evaluating it.
+    """
+    payload: Dict[str, Any] = {
         "model": model_name,
         "prompt": message,
-        "stream": False
+        "stream": stream,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
     }
-    print("In chat with ollama")
-    print("In chat with ollama model",model_name)
+    if system is not None:
+        payload["system"] = system
+    if context:
+        payload["context"] = context
+    if options:
+        payload["options"] = options
+    return payload
+
+
+def _timings(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: data[k] for k in OLLAMA_TIMING_FIELDS if k in data}
+
+
+async def chat_with_ollama(
+    message: str,
+    model_name: str = DEFAULT_MODEL,
+    system: Optional[str] = None,
+    context: Optional[List[int]] = None,
+    kind: str = "synthesis",
+) -> Dict[str, Any]:
+    """
+    Send a message to an Ollama model running on the HOST.
+    Allows custom model names; defaults to Qwen3:4b.
+
+    Uses the shared keep-alive client; at most OLLAMA_MAX_INFLIGHT generations
+    are in flight at once, further callers queue by `kind` (see services/admission.py).
+
+    Args:
+        message: The variable part of the prompt (put it last)
+        model_name: Model to use
+        system: Static instructions, sent as the system prompt so they form a reusable prefix
+        context: Token state returned by a previous call, to continue from it
+        kind: Admission priority class ("decision" outranks "synthesis")
+
+    Returns:
+        {"message": ...} plus, when Ollama reports them, "context" (to pass back in)
+        and "timings" (prompt_eval_count/duration, eval_count/duration, ...);
+        or {"error": ...}.
+
+    Raises:
+        Overloaded: If admission control shed the request.
+    """
+    payload = _generate_payload(message, model_name, stream=False, system=system, context=context)
+    log_payload(logger, "[Ollama] Prompt", message)
 
     try:
-        async with httpx.AsyncClient(timeout=2000.0) as client:
-            print("chat with ollama About to post")
+        client = get_ollama_client()
+        async with _admission.slot(kind):
             response = await client.post(OLLAMA_URL, json=payload)
-            response.raise_for_status()
-            data = response.json()
-            print("chat with ollama data = response.json()",data)
+        response.raise_for_status()
+        data = response.json()
+
+        result: Dict[str, Any] = {"message": data.get("response", "")}
+        log_payload(logger, "[Ollama] Response", result["message"])
+        if data.get("context"):
+            result["context"] = data["context"]
+        timings = _timings(data)
+        logger.debug("[Ollama] %s generate: %s", model_name, timings)
+        if timings:
+            result["timings"] = timings
+        return result
+
+    except Overloaded:
+        raise
+    except Exception as e:
+        logger.error(f"[Ollama] Error contacting Ollama: {e}")
+        return {"error": f"Ollama request failed: {str(e)}"}
+
+
+async def chat_with_tools(
+    messages: List[Dict[str, Any]],
+    tools: List[Dict[str, Any]],
+    model_name: str = DEFAULT_MODEL,
+    format: Optional[Any] = None,
+) -> Dict[str, Any]:
+    """
+    One non-streaming /api/chat round with native tool calling.
+
+    Args:
+        messages: Conversation so far (system, user, assistant and tool messages)
+        tools: Ollama function definitions ({"type": "function", "function": {...}})
+        model_name: Model to use
+        format: Optional structured-output constraint ("json" or a JSON schema)
+
+    Returns:
+        {"message": <assistant message dict with "content" and optional "tool_calls">}
+        or {"error": "..."} if the request failed.
 
-            logger.info(f"[Ollama] Raw response: {data}")
-            return {"message": data.get("response", "")}
+    Raises:
+        Overloaded: If admission control shed the request.
+    """
+    payload: Dict[str, Any] = {
+        "model": model_name,
+        "messages": messages,
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+    }
+    if tools:
+        payload["tools"] = tools
+    if format is not None:
+        payload["format"] = format
+
+    try:
+        client = get_ollama_client()
+        async with _admission.slot("tool_loop"):
+            response = await client.post(OLLAMA_CHAT_URL, json=payload)
+        response.raise_for_status()
+        data = response.json()
+
+        log_payload(logger, "[Ollama] Chat response", data.get("message"))
+        logger.debug("[Ollama] %s chat: %s", model_name, _timings(data))
+        return {"message": data.get("message") or {"role": "assistant", "content": ""}}
 
+    except Overloaded:
+        raise
     except Exception as e:
         logger.error(f"[Ollama] Error contacting Ollama: {e}")
         return {"error": f"Ollama request failed: {str(e)}"}
+
+
+# An empty prompt only loads the model; a token of input makes Ollama evaluate (and cache) the system prefix
+WARM_UP_PROMPT = "Hello"
+
+
+async def warm_ollama(model_name: str = DEFAULT_MODEL, system: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load the model (pinned by keep_alive) and evaluate the static `system` prefix once,
+    so the first real request finds both in memory. Generates a single token.
+
+    Returns the timings Ollama reports, or {"error": ...}.
+    """
+    payload = _generate_payload(WARM_UP_PROMPT, model_name, stream=False, system=system, options={"num_predict": 1})
+    try:
+        client = get_ollama_client()
+        async with _admission.slot("warm_up"):
+            response = await client.post(OLLAMA_URL, json=payload)
+        response.raise_for_status()
+        timings = _timings(response.json())
+        logger.info(f"[Ollama] Warmed {model_name}: {timings}")
+        return timings
+    except Exception as e:
+        logger.warning(f"[Ollama] Warm-up failed: {e}")
+        return {"error": str(e)}
+
+
+async def stream_ollama(
+    message: str,
+    model_name: str = DEFAULT_MODEL,
+    system: Optional[str] = None,
+    timings: Optional[Dict[str, Any]] = None,
+    kind: str = "synthesis",
+) -> AsyncIterator[str]:
+    """
+    Stream a generation from Ollama, yielding response tokens as they arrive.
+
+    Ollama answers `"stream": true` with newline-delimited JSON chunks of the form
+    {"response": "<token>", "done": false}; the last chunk has "done": true.
+    The generation slot (of the given admission `kind`) is held until the stream is exhausted or closed.
+    If `timings` is given, it is filled with the timing fields of the last chunk.
+
+    Raises:
+        Overloaded: If admission control shed the request.
+        httpx.HTTPError: If the request fails.
+        RuntimeError: If Ollama reports an error mid-stream.
+    """
+    payload = _generate_payload(message, model_name, stream=True, system=system)
+
+    client = get_ollama_client()
+    async with _admission.slot(kind):
+        async with client.stream("POST", OLLAMA_URL, json=payload) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(f"Ollama stream failed: {chunk['error']}")
+                token = chunk.get("response")
+                if token:
+                    yield token
+                if chunk.get("done"):
+                    final_timings = _timings(chunk)
+                    if timings is not None:
+                        timings.update(final_timings)
+                    logger.debug("[Ollama] Stream finished: %s", final_timings)
+                    break
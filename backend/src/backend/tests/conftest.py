@@ -0,0 +1,51 @@
+# backend/src/backend/tests/conftest.py
+
+from typing import Callable, Dict, Sequence, Union
+import pytest
+import pytest_asyncio
+from fastmcp import FastMCP
+from backend.llm.orchestrator import ChatOrchestrator
+from backend.llm.pre_router import PreRouter
+from backend.llm.response_cache import ResponseCache
+from backend.mcp.manager import MCPManager
+from backend.mcp.pool import MCPSessionPool
+
+# A stand-in MCP server: a FastMCP instance, or the tool functions to serve from one
+StandIn = Union[FastMCP, Sequence[Callable]]
+
+
+def stand_in_server(name: str, tools: StandIn) -> FastMCP:
+    if isinstance(tools, FastMCP):
+        return tools
+    server = FastMCP(f"{name}-stand-in")
+    for tool in tools:
+        server.tool(tool)
+    return server
+
+
+@pytest_asyncio.fixture
+async def make_manager():
+    """Builds an MCPManager over in-memory stand-ins, {server name: StandIn}; closed after the test."""
+    managers = []
+
+    def make(servers: Dict[str, StandIn]) -> MCPManager:
+        manager = MCPManager()
+        manager.servers = {name: stand_in_server(name, tools) for name, tools in servers.items()}
+        manager.pools = {name: MCPSessionPool(name, server) for name, server in manager.servers.items()}
+        managers.append(manager)
+        return manager
+
+    yield make
+    for manager in managers:
+        await manager.close()
+
+
+@pytest.fixture
+def make_orchestrator(make_manager):
+    """Builds a ChatOrchestrator over stand-ins; the pre-router is off unless one is passed in `options`."""
+    def make(servers: Dict[str, StandIn], **options) -> ChatOrchestrator:
+        options.setdefault("pre_router", PreRouter(enabled=False))
+        options.setdefault("response_cache", ResponseCache())
+        return ChatOrchestrator(mcp_manager=make_manager(servers), **options)
+
+    return make
@@ -0,0 +1,98 @@
+# backend/src/backend/tests/test_admission.py
+
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import AsyncMock, patch
+from backend.app import app
+from backend.services.admission import AdmissionController, Overloaded, request_deadline
+
+
+async def queued(controller: AdmissionController, kind: str, order: list) -> None:
+    async with controller.slot(kind):
+        order.append(kind)
+
+
+@pytest.mark.asyncio
+async def test_decisions_outrank_queued_synthesis():
+    controller = AdmissionController(slots=1)
+    order = []
+    await controller.acquire("synthesis")                 # the model is busy
+    waiting = [asyncio.create_task(queued(controller, kind, order)) for kind in ("synthesis", "synthesis", "decision")]
+    await asyncio.sleep(0)
+
+    controller.release()
+    await asyncio.gather(*waiting)
+
+    assert order == ["decision", "synthesis", "synthesis"]
+    assert controller.running == 0 and controller.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_or_displaces_by_priority():
+    controller = AdmissionController(slots=1, max_queue=1)
+    await controller.acquire("decision")
+    synthesis = asyncio.create_task(controller.acquire("synthesis"))
+    await asyncio.sleep(0)
+
+    with pytest.raises(Overloaded) as rejected:
+        await controller.acquire("synthesis")             # nothing it outranks
+    assert rejected.value.status_code == 429 and rejected.value.retry_after >= 1
+
+    decision = asyncio.create_task(controller.acquire("decision"))
+    await asyncio.sleep(0)
+    with pytest.raises(Overloaded):
+        await synthesis                                   # displaced by the decision
+    controller.release()
+    await decision
+    assert controller.running == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_that_cannot_meet_their_deadline_are_shed():
+    controller = AdmissionController(slots=1)
+    controller.service_time["synthesis"] = 10.0
+    await controller.acquire("synthesis")
+    await asyncio.sleep(0)
+
+    with request_deadline(0.05):
+        with pytest.raises(Overloaded) as timed_out:       # waited in the queue past the deadline
+            await controller.acquire("decision")
+    assert timed_out.value.status_code == 503 and controller.stats()["queued"] == 0
+
+    waiting = asyncio.create_task(controller.acquire("synthesis"))
+    await asyncio.sleep(0)
+    with request_deadline(5.0):
+        with pytest.raises(Overloaded):                    # ~10 s of synthesis ahead: shed without queueing
+            await controller.acquire("synthesis")
+    assert controller.stats()["queued"] == 1
+
+    waiting.cancel()
+    await asyncio.gather(waiting, return_exceptions=True)
+    controller.release()
+    assert controller.running == 0 and controller.stats()["queued"] == 0
+
+
+def test_chat_returns_retry_after_when_overloaded():
+    client = TestClient(app)
+    shed = AsyncMock(side_effect=Overloaded("queue_full", 2.4))
+
+    with patch("backend.routers.chat.orchestrator.process_query", shed):
+        response = client.post("/chat", json={"message": "hi"}, headers={"X-Request-Timeout": "5"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+
+
+def test_chat_stream_is_shed_before_the_stream_starts():
+    client = TestClient(app)
+
+    async def shed(*args, **kwargs):
+        raise Overloaded("deadline", 12)
+        yield
+
+    with patch("backend.routers.chat.orchestrator.stream_query", shed):
+        response = client.post("/chat/stream", json={"message": "hi"})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "12"
@@ -0,0 +1,74 @@
+# backend/src/backend/tests/test_answer_templates.py
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from backend.llm.answer_templates import render_answer
+from backend.llm.pre_router import PreRouter
+
+
+def test_datetime_and_geocoding_render_sentences():
+    assert render_answer("get_current_datetime_tool", '{"result":"2026-10-17T14:05:09.123+00:00"}') == (
+        "It is 14:05 UTC on Saturday, 17 October 2026."
+    )
+    geocode = {"address": "Lima, Peru", "latitude": -12.0464, "longitude": -77.0428, "country": "Peru"}
+    assert render_answer("geocode_tool", json.dumps(geocode)) == "Lima, Peru is at 12.0464° S, 77.0428° W."
+
+
+def test_weather_renders_compacted_output_with_conditions():
+    weather = {"location": "Oslo", "current": {
+        "temperature_c": -3.5, "feels_like_c": -8.0, "humidity_pct": 80, "precipitation_mm": 1.2,
+        "snowfall_cm": 0.8, "wind_kmh": 14, "wind_gusts_kmh": 30, "conditions": "slight snowfall", "wind_from": "NW",
+    }}
+    assert render_answer("get_weather_tool", json.dumps(weather)) == (
+        "In Oslo it is currently -3.5 °C (feels like -8 °C) with slight snowfall. Humidity is 80%; "
+        "wind 14 km/h from the NW, gusting to 30 km/h; 1.2 mm of precipitation; 0.8 cm of snowfall."
+    )
+
+
+def test_unexpected_shapes_and_errors_fall_back_to_the_llm():
+    assert render_answer("get_current_datetime_tool", '{"result":"soon"}') is None
+    assert render_answer("geocode_tool", '{"error":"Address not found"}') is None
+    assert render_answer("get_weather_tool", '{"location":"Oslo","current":{"temperature_2m":1.0}}') is None
+    assert render_answer("web_search_tool", '{"results":[]}') is None
+
+
+async def get_current_datetime_tool() -> str:
+    return "2026-01-01T09:30:00+00:00"
+
+
+async def get_weather_tool(location: str) -> dict:
+    return {"location": location, "latitude": 1.0, "longitude": 2.0, "current": {"temperature_2m": 20.04, "weather_code": 0}}
+
+
+STAND_INS = {"datetime": [get_current_datetime_tool], "weather": [get_weather_tool]}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "query, template_answers, expected",
+    [
+        ("what time is it", None, "It is 09:30 UTC on Thursday, 1 January 2026."),
+        ("what time is it", False, "LLM answer"),
+        ("weather in Paris", None, "LLM answer"),
+        ("weather in Paris", True, "In Paris it is currently 20 °C with clear sky."),
+    ],
+)
+async def test_template_answers_are_selectable_per_tool_and_request(make_orchestrator, query, template_answers, expected):
+    orchestrator = make_orchestrator(STAND_INS, pre_router=PreRouter())
+    llm = AsyncMock(return_value={"message": "LLM answer"})
+
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        assert await orchestrator.process_query(query, template_answers=template_answers) == expected
+
+    assert llm.await_count == (1 if expected == "LLM answer" else 0)  # the pre-router settles the decision
+
+
+@pytest.mark.asyncio
+async def test_weather_template_can_be_enabled_per_tool(make_orchestrator):
+    orchestrator = make_orchestrator(STAND_INS, pre_router=PreRouter(), template_tools={"get_weather_tool"})
+    llm = AsyncMock(return_value={"message": "LLM answer"})
+
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        assert (await orchestrator.process_query("weather in Paris")).startswith("In Paris")
+        assert await orchestrator.process_query("what time is it") == "LLM answer"
@@ -0,0 +1,82 @@
+# backend/src/backend/tests/test_chat_stream.py
+
+import json
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from backend.app import app
+from backend.llm.pre_router import PreRouter
+from backend.services import ollama_service
+
+client = TestClient(app)
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def get_weather_tool(location: str) -> dict:
+    return {"location": location, "temperature_2m": 12.0}
+
+
+async def fake_stream(prompt, model_name, system=None, timings=None):
+    for token in ["It is ", "12°C ", "in Paris."]:
+        yield token
+
+
+@pytest.mark.asyncio
+async def test_stream_ollama_parses_ndjson_chunks(monkeypatch):
+    body = "\n".join(json.dumps(c) for c in [
+        {"response": "Hel", "done": False},
+        {"response": "lo", "done": False},
+        {"response": "", "done": True, "eval_count": 2},
+    ])
+    monkeypatch.setattr(
+        ollama_service,
+        "_build_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(lambda r: httpx.Response(200, text=body))),
+    )
+    await ollama_service.close_ollama_client()
+
+    timings = {}
+    tokens = [t async for t in ollama_service.stream_ollama("hi", timings=timings)]
+
+    assert tokens == ["Hel", "lo"]
+    assert timings == {"eval_count": 2}
+    await ollama_service.close_ollama_client()
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_streams_synthesis_tokens(make_orchestrator):
+    decision = {"message": json.dumps({
+        "tool_required": True, "tool_name": "weather",
+        "arguments": {"location": "Paris"}, "final_answer": None,
+    })}
+    orchestrator = make_orchestrator({"weather": [get_weather_tool]}, pre_router=PreRouter())
+
+    with patch("backend.llm.orchestrator.chat_with_ollama", return_value=decision), \
+         patch("backend.llm.orchestrator.stream_ollama", fake_stream):
+        tokens = [t async for t in orchestrator.stream_query("weather in Paris")]
+
+    assert tokens == ["It is ", "12°C ", "in Paris."]
+
+
+def test_chat_stream_endpoint_sends_tokens_then_done():
+    direct = {"message": json.dumps({
+        "tool_required": False, "tool_name": None, "arguments": {}, "final_answer": "Hello there!",
+    })}
+    with patch("backend.llm.orchestrator.chat_with_ollama", return_value=direct):
+        res = client.post("/chat/stream", json={"message": "hi"})
+
+    assert res.status_code == 200
+    assert res.headers["content-type"].startswith("text/event-stream")
+    (token_event, token), (done_event, done) = parse_sse(res.text)
+    assert (token_event, token) == ("token", {"token": "Hello there!"})
+    assert done_event == "done"
+    assert done["response"] == "Hello there!"
+    assert done["session_id"]  # new conversation -> server-issued session id
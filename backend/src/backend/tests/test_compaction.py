@@ -0,0 +1,76 @@
+# backend/src/backend/tests/test_compaction.py
+
+import json
+from backend.llm.compaction import compact_tool_output
+
+OPEN_METEO_CURRENT = {
+    "temperature_2m": 18.499999618530273, "relative_humidity_2m": 61.0, "apparent_temperature": 17.93000030517578,
+    "is_day": 1.0, "precipitation": 0.0, "rain": 0.0, "showers": 0.0, "snowfall": 0.0, "weather_code": 2.0,
+    "cloud_cover": 43.20000076293945, "pressure_msl": 1015.2999877929688, "surface_pressure": 1009.4,
+    "wind_speed_10m": 11.879999160766602, "wind_direction_10m": 224.0, "wind_gusts_10m": 25.2,
+}
+
+
+def weather(location: str = "Paris") -> dict:
+    return {"location": location, "latitude": 48.85341, "longitude": 2.3488, "current": OPEN_METEO_CURRENT, "source": "Open-Meteo"}
+
+
+def test_weather_keeps_answer_fields_with_units_and_rounding():
+    compaction = compact_tool_output("get_weather_tool", json.dumps(weather()))
+    compact = json.loads(compaction.text)
+
+    assert compact == {
+        "location": "Paris", "latitude": 48.85, "longitude": 2.35,
+        "current": {
+            "temperature_c": 18.5, "feels_like_c": 17.9, "humidity_pct": 61, "precipitation_mm": 0.0,
+            "cloud_cover_pct": 43, "pressure_hpa": 1015, "wind_kmh": 12, "wind_gusts_kmh": 25,
+            "is_day": True, "conditions": "partly cloudy", "wind_from": "SW",
+        },
+    }
+    assert compaction.tokens_after < 0.6 * compaction.tokens_before
+
+
+def test_weather_batch_compacts_each_location_and_keeps_errors():
+    batch = {"results": [weather("Paris"), {"location": "Atlantis", "error": "not found"}]}
+    compact = json.loads(compact_tool_output("get_weather_batch_tool", json.dumps(batch)).text)
+
+    assert compact["results"][0]["current"]["temperature_c"] == 18.5
+    assert compact["results"][1] == {"location": "Atlantis", "error": "not found"}
+
+
+def test_search_drops_duplicates_and_truncates_snippets():
+    results = [
+        {"title": "FastAPI", "link": "https://fastapi.tiangolo.com/", "snippet": "word " * 200},
+        {"title": "FastAPI docs", "link": "http://www.fastapi.tiangolo.com", "snippet": "Same page."},
+        {"title": "fastapi", "link": "https://other.example", "snippet": "Same title."},
+        {"title": "", "link": "https://empty.example", "snippet": " "},
+        {"title": "Starlette", "link": "https://starlette.io", "snippet": "The  ASGI\ntoolkit."},
+    ]
+    payload = {"query": "fastapi", "results": results, "total_results": 5}
+    compact = json.loads(compact_tool_output("web_search_tool", json.dumps(payload)).text)
+
+    assert [r["title"] for r in compact["results"]] == ["FastAPI", "Starlette"]
+    assert len(compact["results"][0]["snippet"]) <= 241 and compact["results"][0]["snippet"].endswith("…")
+    assert compact["results"][1]["snippet"] == "The ASGI toolkit."
+    assert "total_results" not in compact and compact["query"] == "fastapi"
+
+
+def test_budget_drops_trailing_results_then_truncates():
+    results = [{"title": f"Result {i}", "link": f"https://example.com/{i}", "snippet": "x " * 100} for i in range(10)]
+    compaction = compact_tool_output("web_search_tool", json.dumps({"results": results}), budget=150)
+
+    assert compaction.tokens_after <= 150
+    assert [r["title"] for r in json.loads(compaction.text)["results"]] == ["Result 0", "Result 1"]
+
+    text = compact_tool_output("unknown_tool", "y" * 4000, budget=100).text
+    assert len(text) == 401 and text.endswith("…")
+
+
+def test_errors_plain_text_and_unknown_tools_pass_through():
+    error = json.dumps({"error": "Rate limit exceeded", "retry_after": 2.0})
+    assert compact_tool_output("get_weather_tool", error).text == error
+    assert compact_tool_output("get_current_datetime_tool", "2026-01-01T00:00:00+00:00").text == "2026-01-01T00:00:00+00:00"
+
+    unknown = compact_tool_output("joke_tool", json.dumps({"joke": "Why?", "tags": ["pun"]}))
+    assert json.loads(unknown.text) == {"joke": "Why?", "tags": ["pun"]}
+    assert unknown.tokens_after <= unknown.tokens_before
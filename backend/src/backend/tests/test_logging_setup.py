@@ -0,0 +1,63 @@
+# backend/src/backend/tests/test_logging_setup.py
+
+import io
+import logging
+import pytest
+from fastapi.testclient import TestClient
+from backend import logging_setup
+from backend.app import app
+from backend.logging_setup import Truncated, bind_request, log_payload
+
+
+def test_truncated_renders_lazily_and_caps_length():
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("rendered")
+
+    Truncated(Exploding())  # wrapping alone must not serialize anything
+
+    assert str(Truncated("short", limit=10)) == "short"
+    assert str(Truncated("x" * 30, limit=10)) == "x" * 10 + "… [20 more chars]"
+    assert str(Truncated({"a": 1}, limit=10)) == '{"a": 1}'
+
+
+def test_payloads_are_only_logged_in_payload_mode(monkeypatch, caplog):
+    logger = logging.getLogger("backend.tests.payloads")
+    caplog.set_level(logging.DEBUG, logger=logger.name)
+
+    monkeypatch.setattr(logging_setup, "LOG_PAYLOADS", False)
+    log_payload(logger, "Prompt", "a very long prompt")
+    assert caplog.records == []
+
+    monkeypatch.setattr(logging_setup, "LOG_PAYLOADS", True)
+    monkeypatch.setattr(logging_setup, "LOG_PAYLOAD_SAMPLE", 0.0)
+    bind_request("unsampled")
+    log_payload(logger, "Prompt", "a very long prompt")
+    assert caplog.records == []
+
+    monkeypatch.setattr(logging_setup, "LOG_PAYLOAD_SAMPLE", 1.0)
+    bind_request("sampled")
+    log_payload(logger, "Prompt", "a very long prompt")
+    assert [r.getMessage() for r in caplog.records] == ["Prompt: a very long prompt"]
+
+
+def test_queue_writer_stamps_request_ids(monkeypatch):
+    out = io.StringIO()
+    monkeypatch.setattr(logging_setup.sys, "stdout", out)
+    logging_setup.configure_logging(level="INFO", fmt="json")
+    try:
+        bind_request("req-123")
+        logging.getLogger("backend.tests.queue").info("hello %s", "world")
+    finally:
+        logging_setup.shutdown_logging()
+
+    assert '"request_id": "req-123"' in out.getvalue()
+    assert '"message": "hello world"' in out.getvalue()
+
+
+@pytest.mark.parametrize("header", [{"X-Request-ID": "abc123"}, {}])
+def test_request_id_is_echoed(header):
+    r = TestClient(app).get("/health", headers=header)
+    assert r.status_code == 200
+    assert r.headers["X-Request-ID"] == header.get("X-Request-ID", r.headers["X-Request-ID"])
+    assert r.headers["X-Request-ID"]
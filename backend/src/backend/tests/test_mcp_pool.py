@@ -0,0 +1,127 @@
+# backend/src/backend/tests/test_mcp_pool.py
+
+import asyncio
+import pytest
+from fastmcp import FastMCP
+from backend.mcp.pool import MCPSessionPool
+
+
+def make_server() -> FastMCP:
+    server = FastMCP("stand-in")
+
+    @server.tool
+    async def echo_tool(text: str) -> dict:
+        await asyncio.sleep(0.01)
+        return {"echo": text}
+
+    return server
+
+
+@pytest.mark.asyncio
+async def test_pool_reuses_one_session_for_sequential_calls():
+    pool = MCPSessionPool("stand-in", make_server(), max_sessions=2)
+    for i in range(5):
+        async with pool.session() as client:
+            result = await client.call_tool("echo_tool", {"text": str(i)})
+            assert result.structured_content == {"echo": str(i)}
+
+    stats = pool.stats()
+    assert stats["connects"] == 1
+    assert stats["reuses"] == 4
+    await pool.close()
+    assert pool.stats()["open"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_never_exceeds_max_sessions():
+    pool = MCPSessionPool("stand-in", make_server(), max_sessions=2)
+
+    async def call(i: int):
+        async with pool.session() as client:
+            return await client.call_tool("echo_tool", {"text": str(i)})
+
+    results = await asyncio.gather(*(call(i) for i in range(10)))
+    assert [r.structured_content["echo"] for r in results] == [str(i) for i in range(10)]
+    assert pool.stats()["connects"] <= 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_reconnects_after_broken_session():
+    pool = MCPSessionPool("stand-in", make_server(), max_sessions=1)
+
+    with pytest.raises(RuntimeError):
+        async with pool.session():
+            raise RuntimeError("connection dropped")
+
+    async with pool.session() as client:
+        result = await client.call_tool("echo_tool", {"text": "again"})
+
+    assert result.structured_content == {"echo": "again"}
+    assert pool.stats()["discards"] == 1
+    assert pool.stats()["connects"] == 2
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_health_checks_idle_sessions():
+    pool = MCPSessionPool("stand-in", make_server(), health_check_interval=0.0)
+    await pool.start()
+    async with pool.session() as client:
+        await client.call_tool("echo_tool", {"text": "ping first"})
+
+    assert pool.stats()["connects"] == 1
+    assert pool.stats()["failed_health_checks"] == 0
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_is_reusable_after_close_and_closes_borrowed_sessions_on_return():
+    pool = MCPSessionPool("stand-in", make_server(), max_sessions=2)
+    async with pool.session() as borrowed:
+        await pool.close()
+        assert borrowed.is_connected()  # not closed under its user
+    assert not borrowed.is_connected()  # closed when returned
+
+    for i in range(3):
+        async with pool.session() as client:
+            await client.call_tool("echo_tool", {"text": str(i)})
+
+    assert pool.stats()["connects"] == 2  # one session after close, reused
+    assert pool.stats()["open"] == pool.stats()["idle"] == 1
+    await pool.close()
+    assert not client.is_connected()
+
+
+@pytest.mark.asyncio
+async def test_manager_call_tool_uses_pool_and_rejects_unknown_server(make_manager):
+    manager = make_manager({"stand-in": make_server()})
+
+    first = await manager.call_tool("stand-in", "echo_tool", {"text": "a"})
+    second = await manager.call_tool("stand-in", "echo_tool", {"text": "b"})
+    missing = await manager.call_tool("nope", "echo_tool", {})
+
+    assert first == {"echo": "a"}
+    assert second == {"echo": "b"}
+    assert "error" in missing
+    assert manager.stats()["pools"]["stand-in"]["connects"] == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_coalesces_identical_concurrent_calls(make_manager):
+    calls = []
+
+    async def echo_tool(text: str) -> dict:
+        calls.append(text)
+        await asyncio.sleep(0.05)
+        return {"echo": text}
+
+    manager = make_manager({"stand-in": [echo_tool]})
+
+    results = await asyncio.gather(
+        *(manager.call_tool("stand-in", "echo_tool", {"text": t}) for t in ["London", " london ", "LONDON", "Paris"])
+    )
+
+    assert [r["echo"] for r in results] == ["London", "London", "London", "Paris"]
+    assert sorted(calls) == ["London", "Paris"]
+    assert manager.stats()["singleflight"]["coalesced"] == 2
@@ -0,0 +1,89 @@
+# backend/src/backend/tests/test_memory.py
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from backend.llm.memory import SessionStore
+from backend.llm.orchestrator import ChatOrchestrator
+from backend.llm.pre_router import PreRouter
+from backend.llm.response_cache import ResponseCache
+from backend.mcp.manager import MCPManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_turns_over_budget_are_folded_into_digest():
+    store = SessionStore(token_budget=60)
+    for i in range(6):
+        store.append("s1", f"question {i} " + "x" * 80, f"answer {i}")
+
+    session = store.get("s1")
+    assert 1 <= len(session) < 6
+    assert "question 0" in session.digest
+    assert session.turn_tokens() <= 60 or len(session) == 1
+    assert store.stats()["summarized_turns"] == 6 - len(session)
+
+
+def test_ring_buffer_keeps_recent_turns_and_tool_results_carry_forward():
+    store = SessionStore(max_turns=2, token_budget=10_000)
+    store.append("s1", "weather in Paris", "Sunny, 21°C", "weather", {"location": "Paris", "latitude": 48.85})
+    store.append("s1", "thanks", "You're welcome")
+    store.append("s1", "and tomorrow?", "Probably rain")
+
+    context = store.context("s1")
+    assert "weather in Paris" in store.get("s1").digest      # dropped from the buffer, kept in the digest
+    assert [t.user for t in store.get("s1").turns] == ["thanks", "and tomorrow?"]
+    assert '"latitude": 48.85' in context                    # earlier tool result still available
+
+
+def test_idle_and_lru_sessions_are_evicted():
+    clock = FakeClock()
+    store = SessionStore(max_sessions=2, idle_ttl=60, clock=clock)
+    store.append("a", "hi", "hello")
+    clock.now = 30
+    store.append("b", "hi", "hello")
+    clock.now = 70                                            # "a" is idle, "b" is not
+    store.get("c")
+    assert len(store) == 2 and store.stats()["evicted_idle"] == 1
+    store.get("d")                                            # over max_sessions: "b" goes
+    assert store.stats()["evicted_lru"] == 1
+    assert store.context("b") == ""
+
+
+def test_seed_from_client_history():
+    store = SessionStore()
+    store.seed("s1", [
+        {"role": "user", "content": "weather in Oslo"},
+        {"role": "assistant", "content": "Cold."},
+    ])
+    assert "weather in Oslo" in store.context("s1")
+
+
+@pytest.mark.asyncio
+async def test_follow_up_sees_previous_turn_and_bypasses_query_cache():
+    store = SessionStore()
+    cache = ResponseCache()
+    orchestrator = ChatOrchestrator(
+        mcp_manager=MCPManager(), pre_router=PreRouter(enabled=False), response_cache=cache, memory=store,
+    )
+    orchestrator.tool_registry.ensure_fresh = AsyncMock()
+    cache.put_answer("and tomorrow?", None, "an unrelated cached answer")
+
+    direct = lambda text: {"message": json.dumps({
+        "tool_required": False, "tool_name": None, "arguments": {}, "final_answer": text,
+    })}
+    llm = AsyncMock(side_effect=[direct("Sunny in Paris."), direct("Rain in Paris tomorrow.")])
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        await orchestrator.process_query("weather in Paris", session_id="s1")
+        answer = await orchestrator.process_query("and tomorrow?", session_id="s1")
+
+    assert answer == "Rain in Paris tomorrow."
+    follow_up_prompt = llm.await_args_list[1].args[0]
+    assert "weather in Paris" in follow_up_prompt and "Current message: and tomorrow?" in follow_up_prompt
+    assert len(store.get("s1")) == 2
@@ -0,0 +1,68 @@
+# backend/src/backend/tests/test_metrics.py
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY, CollectorRegistry
+from backend.app import app
+from backend.metrics import MCPManagerCollector
+
+OLLAMA_TIMINGS = {"total_duration": 2_000_000_000, "eval_count": 42, "prompt_eval_count": 7}
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_tool_query_records_every_stage(make_orchestrator):
+    async def get_weather_tool(location: str) -> dict:
+        return {"location": location, "temperature_2m": 20.0}
+
+    orchestrator = make_orchestrator({"weather": [get_weather_tool]})
+    decision = {"tool_required": True, "tool_name": "get_weather_tool", "arguments": {"location": "Oslo"}, "final_answer": None}
+    llm = AsyncMock(side_effect=[
+        {"message": json.dumps(decision), "timings": OLLAMA_TIMINGS},
+        {"message": "20 degrees in Oslo.", "timings": OLLAMA_TIMINGS},
+    ])
+
+    stages = ["decision_llm", "json_parse", "tool_calls", "synthesis_llm"]
+    before = {stage: sample("chat_stage_seconds_count", stage=stage) for stage in stages}
+    mcp_before = sample("mcp_tool_call_seconds_count", server="weather", tool="get_weather_tool", outcome="ok")
+    tokens_before = sample("ollama_tokens_sum", purpose="synthesis", phase="eval")
+    requests_before = sample("chat_request_seconds_count", path="tool")
+
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        assert await orchestrator.process_query("weather in Oslo") == "20 degrees in Oslo."
+
+    for stage in stages:
+        assert sample("chat_stage_seconds_count", stage=stage) == before[stage] + 1
+    assert sample("mcp_tool_call_seconds_count", server="weather", tool="get_weather_tool", outcome="ok") == mcp_before + 1
+    assert sample("ollama_tokens_sum", purpose="synthesis", phase="eval") == tokens_before + 42
+    assert sample("chat_request_seconds_count", path="tool") == requests_before + 1
+
+
+def test_metrics_endpoint_serves_prometheus_text():
+    r = TestClient(app).get("/metrics")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain")
+    assert "chat_stage_seconds" in r.text
+    assert "mcp_singleflight_calls_total" in r.text   # the shared MCPManager's counters
+
+
+@pytest.mark.asyncio
+async def test_mcp_manager_pool_and_coalescing_counters_are_collected(make_manager):
+    async def echo_tool(text: str) -> dict:
+        return {"echo": text}
+
+    manager = make_manager({"echo": [echo_tool]})
+    await manager.call_tool("echo", "echo_tool", {"text": "a"})
+    await manager.call_tool("echo", "echo_tool", {"text": "b"})
+    registry = CollectorRegistry()
+    registry.register(MCPManagerCollector(manager))
+
+    assert registry.get_sample_value("mcp_pool_events_total", {"server": "echo", "event": "connect"}) == 1
+    assert registry.get_sample_value("mcp_pool_events_total", {"server": "echo", "event": "reuse"}) == 1
+    assert registry.get_sample_value("mcp_pool_sessions", {"server": "echo", "state": "idle"}) == 1
+    assert registry.get_sample_value("mcp_singleflight_calls_total", {"result": "executed"}) == 2
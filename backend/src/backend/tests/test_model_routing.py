@@ -0,0 +1,76 @@
+# backend/src/backend/tests/test_model_routing.py
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from backend.llm.prompt_templates import FINAL_ANSWER_SYSTEM_PROMPT
+from backend.metrics import DECISION_FALLBACKS
+
+WEATHER_DECISION = {"tool_required": True, "tool_name": "get_weather_tool", "arguments": {"location": "Oslo"}, "final_answer": None}
+
+
+async def get_weather_tool(location: str) -> dict:
+    return {"location": location, "current": {"temperature_2m": 1.0}}
+
+
+@pytest.fixture
+def orchestrator(make_orchestrator):
+    return make_orchestrator({"weather": [get_weather_tool]}, model_name="large", decision_model="small")
+
+
+def fake_ollama(small_decision: str):
+    """chat_with_ollama stand-in: the small model answers `small_decision`, the large one decides correctly."""
+    async def chat(prompt, model_name, system=None, **kwargs):
+        if system != FINAL_ANSWER_SYSTEM_PROMPT:
+            return {"message": small_decision if model_name == "small" else json.dumps(WEATHER_DECISION)}
+        return {"message": f"answer from {model_name}"}
+    return AsyncMock(side_effect=chat)
+
+
+def fallbacks(reason: str) -> float:
+    return DECISION_FALLBACKS.labels(reason=reason)._value.get()
+
+
+def models_called(llm: AsyncMock) -> list:
+    return [call.args[1] for call in llm.await_args_list]
+
+
+@pytest.mark.asyncio
+async def test_small_model_decides_and_large_model_answers(orchestrator):
+    llm = fake_ollama(json.dumps(WEATHER_DECISION))
+
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        assert await orchestrator.process_query("Oslo?") == "answer from large"
+
+    assert models_called(llm) == ["small", "large"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "small_decision, reason",
+    [
+        ('{"tool_required": true, "tool_name": "get_weather', "invalid_json"),
+        ('{"tool_required": true, "tool_name": "get_weather_tool", "arguments": "Oslo"}', "invalid_decision"),
+        ('{"tool_required": true, "tool_name": "weather_lookup", "arguments": {"city": "Oslo"}}', "unknown_tool"),
+        ('{"tool_required": false, "tool_name": null, "arguments": {}, "final_answer": null}', "empty"),
+    ],
+)
+async def test_unusable_small_model_decisions_fall_back_to_the_large_model(orchestrator, small_decision, reason):
+    llm = fake_ollama(small_decision)
+    before = fallbacks(reason)
+
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        assert await orchestrator.process_query("Oslo?") == "answer from large"
+
+    assert models_called(llm) == ["small", "large", "large"]
+    assert fallbacks(reason) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_both_models(orchestrator):
+    warm = AsyncMock(return_value={})
+
+    with patch("backend.llm.orchestrator.warm_ollama", warm):
+        await orchestrator.warm_up()
+
+    assert [call.args[0] for call in warm.await_args_list] == ["small", "large", "large"]
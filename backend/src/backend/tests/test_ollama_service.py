@@ -0,0 +1,109 @@
+# backend/src/backend/tests/test_ollama_service.py
+
+import asyncio
+import json
+import httpx
+import pytest
+from backend.services import ollama_service
+
+
+@pytest.fixture
+def mock_ollama(monkeypatch):
+    """Route the shared Ollama client through an in-process transport and track concurrency."""
+    state = {"inflight": 0, "peak": 0, "requests": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"] += 1
+        state["inflight"] += 1
+        state["peak"] = max(state["peak"], state["inflight"])
+        await asyncio.sleep(0.02)
+        state["inflight"] -= 1
+        return httpx.Response(200, json={"response": "Mocked LLM Response"})
+
+    monkeypatch.setattr(
+        ollama_service,
+        "_build_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    yield state
+
+
+@pytest.mark.asyncio
+async def test_chat_with_ollama_reuses_shared_client(mock_ollama):
+    first = await ollama_service.chat_with_ollama("hi")
+    client = ollama_service.get_ollama_client()
+    second = await ollama_service.chat_with_ollama("hi again")
+
+    assert first == second == {"message": "Mocked LLM Response"}
+    assert ollama_service.get_ollama_client() is client
+    await ollama_service.close_ollama_client()
+
+
+@pytest.mark.asyncio
+async def test_chat_with_ollama_caps_inflight_generations(mock_ollama, monkeypatch):
+    monkeypatch.setattr(ollama_service, "OLLAMA_MAX_INFLIGHT", 2)
+    await ollama_service.close_ollama_client()
+
+    results = await asyncio.gather(*(ollama_service.chat_with_ollama(f"q{i}") for i in range(8)))
+
+    assert all(r == {"message": "Mocked LLM Response"} for r in results)
+    assert mock_ollama["requests"] == 8
+    assert mock_ollama["peak"] <= 2
+    await ollama_service.close_ollama_client()
+
+
+@pytest.mark.asyncio
+async def test_chat_with_tools_posts_messages_tools_and_format(monkeypatch):
+    seen = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen["url"] = str(request.url)
+        seen["payload"] = json.loads(request.content)
+        return httpx.Response(200, json={"message": {"role": "assistant", "content": "", "tool_calls": [
+            {"function": {"name": "get_weather_tool", "arguments": {"location": "Oslo"}}},
+        ]}})
+
+    monkeypatch.setattr(
+        ollama_service,
+        "_build_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    await ollama_service.close_ollama_client()
+
+    tools = [{"type": "function", "function": {"name": "get_weather_tool", "parameters": {}}}]
+    result = await ollama_service.chat_with_tools([{"role": "user", "content": "Oslo?"}], tools, format="json")
+
+    assert seen["url"].endswith("/api/chat")
+    assert seen["payload"]["tools"] == tools
+    assert seen["payload"]["format"] == "json"
+    assert result["message"]["tool_calls"][0]["function"]["arguments"] == {"location": "Oslo"}
+    await ollama_service.close_ollama_client()
+
+
+@pytest.mark.asyncio
+async def test_generate_sends_system_prefix_and_keep_alive_and_returns_timings(monkeypatch):
+    seen = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen["payload"] = json.loads(request.content)
+        return httpx.Response(200, json={
+            "response": "ok", "context": [1, 2, 3],
+            "prompt_eval_count": 12, "prompt_eval_duration": 3_000_000, "eval_count": 1, "eval_duration": 9_000_000,
+        })
+
+    monkeypatch.setattr(
+        ollama_service,
+        "_build_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    await ollama_service.close_ollama_client()
+
+    result = await ollama_service.chat_with_ollama("Now process: hi", system="static instructions", context=[7])
+
+    assert seen["payload"]["system"] == "static instructions"
+    assert seen["payload"]["prompt"] == "Now process: hi"
+    assert seen["payload"]["keep_alive"] == ollama_service.OLLAMA_KEEP_ALIVE
+    assert seen["payload"]["context"] == [7]
+    assert result["context"] == [1, 2, 3]
+    assert result["timings"]["prompt_eval_count"] == 12
+    await ollama_service.close_ollama_client()
@@ -0,0 +1,88 @@
+# backend/src/backend/tests/test_parallel_tools.py
+
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from backend.llm.response_cache import ResponseCache
+from backend.llm.schemas import ToolDecision
+
+TOOL_DELAY = 0.2
+
+
+def stand_ins(weather_delay: float = TOOL_DELAY) -> dict:
+    async def get_weather_tool(location: str) -> dict:
+        await asyncio.sleep(weather_delay)
+        return {"location": location, "temperature_2m": 20.0}
+
+    async def get_current_datetime_tool() -> str:
+        await asyncio.sleep(TOOL_DELAY)
+        return "2026-01-01T00:00:00+00:00"
+
+    return {"weather": [get_weather_tool], "datetime": [get_current_datetime_tool]}
+
+
+def compound_decision() -> dict:
+    return {
+        "tool_required": True,
+        "tool_calls": [
+            {"tool_name": "weather", "arguments": {"location": "Paris"}},
+            {"tool_name": "weather", "arguments": {"location": "Tokyo"}},
+            {"tool_name": "datetime", "arguments": {}},
+        ],
+        "final_answer": None,
+    }
+
+
+def test_single_tool_decision_is_a_one_item_call_list():
+    decision = ToolDecision(tool_required=True, tool_name="weather", arguments={"location": "Paris"}, final_answer=None)
+    assert [c.tool_name for c in decision.calls()] == ["weather"]
+    assert ToolDecision(tool_required=False, tool_name=None, arguments=None, final_answer="hi").calls() == []
+
+
+@pytest.mark.asyncio
+async def test_compound_query_runs_tools_concurrently_with_one_synthesis(make_orchestrator):
+    orchestrator = make_orchestrator(stand_ins())
+    await orchestrator.mcp_manager.start()
+    llm = AsyncMock(side_effect=[{"message": json.dumps(compound_decision())}, {"message": "Sunny in both; it is midnight."}])
+
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        started = time.perf_counter()
+        answer = await orchestrator.process_query("weather in Paris and Tokyo and the current time")
+        elapsed = time.perf_counter() - started
+
+    assert answer == "Sunny in both; it is midnight."
+    assert llm.await_count == 2  # one decision pass, one synthesis pass
+    synthesis_prompt = llm.await_args_list[1].args[0]
+    assert "Paris" in synthesis_prompt and "Tokyo" in synthesis_prompt and "2026-01-01" in synthesis_prompt
+    assert elapsed < 2.5 * TOOL_DELAY  # slowest tool, not the sum of three
+
+
+@pytest.mark.asyncio
+async def test_slow_tool_times_out_without_failing_the_others(make_orchestrator):
+    orchestrator = make_orchestrator(stand_ins(weather_delay=5), tool_timeout=0.5)
+    decision = {"tool_required": True, "tool_calls": compound_decision()["tool_calls"][1:], "final_answer": None}
+
+    with patch.object(orchestrator, "_decide_with_llm", AsyncMock(return_value=decision)):
+        turn = await orchestrator._prepare_turn("weather in Tokyo and the time")
+
+    assert turn.tool_name == "weather,datetime"
+    assert turn.degraded
+    assert "timed out" in turn.final_prompt
+    assert "2026-01-01" in turn.final_prompt
+
+
+@pytest.mark.asyncio
+async def test_answer_with_a_failed_tool_is_not_cached(make_orchestrator):
+    cache = ResponseCache()
+    orchestrator = make_orchestrator(stand_ins(weather_delay=5), response_cache=cache, tool_timeout=0.5)
+    decision = {"tool_required": True, "tool_calls": compound_decision()["tool_calls"][1:], "final_answer": None}
+    query = "weather in Tokyo and the time"
+
+    with patch.object(orchestrator, "_decide_with_llm", AsyncMock(return_value=decision)), \
+         patch("backend.llm.orchestrator.chat_with_ollama", AsyncMock(return_value={"message": "No weather; it is midnight."})):
+        assert await orchestrator.process_query(query) == "No weather; it is midnight."
+
+    assert cache.get_answer(query) is None
+    assert cache.syntheses.stats()["entries"] == 0
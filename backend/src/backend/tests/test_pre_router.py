@@ -0,0 +1,78 @@
+# backend/src/backend/tests/test_pre_router.py
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from backend.llm.pre_router import PreRouter
+from backend.llm.schemas import PreRouteResult, ToolDecision
+from backend.metrics import PRE_ROUTES
+
+
+@pytest.mark.parametrize("query, tool_name, arguments", [
+    ("what time is it?", "datetime", {}),
+    ("What is the date today", "datetime", {}),
+    ("weather in Paris", "weather", {"location": "Paris"}),
+    ("What's the weather like in New York, NY?", "weather", {"location": "New York, NY"}),
+    ("weather in Paris today", "weather", {"location": "Paris"}),
+    ("coordinates of Eiffel Tower", "geocoding", {"address": "Eiffel Tower"}),
+    ("search for salt and pepper recipes", "ddgs", {"query": "salt and pepper recipes"}),
+])
+def test_rules_settle_obvious_queries(query, tool_name, arguments):
+    result = PreRouter().route(query)
+    assert result is not None
+    assert result.decision.tool_name == tool_name
+    assert result.decision.arguments == arguments
+
+
+@pytest.mark.parametrize("query", [
+    "tell me a joke",
+    "weather in Paris and Tokyo",
+    "what's the weather in Paris and the current time",
+    "weather in Paris tomorrow",          # forecasts are not current weather
+    "forecast for Lyon this weekend",
+    "what's the weather in Oslo on Friday?",
+])
+def test_unclear_or_compound_queries_fall_back(query):
+    router = PreRouter()
+    assert router.route(query) is None
+    assert router.stats()["hits"] == 0
+
+
+def test_classifier_respects_confidence_threshold():
+    def classifier(query):
+        return PreRouteResult(
+            decision=ToolDecision(tool_required=True, tool_name="ddgs", arguments={"query": query}, final_answer=None),
+            confidence=0.5 if "maybe" in query else 0.9,
+            rule="classifier",
+        )
+
+    def routed(outcome):
+        return PRE_ROUTES.labels(rule="classifier", outcome=outcome)._value.get()
+
+    hits, low = routed("hit"), routed("low_confidence")
+    router = PreRouter(classifier=classifier, threshold=0.8)
+    assert router.route("latest rust release") is not None
+    assert router.route("maybe something") is None
+    assert router.stats()["by_rule"] == {"classifier": 1}
+    assert router.stats()["low_confidence"] == 1
+    assert (routed("hit"), routed("low_confidence")) == (hits + 1, low + 1)   # exported on /metrics
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_skips_llm_decision_on_hit(make_orchestrator):
+    def get_current_datetime_tool() -> str:
+        return "2026-01-01T00:00:00+00:00"
+
+    orchestrator = make_orchestrator({"datetime": [get_current_datetime_tool]}, pre_router=PreRouter())
+    llm = AsyncMock(return_value={"message": json.dumps({
+        "tool_required": False, "tool_name": None, "arguments": {}, "final_answer": "Hi!",
+    })})
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm), \
+         patch.object(orchestrator, "_decide_with_llm", wraps=orchestrator._decide_with_llm) as decide:
+        answer = await orchestrator.process_query("hello")
+        assert answer == "Hi!"
+        assert decide.await_count == 1
+
+        routed = await orchestrator._prepare_turn("what time is it")
+        assert decide.await_count == 1  # no LLM decision pass for the routed query
+        assert routed.tool_name == "datetime"
@@ -0,0 +1,98 @@
+# backend/src/backend/tests/test_response_cache.py
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from prometheus_client import REGISTRY
+from backend.llm.response_cache import ResponseCache, TTLCache, normalize_query
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_query_ignores_case_and_punctuation():
+    assert normalize_query("Weather in Paris?") == normalize_query("weather  in paris") == "weather in paris"
+
+
+def test_ttl_cache_expires_and_evicts_lru():
+    clock = FakeClock()
+    cache = TTLCache(max_bytes=400, clock=clock)
+    cache.set("a", "x" * 50, ttl=10)
+    cache.set("b", "y" * 50, ttl=10)
+    assert cache.get("a") == "x" * 50          # "a" is now most recently used
+    cache.set("c", "z" * 150, ttl=10)          # over budget -> evict LRU ("b")
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.evictions >= 1
+    assert cache.bytes <= 400
+
+    clock.now = 11
+    assert cache.get("a") is None
+
+
+def test_per_tool_ttls():
+    clock = FakeClock()
+    cache = ResponseCache(clock=clock)
+    cache.put_answer("what time is it", "datetime", "It is noon.")
+    cache.put_answer("weather in paris", "weather", "Sunny.")
+    cache.put_answer("coordinates of paris", "geocoding", "48.85, 2.35")
+
+    assert cache.get_answer("what time is it") is None   # datetime is never cached
+    clock.now = 30 * 60
+    assert cache.get_answer("Weather in Paris?") is None  # weather expired after minutes
+    assert cache.get_answer("coordinates of Paris") == "48.85, 2.35"
+
+
+def test_synthesis_key_includes_tool_output():
+    cache = ResponseCache()
+    cache.put_synthesis("weather in paris", "weather", {"temp": 12}, "12 degrees")
+    assert cache.get_synthesis("Weather in Paris!", "weather", {"temp": 12}) == "12 degrees"
+    assert cache.get_synthesis("weather in paris", "weather", {"temp": 13}) is None
+
+
+def test_levels_are_exported_as_metrics():
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0.0
+
+    hits = sample("response_cache_lookups_total", level="syntheses", result="hit")
+    misses = sample("response_cache_lookups_total", level="syntheses", result="miss")
+    cache = ResponseCache()
+    cache.put_synthesis("weather in paris", "weather", {"temp": 12}, "12 degrees")
+    cache.get_synthesis("weather in paris", "weather", {"temp": 12})
+    cache.get_synthesis("weather in paris", "weather", {"temp": 13})
+
+    assert sample("response_cache_lookups_total", level="syntheses", result="hit") == hits + 1
+    assert sample("response_cache_lookups_total", level="syntheses", result="miss") == misses + 1
+    assert sample("response_cache_bytes", level="syntheses") == cache.syntheses.bytes > 0
+    assert sample("response_cache_entries", level="syntheses") == 1
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_serves_repeat_queries_from_cache(make_orchestrator):
+    calls = []
+
+    async def get_weather_tool(location: str) -> dict:
+        calls.append(location)
+        return {"location": location, "temperature_2m": 12.0}
+
+    orchestrator = make_orchestrator({"weather": [get_weather_tool]})
+    llm = AsyncMock(side_effect=[
+        {"message": json.dumps({"tool_required": True, "tool_name": "weather",
+                                "arguments": {"location": "Paris"}, "final_answer": None})},
+        {"message": "It is 12°C in Paris."},
+    ])
+
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        first = await orchestrator.process_query("weather in paris")
+        second = await orchestrator.process_query("Weather in Paris?")
+
+    assert first == second == "It is 12°C in Paris."
+    assert llm.await_count == 2          # decision + synthesis, once
+    assert calls == ["Paris"]
+    stats = orchestrator.response_cache.stats()
+    assert stats["answers"]["hits"] == 1
@@ -0,0 +1,120 @@
+# backend/src/backend/tests/test_speculation.py
+
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from backend.llm.pre_router import PreRouter
+from backend.llm.speculation import DecisionScanner
+from backend.metrics import SPECULATIVE_CALLS
+from backend.services.admission import Overloaded
+
+
+def chunks(text: str, size: int = 3):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def test_scanner_reports_calls_as_soon_as_their_arguments_close():
+    decision = json.dumps({
+        "tool_required": True,
+        "tool_calls": [
+            {"tool_name": "get_weather_tool", "arguments": {"location": "Rio {de} \"Janeiro\""}},
+            {"tool_name": "get_current_datetime_tool", "arguments": {}},
+        ],
+        "final_answer": None,
+    })
+    scanner = DecisionScanner()
+    reported = []
+    for i, chunk in enumerate(chunks(decision)):
+        reported += [(i, call) for call in scanner.feed(chunk)]
+
+    assert [(c.tool_name, c.arguments) for _, c in reported] == [
+        ("get_weather_tool", {"location": 'Rio {de} "Janeiro"'}),
+        ("get_current_datetime_tool", {}),
+    ]
+    assert reported[-1][0] < len(chunks(decision)) - 5  # before the rest of the decision was generated
+
+
+@pytest.fixture
+def calls() -> list:
+    return []
+
+
+@pytest.fixture
+def orchestrator(make_orchestrator, calls):
+    async def get_weather_tool(location: str) -> dict:
+        calls.append(location)
+        await asyncio.sleep(0.2)
+        return {"location": location, "current": {"temperature_2m": 20.0}}
+
+    return make_orchestrator({"weather": [get_weather_tool]}, pre_router=PreRouter(), speculate=True)
+
+
+def fake_stream(decision: str, tail_delay: float):
+    """stream_ollama stand-in: the decision up to the first arguments object at once, then slowly."""
+    split = decision.index("}") + 1
+
+    async def stream(*args, **kwargs):
+        yield decision[:split]
+        for chunk in chunks(decision[split:], 2):
+            await asyncio.sleep(tail_delay)
+            yield chunk
+
+    return stream
+
+
+def speculative(tool: str, outcome: str) -> float:
+    return SPECULATIVE_CALLS.labels(tool=tool, outcome=outcome)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_tool_call_overlaps_the_rest_of_the_decision(orchestrator, calls):
+    decision = '{"tool_required": true, "tool_name": "get_weather_tool", "arguments": {"location": "Paris"}, "final_answer": null}'
+    used = speculative("get_weather_tool", "used")
+
+    with patch("backend.llm.orchestrator.stream_ollama", fake_stream(decision, 0.02)), \
+         patch("backend.llm.orchestrator.chat_with_ollama", AsyncMock(return_value={"message": "Warm"})):
+        started = time.perf_counter()
+        assert await orchestrator.process_query("Paris?") == "Warm"
+        elapsed = time.perf_counter() - started
+
+    assert calls == ["Paris"]                   # called once, not again after the decision
+    assert elapsed < 0.2 + 0.02 * 12 - 0.05     # 12 chunks after the arguments: the tool call ran meanwhile
+    assert speculative("get_weather_tool", "used") == used + 1
+
+
+@pytest.mark.asyncio
+async def test_calls_the_final_decision_does_not_make_are_discarded(orchestrator, calls):
+    # tool_calls takes precedence over tool_name: the Paris call is not part of the final decision
+    decision = json.dumps({
+        "tool_required": True, "tool_name": "get_weather_tool", "arguments": {"location": "Paris"},
+        "tool_calls": [{"tool_name": "get_weather_tool", "arguments": {"location": "Rome"}}],
+    })
+    discarded = speculative("get_weather_tool", "discarded")
+    synthesis = AsyncMock(return_value={"message": "Sunny in Rome"})
+
+    with patch("backend.llm.orchestrator.stream_ollama", fake_stream(decision, 0.0)), \
+         patch("backend.llm.orchestrator.chat_with_ollama", synthesis):
+        assert await orchestrator.process_query("Rome?") == "Sunny in Rome"
+
+    assert sorted(calls) == ["Paris", "Rome"]
+    prompt = synthesis.await_args.args[0]
+    assert "Rome" in prompt.split("returned")[1] and "Paris" not in prompt
+    assert speculative("get_weather_tool", "discarded") == discarded + 1
+
+
+@pytest.mark.asyncio
+async def test_calls_are_discarded_when_the_decision_pass_fails(orchestrator, calls):
+    decision = '{"tool_required": true, "tool_name": "get_weather_tool", "arguments": {"location": "Oslo"}, "final_answer": null}'
+    discarded = speculative("get_weather_tool", "discarded")
+
+    async def overloaded_after_arguments(*args, **kwargs):
+        yield decision[:decision.index("}") + 1]
+        raise Overloaded("queue_full", 1)
+
+    with patch("backend.llm.orchestrator.stream_ollama", overloaded_after_arguments):
+        with pytest.raises(Overloaded):
+            await orchestrator.process_query("Oslo?")
+
+    assert speculative("get_weather_tool", "discarded") == discarded + 1
@@ -0,0 +1,81 @@
+# backend/src/backend/tests/test_streaming_tools.py
+
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastmcp import Context
+from backend.mcp.registry import ToolRegistry
+
+SLOW_ENGINE = 2.0
+
+
+def result(i: int) -> dict:
+    return {"title": f"result {i}", "link": f"https://example.com/{i}", "snippet": f"Snippet {i}. " * 5}
+
+
+async def web_search_tool(query: str, max_results: int = 5) -> dict:
+    """Web search."""
+    await asyncio.sleep(SLOW_ENGINE)
+    return {"query": query, "results": [result(i) for i in range(max_results)]}
+
+
+async def web_search_stream_tool(query: str, ctx: Context, max_results: int = 5) -> dict:
+    """Web search, streaming."""
+    for batch, delay in (([0, 1], 0.0), ([2, 3], 0.1), (range(4, max_results), SLOW_ENGINE)):
+        await asyncio.sleep(delay)
+        await ctx.report_progress(batch[-1] + 1, max_results, json.dumps([result(i) for i in batch]))
+    return {"query": query, "results": [result(i) for i in range(max_results)]}
+
+
+# A search server whose streaming variant reports 2 results, then 2 more, then (slowly) the rest
+SEARCH = {"ddgs": [web_search_tool, web_search_stream_tool]}
+
+
+def search_decision() -> dict:
+    return {"tool_required": True, "tool_name": "web_search_tool", "arguments": {"query": "fastapi"}, "final_answer": None}
+
+
+async def run_query(make_orchestrator, **orchestrator_args) -> tuple[str, float]:
+    """Synthesis prompt and seconds to produce the answer."""
+    orchestrator = make_orchestrator(SEARCH, **orchestrator_args)
+    llm = AsyncMock(side_effect=[{"message": json.dumps(search_decision())}, {"message": "FastAPI is a framework."}])
+    with patch("backend.llm.orchestrator.chat_with_ollama", llm):
+        started = time.perf_counter()
+        assert await orchestrator.process_query("latest fastapi news") == "FastAPI is a framework."
+        elapsed = time.perf_counter() - started
+    return llm.await_args_list[1].args[0], elapsed
+
+
+@pytest.mark.asyncio
+async def test_registry_hides_streaming_variants_from_the_model(make_manager):
+    registry = ToolRegistry(make_manager(SEARCH))
+    await registry.refresh()
+
+    assert registry.streaming_variant(registry.resolve("ddgs")).name == "web_search_stream_tool"
+    assert "web_search_stream_tool" not in registry.prompt_section()
+    assert [t["function"]["name"] for t in registry.ollama_tools()] == ["web_search_tool"]
+
+
+@pytest.mark.asyncio
+async def test_synthesis_starts_once_top_k_results_are_in(make_orchestrator):
+    prompt, elapsed = await run_query(make_orchestrator, stream_top_k=3)
+
+    assert "result 3" in prompt and "result 4" not in prompt and '"partial":true' in prompt
+    assert elapsed < SLOW_ENGINE / 2
+
+
+@pytest.mark.asyncio
+async def test_token_budget_cuts_streamed_results(make_orchestrator):
+    prompt, _ = await run_query(make_orchestrator, stream_top_k=10, stream_token_budget=30)
+
+    assert "result 0" in prompt and "result 1" not in prompt
+
+
+@pytest.mark.asyncio
+async def test_streaming_disabled_waits_for_the_full_result(make_orchestrator):
+    prompt, elapsed = await run_query(make_orchestrator, stream_top_k=0)
+
+    assert "result 4" in prompt and "partial" not in prompt
+    assert elapsed >= SLOW_ENGINE
@@ -0,0 +1,54 @@
+# backend/src/backend/tests/test_tool_calling.py
+
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from backend.llm.tool_calling import ToolCallingEngine
+
+
+async def get_weather_tool(location: str) -> dict:
+    """Return weather data for a location."""
+    return {"location": location, "temperature_2m": 21.5}
+
+
+WEATHER = {"weather": [get_weather_tool]}
+
+
+@pytest.mark.asyncio
+async def test_engine_builds_tools_from_mcp_schemas_and_runs_the_loop(make_manager):
+    engine = ToolCallingEngine(mcp_manager=make_manager(WEATHER))
+    llm = AsyncMock(side_effect=[
+        {"message": {"role": "assistant", "content": "", "tool_calls": [
+            {"function": {"name": "get_weather_tool", "arguments": {"location": "Paris"}}},
+        ]}},
+        {"message": {"role": "assistant", "content": "It is 21.5°C in Paris."}},
+    ])
+
+    with patch("backend.llm.tool_calling.chat_with_tools", llm):
+        answer = await engine.process_query("How warm is it in Paris?")
+
+    assert answer == "It is 21.5°C in Paris."
+    messages, tools = llm.await_args_list[0].args[:2]
+    assert tools[0]["function"]["name"] == "get_weather_tool"
+    assert tools[0]["function"]["parameters"]["properties"]["location"]["type"] == "string"
+
+    # The conversation is kept across rounds: the tool result follows the assistant's call
+    assert [m["role"] for m in messages] == ["system", "user", "assistant", "tool", "assistant"]
+    assert json.loads(messages[3]["content"]) == {"location": "Paris", "temperature_2m": 21.5}
+
+
+@pytest.mark.asyncio
+async def test_engine_reports_unknown_tools_to_the_model(make_manager):
+    engine = ToolCallingEngine(mcp_manager=make_manager(WEATHER), max_rounds=1)
+    llm = AsyncMock(side_effect=[
+        {"message": {"role": "assistant", "content": "", "tool_calls": [{"function": {"name": "nope", "arguments": "{}"}}]}},
+        {"message": {"role": "assistant", "content": "I could not look that up."}},
+    ])
+
+    with patch("backend.llm.tool_calling.chat_with_tools", llm):
+        answer = await engine.process_query("anything")
+
+    assert answer == "I could not look that up."
+    final_messages, final_tools = llm.await_args_list[1].args[:2]
+    assert final_tools == []  # out of rounds: answer without offering tools
+    assert "Unknown tool" in final_messages[-1]["content"]
@@ -0,0 +1,90 @@
+# backend/src/backend/tests/test_tool_registry.py
+
+import asyncio
+import pytest
+from backend.mcp.registry import ToolRegistry
+
+
+async def get_weather_tool(location: str) -> dict:
+    """Return weather data for a location."""
+    return {"location": location}
+
+
+async def get_weather_batch_tool(locations: list[str]) -> dict:
+    """Return weather data for several locations."""
+    return {"results": []}
+
+
+async def web_search_tool(query: str, max_results: int = 5) -> dict:
+    """Search the web."""
+    return {"results": []}
+
+
+STAND_INS = {"weather": [get_weather_tool, get_weather_batch_tool], "ddgs": [web_search_tool]}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_registry_discovers_tools_and_resolves_aliases(make_manager):
+    manager = make_manager(STAND_INS)
+    registry = ToolRegistry(manager)
+    await registry.refresh()
+
+    assert sorted(registry.tools) == ["get_weather_batch_tool", "get_weather_tool", "web_search_tool"]
+    assert registry.resolve("get_weather_tool").server == "weather"
+    assert registry.resolve("weather").name == "get_weather_tool"          # alias
+    assert registry.resolve("search_web_tool").name == "web_search_tool"   # the name the old prompt used
+    assert registry.resolve("web_search").name == "web_search_tool"        # missing "_tool" suffix
+    assert registry.resolve("nope") is None
+
+    section = registry.prompt_section()
+    assert "tool: web_search_tool — Search the web." in section
+    assert '"query": "string", "max_results": "integer (optional)"' in section
+
+
+@pytest.mark.asyncio
+async def test_registry_refreshes_in_the_background_and_keeps_tools_of_failed_servers(make_manager):
+    manager = make_manager(STAND_INS)
+    clock = FakeClock()
+    registry = ToolRegistry(manager, refresh_interval=60, clock=clock, list_timeout=0.1)
+
+    await registry.ensure_fresh()
+    await registry.ensure_fresh()
+    assert registry.stats()["refreshes"] == 1
+
+    async def hung(server):
+        await asyncio.Event().wait()
+
+    manager.list_tools = hung
+    clock.now = 61
+    await registry.ensure_fresh()   # returns at once: the refresh runs in the background
+    await registry.ensure_fresh()   # and is not started twice
+
+    assert registry.stats()["refreshes"] == 1
+    assert registry.stats()["refreshing"] is True
+    assert "web_search_tool" in registry.tools
+
+    await asyncio.sleep(0.2)        # each hung listing times out after list_timeout
+    assert registry.stats()["refreshes"] == 2
+    assert registry.stats()["complete"] is False
+    assert registry.stats()["failed_listings"] == 2
+    assert "web_search_tool" in registry.tools  # last known tools survive an outage
+    await registry.close()
+
+
+@pytest.mark.asyncio
+async def test_single_tool_server_resolves_by_server_name(make_manager):
+    def now_tool() -> str:
+        return "now"
+
+    registry = ToolRegistry(make_manager({"clock": [now_tool]}), aliases={})
+    await registry.refresh()
+
+    assert registry.resolve("clock").name == "now_tool"
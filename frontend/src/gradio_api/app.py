@@ -1,24 +1,65 @@
+import json
+
 import gradio as gr
 import requests
 
 BACKEND_URL = "http://backend:8000/chat"  # Adjust as needed
+BACKEND_STREAM_URL = "http://backend:8000/chat/stream"
+
+def _to_gradio_messages(history):
+    """Convert internal (user, assistant) tuples to Gradio Chatbot message dicts."""
+    messages = []
+    for user_msg, assistant_msg in history:
+        messages.append({"role": "user", "content": user_msg})
+        messages.append({"role": "assistant", "content": assistant_msg})
+    return messages
+
+
+def _iter_sse(response):
+    """Yield (event, data) pairs from a text/event-stream response."""
+    event, data_lines = "message", []
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
 
-def chat_with_backend(message, history):
+def chat_with_backend(message, history, session_id=None):
+    """
+    Stream the answer from the backend's /chat/stream endpoint, yielding
+    the updated chat after every token so Gradio renders it as it arrives.
+
+    The backend keeps the conversation under `session_id`; the id it returns
+    is stored in Gradio state and sent with the next message.
+    """
     debug_logs = []
     debug_logs.append(f"Sending message to backend: {message}")
 
-    # Send a simple history format to backend (list of dicts or strings)
-    backend_request_history = [
-        {"role": "user", "content": h[0]} if isinstance(h, tuple) else h
-        for h in history
-    ]
+    # History in {"role", "content"} form; the backend only uses it to rebuild a session it lost
+    backend_request_history = _to_gradio_messages(history)
 
-    data = {"message": message, "history": backend_request_history}
+    data = {"message": message, "history": backend_request_history, "session_id": session_id}
 
+    backend_resp = ""
     try:
-        response = requests.post(BACKEND_URL, json=data)
-        response.raise_for_status()
-        backend_resp = response.json().get("response", "No response")
+        with requests.post(BACKEND_STREAM_URL, json=data, stream=True) as response:
+            response.raise_for_status()
+            for event, payload in _iter_sse(response):
+                if event == "token":
+                    backend_resp += payload["token"]
+                    yield _to_gradio_messages(history + [(message, backend_resp)]), history, session_id, "\n".join(debug_logs)
+                elif event == "done":
+                    backend_resp = payload.get("response", backend_resp)
+                    session_id = payload.get("session_id", session_id)
+                elif event == "error":
+                    raise RuntimeError(payload.get("detail", "Unknown error"))
         debug_logs.append(f"Received backend response: {backend_resp}")
     except Exception as e:
         backend_resp = f"Error: {str(e)}"
@@ -27,16 +68,9 @@ def chat_with_backend(message, history):
     # Update history in tuple form (internal)
     history = history + [(message, backend_resp)]
 
-    # Convert to Gradio Chatbot format:
-    gradio_history = [
-        {"role": "user", "content": h[0]} if i == 0 else {"role": "assistant", "content": h[1]}
-        for h in history
-        for i in [0]
-    ]
-
     debug_log_text = "\n".join(debug_logs)
 
-    return gradio_history, history, debug_log_text
+    yield _to_gradio_messages(history), history, session_id, debug_log_text
 
 def chat_with_backend1(message, history):
     debug_logs = []
@@ -60,11 +94,12 @@ with gr.Blocks() as demo:
     chatbot = gr.Chatbot()
     msg = gr.Textbox(placeholder="Type your message here")
     state = gr.State([])
+    session_state = gr.State(None)
     debug_output = gr.Textbox(label="Debug Log", interactive=False, lines=10)
 
-    # Inputs: message textbox, chat history
-    # Outputs: chatbot messages, updated history state, debug log textbox
-    msg.submit(chat_with_backend, inputs=[msg, state], outputs=[chatbot, state, debug_output])
+    # Inputs: message textbox, chat history, backend session id
+    # Outputs: chatbot messages, updated history state, session id, debug log textbox
+    msg.submit(chat_with_backend, inputs=[msg, state, session_state], outputs=[chatbot, state, session_state, debug_output])
     msg.submit(lambda: "", [], msg)  # Clear input box after submit
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+# ddgs_mcp/cache.py
+"""
+Search result cache with stale-while-revalidate.
+
+Entries are keyed on (normalized query, region) and hold the largest result
+set fetched for that key, so a request for fewer results is answered by
+slicing; a request for more than was fetched is a miss.
+
+An entry is fresh for `ttl` seconds. After that and until `stale_ttl` it is
+still served, but flagged stale so the caller can refresh it in the
+background; after `stale_ttl` it is a miss. The in-memory LRU holds at most
+`memory_size` entries. With a `path`, entries are also written to SQLite and
+survive restarts; `set` deletes expired rows from the file every
+`purge_interval` seconds so it does not grow without bound.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger("ddgs-mcp")
+
+SEARCH_CACHE_PATH = os.environ.get("SEARCH_CACHE_PATH") or None   # unset: memory only
+SEARCH_CACHE_TTL = 10 * 60              # fresh for 10 minutes
+SEARCH_CACHE_STALE_TTL = 6 * 3600       # then served stale (and refreshed) for up to 6 hours
+SEARCH_CACHE_SIZE = 1024                # entries in the in-memory LRU
+SEARCH_CACHE_PURGE_INTERVAL = 3600      # seconds between purges of expired entries
+
+
+def normalize_query(query: str) -> str:
+    """'  News of  the DAY ' -> 'news of the day'"""
+    return re.sub(r"\s+", " ", query.strip().lower())
+
+
+class CachedSearch(NamedTuple):
+    results: List[Dict[str, Any]]   # at most the requested number
+    max_results: int                # size of the result set the entry was fetched with
+    fresh: bool
+
+
+class _Entry(NamedTuple):
+    results: List[Dict[str, Any]]
+    max_results: int
+    fetched_at: float
+
+
+class SearchCache:
+    """
+    Args:
+        path: Optional SQLite file backing the in-memory LRU
+        ttl: Seconds an entry is fresh
+        stale_ttl: Seconds (from fetch) an entry may be served stale
+        memory_size: Max entries kept in memory
+        purge_interval: Seconds between purges of expired entries (run from `set`)
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = SEARCH_CACHE_PATH,
+        ttl: float = SEARCH_CACHE_TTL,
+        stale_ttl: float = SEARCH_CACHE_STALE_TTL,
+        memory_size: int = SEARCH_CACHE_SIZE,
+        purge_interval: float = SEARCH_CACHE_PURGE_INTERVAL,
+        clock=time.time,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.memory_size = memory_size
+        self.purge_interval = purge_interval
+        self._clock = clock
+        self._next_purge = clock() + purge_interval
+
+        self._memory: "OrderedDict[tuple[str, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def _db(self) -> Optional[sqlite3.Connection]:
+        # Opened on first use so importing the module does not touch the disk
+        if self.path and self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS search ("
+                " query TEXT NOT NULL,"
+                " region TEXT NOT NULL,"
+                " results TEXT NOT NULL,"
+                " max_results INTEGER NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (query, region))"
+            )
+        return self._conn
+
+    def get(self, query: str, max_results: int, region: str) -> Optional[CachedSearch]:
+        """Cached results for the query (sliced to `max_results`), or None on a miss."""
+        key = (normalize_query(query), region)
+        now = self._clock()
+        with self._lock:
+            entry = self._memory.get(key) or self._load(key)
+            if entry is None or now - entry.fetched_at >= self.stale_ttl or entry.max_results < max_results:
+                self.misses += 1
+                return None
+            self._remember(key, entry)
+
+            fresh = now - entry.fetched_at < self.ttl
+            if fresh:
+                self.fresh_hits += 1
+            else:
+                self.stale_hits += 1
+            return CachedSearch(entry.results[:max_results], entry.max_results, fresh)
+
+    def set(self, query: str, max_results: int, region: str, results: List[Dict[str, Any]]) -> None:
+        """Store a result set fetched with `max_results`, unless a larger fresh one is already cached."""
+        key = (normalize_query(query), region)
+        now = self._clock()
+        with self._lock:
+            current = self._memory.get(key)
+            if current is not None and current.max_results > max_results and now - current.fetched_at < self.ttl:
+                return
+            purge = now >= self._next_purge
+            if purge:
+                self._next_purge = now + self.purge_interval
+            entry = _Entry(results, max_results, now)
+            self._remember(key, entry)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO search (query, region, results, max_results, fetched_at)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        (key[0], key[1], json.dumps(results), max_results, now),
+                    )
+                except sqlite3.Error as e:
+                    logger.warning(f"Search cache write failed for '{key[0]}': {e}")
+        if purge:
+            self.purge_expired()
+
+    def _load(self, key: tuple[str, str]) -> Optional[_Entry]:
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute(
+                "SELECT results, max_results, fetched_at FROM search WHERE query = ? AND region = ?", key
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Search cache read failed for '{key[0]}': {e}")
+            return None
+        return None if row is None else _Entry(json.loads(row[0]), row[1], row[2])
+
+    def _remember(self, key: tuple[str, str], entry: _Entry) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def purge_expired(self) -> int:
+        """Delete entries too old to be served even stale. Returns the number removed from disk."""
+        cutoff = self._clock() - self.stale_ttl
+        with self._lock:
+            for key in [k for k, e in self._memory.items() if e.fetched_at <= cutoff]:
+                del self._memory[key]
+            if self._db is None:
+                return 0
+            try:
+                return self._db.execute("DELETE FROM search WHERE fetched_at <= ?", (cutoff,)).rowcount
+            except sqlite3.Error as e:
+                logger.warning(f"Search cache purge failed: {e}")
+                return 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory_entries": len(self._memory),
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "persistent": bool(self.path),
+        }
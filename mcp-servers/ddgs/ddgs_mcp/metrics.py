@@ -0,0 +1,42 @@
+# ddgs_mcp/metrics.py
+"""
+Prometheus metrics for the MCP server, served on GET /metrics.
+
+Records how long DuckDuckGo searches take, so a slow tool call can be
+attributed to the upstream scrape rather than to the MCP transport.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+from starlette.responses import Response
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+UPSTREAM_SECONDS = Histogram(
+    "mcp_upstream_seconds",
+    "Latency of requests to the upstream API",
+    ["upstream", "outcome"],  # outcome: ok | error
+    buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def observe_upstream(upstream: str) -> Iterator[None]:
+    """Observe the duration of the enclosed upstream call; outcome is "error" if it raises."""
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        UPSTREAM_SECONDS.labels(upstream=upstream, outcome=outcome).observe(time.perf_counter() - start)
+
+
+def metrics_response() -> Response:
+    """Current metrics in the Prometheus text format."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,6 +1,11 @@
 # ddgs_mcp/server.py
-from fastmcp import FastMCP
-from ddgs_mcp.tool import web_search
+import json
+
+from fastmcp import Context, FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from ddgs_mcp.metrics import metrics_response
+from ddgs_mcp.tool import DEFAULT_REGION, search_cache, search_flight, search_pool, web_search_coalesced, web_search_stream
 
 import logging
 
@@ -11,9 +16,35 @@ def main():
     mcp = FastMCP("ddgs-mcp")
     
     @mcp.tool
-    def web_search_tool(query: str, max_results: int = 5):
+    async def web_search_tool(query: str, max_results: int = 5, region: str = DEFAULT_REGION):
         """DuckDuckGo web search. Returns title, link, and snippet for top results."""
-        return web_search(query, max_results)
+        return await web_search_coalesced(query, max_results, region)
+
+    @mcp.tool
+    async def web_search_stream_tool(query: str, ctx: Context, max_results: int = 5, region: str = DEFAULT_REGION):
+        """Streaming variant of web_search_tool: each progress notification carries the new results as a JSON list."""
+        received = 0
+
+        async def on_results(batch):
+            nonlocal received
+            received += len(batch)
+            await ctx.report_progress(received, max_results, json.dumps([r.model_dump() for r in batch]))
+
+        return await web_search_stream(query, max_results, region, on_results)
+
+    @mcp.custom_route("/stats", methods=["GET"])
+    async def stats(request: Request) -> JSONResponse:
+        """Cache, request coalescing and search pool counters."""
+        return JSONResponse({
+            "cache": search_cache.stats(),
+            "singleflight": {"web_search": search_flight.stats()},
+            "search_pool": search_pool.stats(),
+        })
+    
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics(request: Request) -> Response:
+        """Prometheus metrics: upstream search latency."""
+        return metrics_response()
     
     mcp.run(transport="http", host="0.0.0.0", port=50052)
     logger.info("DDGS MCP server running on http://0.0.0.0:50052/mcp")
@@ -1,11 +1,122 @@
-from typing import List, Dict, Any
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
 from pydantic import BaseModel, Field
 import logging
 
 from ddgs import DDGS
 
+from ddgs_mcp.cache import SearchCache, normalize_query
+from ddgs_mcp.metrics import observe_upstream
+from ddgs_mcp.singleflight import SingleFlight
+
 logger = logging.getLogger("ddgs-mcp")
 
+T = TypeVar("T")
+
+DEFAULT_REGION = "wt-wt"     # DuckDuckGo's "no region"
+
+# Concurrent identical searches share one DuckDuckGo scrape
+search_flight = SingleFlight("web_search")
+
+# Popular queries are answered from here; stale entries are refreshed in the background.
+# With SEARCH_CACHE_PATH set its reads and writes hit SQLite, so they run off the event loop.
+search_cache = SearchCache()
+_revalidating: set = set()           # (query, region) keys being refreshed
+_revalidation_tasks: set = set()     # their tasks, kept referenced until they finish
+
+SEARCH_WORKERS = 4           # blocking DDGS searches running at once; further searches queue
+SEARCH_TIMEOUT = 15.0        # seconds a caller waits for a search, queueing included
+DDGS_REQUEST_TIMEOUT = 5     # per HTTP request inside DDGS, so abandoned searches end soon
+
+# Engines web_search_stream queries side by side, in order of preference; results are reported
+# as each one answers. By default a streamed search is one "auto" search, as web_search_tool
+# does: fanning out is opt-in (e.g. STREAM_BACKENDS=duckduckgo,brave) because every extra engine
+# is another upstream scrape. One streamed search uses at most STREAM_FANOUT workers (fewer than
+# SEARCH_WORKERS, so it never takes the whole pool), and only one while the pool is busy.
+STREAM_BACKENDS = tuple(b.strip() for b in os.environ.get("STREAM_BACKENDS", "auto").split(",") if b.strip()) or ("auto",)
+STREAM_FANOUT = 2
+
+
+class SearchPool:
+    """
+    Bounded thread pool for the blocking DDGS client, awaited with a timeout.
+
+    A caller that times out or is cancelled stops waiting at once; a search
+    still queued is dropped, one already running finishes on its worker
+    (bounded by DDGS_REQUEST_TIMEOUT) without holding up anyone else.
+    """
+
+    def __init__(self, workers: int = SEARCH_WORKERS, timeout: float = SEARCH_TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ddgs")
+        self._lock = threading.Lock()  # counters are updated from the worker threads
+        self.pending = 0               # submitted and not finished: queued or running
+        self.running = 0
+        self.completed = 0
+        self.timeouts = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Run `fn(*args)` on a worker thread.
+
+        Raises:
+            asyncio.TimeoutError: If it did not finish within `timeout` seconds.
+        """
+        with self._lock:
+            self.pending += 1
+        submitted = self._executor.submit(self._tracked, fn, args)
+        submitted.add_done_callback(self._finished)  # also runs when a queued search is dropped
+        future = asyncio.wrap_future(submitted)
+        try:
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def _finished(self, _: Future) -> None:
+        with self._lock:
+            self.pending -= 1
+
+    def idle(self) -> int:
+        """Workers free to start a search right now."""
+        return max(0, self.workers - self.pending)
+
+    def _tracked(self, fn: Callable[..., T], args: tuple) -> T:
+        with self._lock:
+            self.running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "pending": self.pending,
+            "completed": self.completed,
+            "timeouts": self.timeouts,
+        }
+
+
+search_pool = SearchPool()
+
+# One DDGS instance per worker thread: its engines and their HTTP sessions are reused across searches
+_thread_state = threading.local()
+
+
+def _ddgs() -> DDGS:
+    client = getattr(_thread_state, "ddgs", None)
+    if client is None:
+        client = _thread_state.ddgs = DDGS(timeout=DDGS_REQUEST_TIMEOUT)
+    return client
+
 
 class SearchResult(BaseModel):
     title: str
@@ -17,17 +128,21 @@ class WebSearchResponse(BaseModel):
     results: List[SearchResult] = Field(default_factory=list)
     total_results: int = 0
 
-def web_search(query: str, max_results: int = 5) -> WebSearchResponse:
+def web_search(
+    query: str, max_results: int = 5, region: str = DEFAULT_REGION, backend: str = "auto",
+) -> WebSearchResponse:
     """
-    Perform DuckDuckGo web search.
+    Perform DuckDuckGo web search (blocking; see web_search_coalesced for the async entry point).
+
+    `backend` picks the DDGS engine(s); "auto" lets DDGS choose and fall back.
     """
     if not query or not isinstance(query, str):
         return WebSearchResponse(query=query, results=[])
     
     try:
         results = []
-        with DDGS() as ddgs:
-            ddgs_results = ddgs.text(query, max_results=max_results)
+        with observe_upstream("duckduckgo"):
+            ddgs_results = _ddgs().text(query, region=region, max_results=max_results, backend=backend)
             for r in ddgs_results:
                 results.append(SearchResult(
                     title=r.get("title", ""),
@@ -40,10 +155,128 @@ def web_search(query: str, max_results: int = 5) -> WebSearchResponse:
             results=results,
             total_results=len(results)
         )
-        logger.info(f"DDGS search '{query}': {len(results)} results")
+        logger.info(f"DDGS search '{query}' ({backend}): {len(results)} results")
         return response
     
     except Exception as e:
         logger.error(f"DDGS search error: {e}")
+        # Start over with a fresh session on this thread in case the old one is broken
+        _thread_state.ddgs = None
         return WebSearchResponse(query=query, results=[])
 
+
+async def _search(query: str, max_results: int, region: str) -> WebSearchResponse:
+    """One DDGS search on the search pool; concurrent identical searches share it."""
+    key = (normalize_query(query), max_results, region)
+    try:
+        return await search_flight.do(key, lambda: search_pool.run(web_search, query, max_results, region))
+    except asyncio.TimeoutError:
+        logger.warning(f"DDGS search '{query}' timed out after {search_pool.timeout}s")
+        return WebSearchResponse(query=query, results=[])
+
+
+async def _fetch_and_cache(query: str, max_results: int, region: str) -> WebSearchResponse:
+    response = await _search(query, max_results, region)
+    # Empty result sets are not cached: web_search also returns them when the scrape failed
+    if response.results:
+        await asyncio.to_thread(search_cache.set, query, max_results, region, [r.model_dump() for r in response.results])
+    return response
+
+
+def _revalidate(query: str, max_results: int, region: str) -> None:
+    """Refresh a stale cache entry in the background (at most one refresh per entry at a time)."""
+    key = (normalize_query(query), region)
+    if key in _revalidating:
+        return
+    _revalidating.add(key)
+    task = asyncio.create_task(_fetch_and_cache(query, max_results, region))
+    _revalidation_tasks.add(task)
+    task.add_done_callback(_revalidation_tasks.discard)
+    task.add_done_callback(lambda _, k=key: _revalidating.discard(k))
+
+
+async def web_search_coalesced(query: str, max_results: int = 5, region: str = DEFAULT_REGION) -> WebSearchResponse:
+    """
+    Async web search: cached, coalesced, and run off the event loop.
+
+    Fresh cached results are returned directly; stale ones are returned while a
+    background search refreshes them. Otherwise the blocking DDGS call runs on
+    the bounded search pool and concurrent callers join the in-flight search.
+    A search that exceeds SEARCH_TIMEOUT returns no results.
+    """
+    if not query or not isinstance(query, str):
+        return WebSearchResponse(query=query, results=[])
+
+    cached = await asyncio.to_thread(search_cache.get, query, max_results, region)
+    if cached is not None:
+        if not cached.fresh:
+            _revalidate(query, cached.max_results, region)
+        results = [SearchResult(**r) for r in cached.results]
+        return WebSearchResponse(query=query, results=results, total_results=len(results))
+
+    response = await _fetch_and_cache(query, max_results, region)
+    return response.model_copy(update={"query": query}, deep=True)
+
+
+async def web_search_stream(
+    query: str,
+    max_results: int = 5,
+    region: str = DEFAULT_REGION,
+    on_results: Optional[Callable[[List[SearchResult]], Awaitable[None]]] = None,
+) -> WebSearchResponse:
+    """
+    Web search that hands results to `on_results` as they arrive.
+
+    The first STREAM_FANOUT engines of STREAM_BACKENDS (only the first one
+    while the search pool has no spare workers; by default a single "auto"
+    search) are searched on their own pool workers; as each one answers, its results not already seen (by link) are
+    passed to `on_results` and appended, until `max_results` are in. Engines
+    still queued then are dropped; one already running finishes on its worker
+    (bounded by DDGS_REQUEST_TIMEOUT) but is not waited for. A cached result
+    set is reported in one batch. Unlike web_search_coalesced, concurrent
+    identical calls are not joined, since each caller wants its own progress.
+    """
+    if not query or not isinstance(query, str):
+        return WebSearchResponse(query=query, results=[])
+
+    async def report(batch: List[SearchResult]) -> None:
+        if batch and on_results is not None:
+            await on_results(batch)
+
+    cached = await asyncio.to_thread(search_cache.get, query, max_results, region)
+    if cached is not None:
+        if not cached.fresh:
+            _revalidate(query, cached.max_results, region)
+        results = [SearchResult(**r) for r in cached.results]
+        await report(results)
+        return WebSearchResponse(query=query, results=results, total_results=len(results))
+
+    fanout = min(STREAM_FANOUT, len(STREAM_BACKENDS)) if search_pool.idle() >= STREAM_FANOUT else 1
+    searches = [
+        asyncio.create_task(search_pool.run(web_search, query, max_results, region, backend))
+        for backend in STREAM_BACKENDS[:fanout]
+    ]
+    results: List[SearchResult] = []
+    seen = set()
+    try:
+        for finished in asyncio.as_completed(searches):
+            try:
+                response = await finished
+            except asyncio.TimeoutError:
+                continue
+            batch = [r for r in response.results if r.link not in seen][:max_results - len(results)]
+            seen.update(r.link for r in batch)
+            results.extend(batch)
+            await report(batch)
+            if len(results) >= max_results:
+                break
+    finally:
+        for search in searches:
+            search.cancel()
+
+    if not results:
+        logger.warning(f"DDGS streaming search '{query}': no engine returned results")
+    # Only a complete set is cached, so a later call for the same max_results is not short-changed
+    elif len(results) >= max_results:
+        await asyncio.to_thread(search_cache.set, query, max_results, region, [r.model_dump() for r in results])
+    return WebSearchResponse(query=query, results=results, total_results=len(results))
@@ -0,0 +1,71 @@
+from ddgs_mcp.cache import SearchCache
+
+RESULTS = [{"title": f"t{i}", "link": f"https://example.com/{i}", "snippet": f"s{i}"} for i in range(10)]
+
+
+def make_cache(now, **kwargs):
+    return SearchCache(clock=lambda: now[0], **{"path": None, "ttl": 60, "stale_ttl": 600, **kwargs})
+
+
+def test_fewer_results_are_sliced_from_a_larger_set():
+    now = [0.0]
+    cache = make_cache(now)
+    cache.set("Python news", 10, "wt-wt", RESULTS)
+
+    assert cache.get("python  NEWS", 3, "wt-wt").results == RESULTS[:3]
+    assert cache.get("python news", 20, "wt-wt") is None  # more than was fetched
+    assert cache.get("python news", 3, "us-en") is None   # other region
+
+
+def test_fresh_then_stale_then_expired():
+    now = [0.0]
+    cache = make_cache(now)
+    cache.set("q", 5, "wt-wt", RESULTS[:5])
+
+    assert cache.get("q", 5, "wt-wt").fresh
+    now[0] = 120
+    assert cache.get("q", 5, "wt-wt").fresh is False
+    now[0] = 700
+    assert cache.get("q", 5, "wt-wt") is None
+    assert cache.stats()["fresh_hits"] == cache.stats()["stale_hits"] == cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    now = [0.0]
+    cache = make_cache(now, memory_size=2)
+    cache.set("a", 5, "wt-wt", RESULTS[:5])
+    cache.set("b", 5, "wt-wt", RESULTS[:5])
+    cache.get("a", 5, "wt-wt")
+    cache.set("c", 5, "wt-wt", RESULTS[:5])
+
+    assert cache.get("b", 5, "wt-wt") is None
+    assert cache.get("a", 5, "wt-wt") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_persist_across_instances(tmp_path):
+    now = [0.0]
+    path = str(tmp_path / "search.sqlite3")
+    cache = make_cache(now, path=path)
+    cache.set("q", 5, "wt-wt", RESULTS[:5])
+    cache.close()
+
+    reopened = make_cache(now, path=path)
+    assert reopened.get("q", 5, "wt-wt").results == RESULTS[:5]
+    now[0] = 700
+    assert reopened.purge_expired() == 1
+    reopened.close()
+
+
+def test_set_purges_expired_entries_from_disk_periodically(tmp_path):
+    now = [0.0]
+    cache = make_cache(now, path=str(tmp_path / "search.sqlite3"), purge_interval=1000)
+    cache.set("old", 5, "wt-wt", RESULTS[:5])
+    now[0] = 700                     # "old" has expired, but the purge interval has not passed
+    cache.set("newer", 5, "wt-wt", RESULTS[:5])
+    now[0] = 1000
+    cache.set("newest", 5, "wt-wt", RESULTS[:5])
+
+    rows = [row[0] for row in cache._db.execute("SELECT query FROM search ORDER BY query")]
+    assert rows == ["newer", "newest"]
+    cache.close()
@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ddgs_mcp import tool
+from ddgs_mcp.cache import SearchCache
+
+
+class FakeDDGS:
+    """Stands in for a per-thread DDGS client; `delays` maps query -> seconds to block."""
+
+    instances = 0
+
+    def __init__(self, delays):
+        FakeDDGS.instances += 1
+        self.delays = delays
+
+    def text(self, query, region=None, max_results=5, backend="auto"):
+        time.sleep(self.delays.get(backend if backend != "auto" else query, 0.05))
+        if backend != "auto":
+            # Three results per engine: one every engine finds, then two of its own
+            links = ["https://example.com", f"https://{backend}.example/1", f"https://{backend}.example/2"]
+            return [{"title": backend, "href": link, "body": query} for link in links]
+        return [{"title": query, "href": "https://example.com", "body": threading.current_thread().name}]
+
+
+@pytest.fixture
+def fake_ddgs(monkeypatch):
+    delays = {}
+    FakeDDGS.instances = 0
+    monkeypatch.setattr(tool, "DDGS", lambda timeout=None: FakeDDGS(delays))
+    monkeypatch.setattr(tool, "_thread_state", threading.local())
+    monkeypatch.setattr(tool, "search_pool", tool.SearchPool(workers=4, timeout=0.5))
+    monkeypatch.setattr(tool, "search_cache", SearchCache(path=None))
+    return delays
+
+
+@pytest.mark.asyncio
+async def test_searches_run_concurrently_on_reused_clients(fake_ddgs):
+    started = time.perf_counter()
+    results = await asyncio.gather(*(tool.web_search_coalesced(f"query {i}") for i in range(8)))
+    elapsed = time.perf_counter() - started
+
+    assert [r.results[0].title for r in results] == [f"query {i}" for i in range(8)]
+    assert all(r.results[0].snippet.startswith("ddgs") for r in results)  # ran on the pool, not the loop
+    assert elapsed < 8 * 0.05                                             # 4 workers, not one at a time
+    assert FakeDDGS.instances <= 4                                        # one client per worker thread
+
+
+@pytest.mark.asyncio
+async def test_slow_search_times_out_without_blocking_others(fake_ddgs):
+    fake_ddgs["slow"] = 2.0
+
+    slow, fast = await asyncio.gather(tool.web_search_coalesced("slow"), tool.web_search_coalesced("fast"))
+
+    assert slow.results == []
+    assert fast.results[0].title == "fast"
+    assert tool.search_pool.stats()["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_results_are_served_while_refreshing(fake_ddgs, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool, "search_cache", SearchCache(path=None, ttl=60, stale_ttl=600, clock=lambda: now[0]))
+    searches = []
+    real_search = tool.web_search
+    monkeypatch.setattr(tool, "web_search", lambda *args: searches.append(args) or real_search(*args))
+
+    await tool.web_search_coalesced("news of the day", max_results=10)
+    fewer = await tool.web_search_coalesced("  News of the DAY ", max_results=3)
+    assert len(searches) == 1 and fewer.query == "  News of the DAY "
+
+    now[0] += 120  # past the TTL, within the stale window
+    stale = await tool.web_search_coalesced("news of the day", max_results=3)
+    assert stale.results and len(searches) == 1  # answered at once from the stale entry
+    await asyncio.sleep(0.2)
+    assert len(searches) == 2 and searches[1][1] == 10  # refreshed with the full result set
+    assert tool.search_cache.get("news of the day", 10, tool.DEFAULT_REGION).fresh
+
+
+ENGINES = ("duckduckgo", "brave", "mojeek", "wikipedia")
+
+
+@pytest.mark.asyncio
+async def test_streaming_is_one_auto_search_by_default(fake_ddgs, monkeypatch):
+    searches = []
+    real_search = tool.web_search
+    monkeypatch.setattr(tool, "web_search", lambda *args: searches.append(args) or real_search(*args))
+
+    response = await tool.web_search_stream("release notes", max_results=5)
+
+    assert [args[-1] for args in searches] == ["auto"]   # one upstream scrape, as web_search_tool
+    assert response.results[0].title == "release notes"
+
+
+@pytest.mark.asyncio
+async def test_streaming_reports_each_engine_as_it_answers(fake_ddgs, monkeypatch):
+    monkeypatch.setattr(tool, "STREAM_BACKENDS", ENGINES)
+    fake_ddgs.update({"brave": 0.05, "duckduckgo": 0.15, "mojeek": 2.0, "wikipedia": 2.0})
+    batches = []
+
+    async def on_results(batch):
+        batches.append((time.perf_counter(), [r.title for r in batch]))
+
+    started = time.perf_counter()
+    response = await tool.web_search_stream("release notes", max_results=5, on_results=on_results)
+
+    assert [titles for _, titles in batches] == [["brave"] * 3, ["duckduckgo"] * 2]  # STREAM_FANOUT engines only
+    assert batches[0][0] - started < 0.15                    # first engine reported before the others finished
+    assert time.perf_counter() - started < 0.3               # stopped at max_results
+    assert len({r.link for r in response.results}) == response.total_results == 5
+    assert tool.search_cache.get("release notes", 5, tool.DEFAULT_REGION) is not None
+
+    cached_batches = []
+    await tool.web_search_stream("Release  notes", max_results=3, on_results=lambda b: _append(cached_batches, b))
+    assert [len(b) for b in cached_batches] == [3]           # a cache hit arrives as a single batch
+
+
+async def _append(target, batch):
+    target.append(batch)
+
+
+@pytest.mark.asyncio
+async def test_streaming_uses_one_engine_while_the_pool_is_busy(fake_ddgs, monkeypatch):
+    monkeypatch.setattr(tool, "STREAM_BACKENDS", ENGINES)
+    fake_ddgs.update({"busy 0": 0.3, "busy 1": 0.3, "busy 2": 0.3})
+    busy = [asyncio.create_task(tool.web_search_coalesced(f"busy {i}")) for i in range(3)]
+    await asyncio.sleep(0.05)
+    assert tool.search_pool.idle() == 1
+
+    response = await tool.web_search_stream("release notes", max_results=5)
+
+    assert {r.title for r in response.results} == {"duckduckgo"}  # the other engines were not queried
+    await asyncio.gather(*busy)
+    assert tool.search_pool.idle() == tool.search_pool.workers
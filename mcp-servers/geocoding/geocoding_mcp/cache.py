@@ -0,0 +1,160 @@
+# geocoding_mcp/cache.py
+"""
+Persistent geocoding cache: SQLite on disk with an in-memory LRU in front.
+
+Coordinates for a place practically never change, so results are kept for a
+long time. "No results" answers are cached too (for a shorter time) so that
+repeated lookups of unknown places do not hit Nominatim either. Expired rows
+are deleted from disk by `set`, at most every `purge_interval` seconds.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("geocoding-mcp")
+
+GEOCODE_CACHE_PATH = os.environ.get("GEOCODE_CACHE_PATH", "geocode_cache.sqlite3")
+GEOCODE_CACHE_TTL = 90 * 24 * 3600          # positive results: 90 days
+GEOCODE_NEGATIVE_TTL = 24 * 3600            # "No geocoding results found": 1 day
+GEOCODE_MEMORY_SIZE = 2048                  # entries in the in-memory LRU
+GEOCODE_PURGE_INTERVAL = 3600               # seconds between purges of expired rows
+
+
+def normalize_address(address: str) -> str:
+    """'  Paris,  France ' -> 'paris, france'"""
+    return re.sub(r"\s+", " ", address.strip().lower()).strip(" .?!")
+
+
+class GeocodeCache:
+    """
+    Two-tier cache mapping normalized addresses to geocoding results.
+
+    Args:
+        path: SQLite file (":memory:" for a process-local cache)
+        ttl: Seconds a positive result stays valid
+        negative_ttl: Seconds a "no results" answer stays valid
+        memory_size: Max entries kept in the in-memory LRU
+        purge_interval: Seconds between purges of expired rows (run from `set`)
+    """
+
+    def __init__(
+        self,
+        path: str = GEOCODE_CACHE_PATH,
+        ttl: float = GEOCODE_CACHE_TTL,
+        negative_ttl: float = GEOCODE_NEGATIVE_TTL,
+        memory_size: int = GEOCODE_MEMORY_SIZE,
+        purge_interval: float = GEOCODE_PURGE_INTERVAL,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory_size = memory_size
+        self.purge_interval = purge_interval
+        self._next_purge = time.time() + purge_interval
+
+        self._memory: "OrderedDict[str, tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        # Opened on first use so importing the module does not touch the disk
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS geocode ("
+                " key TEXT PRIMARY KEY,"
+                " result TEXT NOT NULL,"
+                " expires_at REAL NOT NULL)"
+            )
+        return self._conn
+
+    def get(self, address: str) -> Optional[Dict[str, Any]]:
+        """Return the cached result (possibly a cached {"error": ...}) or None."""
+        key = normalize_address(address)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                result, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return result
+                del self._memory[key]
+
+            try:
+                row = self._db.execute(
+                    "SELECT result, expires_at FROM geocode WHERE key = ?", (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.warning(f"Geocode cache read failed for '{key}': {e}")
+                row = None
+            if row is None or row[1] <= now:
+                self.misses += 1
+                return None
+
+            result = json.loads(row[0])
+            self._remember(key, result, row[1])
+            self.disk_hits += 1
+            return result
+
+    def set(self, address: str, result: Dict[str, Any], negative: bool = False) -> None:
+        key = normalize_address(address)
+        now = time.time()
+        expires_at = now + (self.negative_ttl if negative else self.ttl)
+        with self._lock:
+            purge = now >= self._next_purge
+            if purge:
+                self._next_purge = now + self.purge_interval
+            self._remember(key, result, expires_at)
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO geocode (key, result, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(result), expires_at),
+                )
+            except sqlite3.Error as e:
+                logger.warning(f"Geocode cache write failed for '{key}': {e}")
+        if purge:
+            self.purge_expired()
+
+    def _remember(self, key: str, result: Dict[str, Any], expires_at: float) -> None:
+        self._memory[key] = (result, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from disk. Returns the number removed."""
+        with self._lock:
+            try:
+                return self._db.execute("DELETE FROM geocode WHERE expires_at <= ?", (time.time(),)).rowcount
+            except sqlite3.Error as e:
+                logger.warning(f"Geocode cache purge failed: {e}")
+                return 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
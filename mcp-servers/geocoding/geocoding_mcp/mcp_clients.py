@@ -1,28 +1,58 @@
-import time
-import asyncio
 from typing import Any, Dict
+import asyncio
 import httpx
 import logging
 
+from geocoding_mcp.cache import GeocodeCache, normalize_address
+from geocoding_mcp.metrics import acquire_observed, observe_upstream
+from geocoding_mcp.ratelimit import RateLimitExceeded, TokenBucket
+from geocoding_mcp.singleflight import SingleFlight
+
 GEOCODING_API_URL = "https://nominatim.openstreetmap.org/search"
 logger = logging.getLogger("geocoding-mcp")
 
-_last_request_time = 0.0
-_rate_limit_lock = asyncio.Lock()
+NO_RESULTS_ERROR = "No geocoding results found"
 
-async def geocode_address(address: str) -> Dict[str, Any]:
-    global _last_request_time
+# Persistent cache; warm lookups return before the rate limiter below.
+# Its reads and writes may hit SQLite, so they run off the event loop.
+geocode_cache = GeocodeCache()
+
+# Concurrent cache misses for the same address share one Nominatim request
+geocode_flight = SingleFlight("geocode")
+
+# Nominatim usage policy: at most 1 request/second, so no burst allowance
+NOMINATIM_RATE = 1.0
+NOMINATIM_BURST = 1
+NOMINATIM_MAX_QUEUE = 60
+NOMINATIM_MAX_WAIT = 30.0
 
+nominatim_limiter = TokenBucket(
+    rate=NOMINATIM_RATE,
+    burst=NOMINATIM_BURST,
+    max_queue=NOMINATIM_MAX_QUEUE,
+    max_wait=NOMINATIM_MAX_WAIT,
+    name="Nominatim",
+)
+
+async def geocode_address(address: str) -> Dict[str, Any]:
     if not address:
         return {"error": "Address is required"}
 
+    cached = await asyncio.to_thread(geocode_cache.get, address)
+    if cached is not None:
+        return dict(cached)
+
+    result = await geocode_flight.do(normalize_address(address), lambda: _fetch_from_nominatim(address))
+    return dict(result)
+
+
+async def _fetch_from_nominatim(address: str) -> Dict[str, Any]:
     # --- Async rate limiting ---
-    async with _rate_limit_lock:
-        now = time.time()
-        elapsed = now - _last_request_time
-        if elapsed < 1.0:
-            await asyncio.sleep(1.0 - elapsed)
-        _last_request_time = time.time()
+    try:
+        await acquire_observed(nominatim_limiter, "nominatim")
+    except RateLimitExceeded as e:
+        logger.warning(f"Geocoding rejected '{address}': {e}")
+        return {"error": str(e), "retry_after": round(e.retry_after, 1)}
     # ---------------------------
 
     params = {
@@ -37,13 +67,14 @@ async def geocode_address(address: str) -> Dict[str, Any]:
 
     try:
         async with httpx.AsyncClient(headers=headers, timeout=10) as client:
-            response = await client.get(GEOCODING_API_URL, params=params)
-            response.raise_for_status()
+            with observe_upstream("nominatim"):
+                response = await client.get(GEOCODING_API_URL, params=params)
+                response.raise_for_status()
             data = response.json()
 
             if data:
                 first_result = data[0]
-                return {
+                result = {
                     "address": first_result.get("display_name"),
                     "latitude": first_result.get("lat"),
                     "longitude": first_result.get("lon"),
@@ -51,8 +82,12 @@ async def geocode_address(address: str) -> Dict[str, Any]:
                     "city": first_result.get("address", {}).get("city"),
                     "state": first_result.get("address", {}).get("state")
                 }
+                await asyncio.to_thread(geocode_cache.set, address, result)
+                return result
             else:
-                return {"error": "No geocoding results found"}
+                result = {"error": NO_RESULTS_ERROR}
+                await asyncio.to_thread(geocode_cache.set, address, result, negative=True)
+                return result
 
     except Exception as e:
         logger.error(f"Error geocoding address '{address}': {e}")
@@ -0,0 +1,67 @@
+# geocoding_mcp/metrics.py
+"""
+Prometheus metrics for the MCP server, served on GET /metrics.
+
+Records how long upstream API calls take and how long callers wait on the
+rate limiter, so a slow tool call can be attributed to the upstream service
+or to our own throttling.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from starlette.responses import Response
+
+from geocoding_mcp.ratelimit import RateLimitExceeded, TokenBucket
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+UPSTREAM_SECONDS = Histogram(
+    "mcp_upstream_seconds",
+    "Latency of requests to the upstream API",
+    ["upstream", "outcome"],  # outcome: ok | error
+    buckets=LATENCY_BUCKETS,
+)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "mcp_rate_limit_wait_seconds",
+    "Time spent waiting for a rate limiter token",
+    ["limiter"],
+    buckets=LATENCY_BUCKETS,
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "mcp_rate_limit_rejections_total",
+    "Requests rejected by the rate limiter",
+    ["limiter"],
+)
+
+
+@contextmanager
+def observe_upstream(upstream: str) -> Iterator[None]:
+    """Observe the duration of the enclosed upstream call; outcome is "error" if it raises."""
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        UPSTREAM_SECONDS.labels(upstream=upstream, outcome=outcome).observe(time.perf_counter() - start)
+
+
+async def acquire_observed(limiter: TokenBucket, name: str) -> float:
+    """`limiter.acquire()`, recording the wait or the rejection under `name`."""
+    try:
+        waited = await limiter.acquire()
+    except RateLimitExceeded:
+        RATE_LIMIT_REJECTIONS.labels(limiter=name).inc()
+        raise
+    RATE_LIMIT_WAIT_SECONDS.labels(limiter=name).observe(waited)
+    return waited
+
+
+def metrics_response() -> Response:
+    """Current metrics in the Prometheus text format."""
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,152 @@
+# geocoding_mcp/ratelimit.py
+"""
+Token-bucket rate limiter with bursting, FIFO fairness and a bounded queue.
+
+Tokens refill continuously at `rate` per second up to `burst`. A caller takes
+a token immediately if one is free and nobody is queued; otherwise it joins a
+FIFO queue and is woken by a timer when its token is ready. No lock is held
+while waiting, a cancelled waiter gives its place (or token) back, and when
+the backlog is hopeless the caller is rejected immediately with a retry-after
+hint instead of queueing.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+_EPSILON = 1e-9
+
+
+class RateLimitExceeded(Exception):
+    """Raised when the queue is full or the expected wait exceeds `max_wait`."""
+
+    def __init__(self, name: str, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"{name} rate limit exceeded; retry after {retry_after:.1f}s")
+
+
+class TokenBucket:
+    """
+    Args:
+        rate: Tokens added per second
+        burst: Bucket capacity (requests allowed back-to-back)
+        max_queue: Max callers waiting for a token; further callers are rejected
+        max_wait: Reject callers whose expected wait exceeds this many seconds (None = no limit)
+        name: Used in error messages and stats
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        max_queue: int = 100,
+        max_wait: Optional[float] = None,
+        name: str = "upstream",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be > 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.name = name
+        self._clock = clock
+
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_observed_wait = 0.0
+
+    async def acquire(self) -> float:
+        """
+        Wait for a token. Returns the seconds spent waiting.
+
+        Raises:
+            RateLimitExceeded: If the queue is full or the wait would exceed max_wait.
+        """
+        self._refill()
+        if not self._waiters and self._tokens >= 1 - _EPSILON:
+            self._tokens -= 1
+            self._record(0.0)
+            return 0.0
+
+        expected = self.expected_wait()
+        if len(self._waiters) >= self.max_queue or (self.max_wait is not None and expected > self.max_wait):
+            self.rejected += 1
+            raise RateLimitExceeded(self.name, expected)
+
+        start = self._clock()
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        self._schedule()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # Token was granted as we were cancelled: hand it to the next waiter
+                self._tokens += 1
+                self._dispatch()
+            else:
+                try:
+                    self._waiters.remove(fut)
+                except ValueError:
+                    pass
+            raise
+        waited = self._clock() - start
+        self._record(waited)
+        return waited
+
+    def expected_wait(self) -> float:
+        """Seconds a caller arriving now would wait for its token."""
+        self._refill()
+        needed = len(self._waiters) + 1 - self._tokens
+        return max(0.0, needed / self.rate)
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        """Hand out available tokens to waiters in arrival order."""
+        self._refill()
+        while self._waiters and self._tokens >= 1 - _EPSILON:
+            fut = self._waiters.popleft()
+            if fut.done():  # cancelled while queued
+                continue
+            self._tokens -= 1
+            fut.set_result(None)
+        self._schedule()
+
+    def _schedule(self) -> None:
+        if self._timer is not None or not self._waiters:
+            return
+        delay = max(0.0, (1 - self._tokens) / self.rate)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _record(self, waited: float) -> None:
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_observed_wait = max(self.max_observed_wait, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "queued": len(self._waiters),
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "avg_wait": self.total_wait / self.acquired if self.acquired else 0.0,
+            "max_wait": self.max_observed_wait,
+        }
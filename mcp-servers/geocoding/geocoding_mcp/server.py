@@ -1,5 +1,9 @@
 from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from geocoding_mcp.mcp_clients import geocode_cache, geocode_flight, nominatim_limiter
 from geocoding_mcp.tool import geocode_location
+from geocoding_mcp.metrics import metrics_response
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -13,6 +17,20 @@ def main():
         """Return geocoding data (latitude/longitude) for an address."""
         return await geocode_location(address)
 
+    @mcp.custom_route("/stats", methods=["GET"])
+    async def stats(request: Request) -> JSONResponse:
+        """Cache, request coalescing and rate limiter counters."""
+        return JSONResponse({
+            "cache": geocode_cache.stats(),
+            "singleflight": {"geocode": geocode_flight.stats()},
+            "rate_limit": {"nominatim": nominatim_limiter.stats()},
+        })
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics(request: Request) -> Response:
+        """Prometheus metrics: upstream latency and rate-limit waits."""
+        return metrics_response()
+
     mcp.run(transport="http", host="0.0.0.0", port=50054)
     logger.info("Starting geocoding MCP WebSocket server on ws://0.0.0.0:50054")
 
@@ -24,7 +24,8 @@ async def geocode_location(address: str):
     result = await geocode_address(address)
 
     if "error" in result:
-        return {"error": result["error"]}
+        # Keep the retry-after hint when the rate limiter rejected the request
+        return {key: result[key] for key in ("error", "retry_after") if key in result}
 
     return {
         "address": result.get("address"),
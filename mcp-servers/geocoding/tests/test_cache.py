@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+import pytest
+
+from geocoding_mcp import mcp_clients
+from geocoding_mcp.cache import GeocodeCache
+
+PARIS = [{
+    "display_name": "Paris, Île-de-France, France",
+    "lat": "48.8588897",
+    "lon": "2.3200410",
+    "address": {"city": "Paris", "state": "Île-de-France", "country": "France"},
+}]
+
+
+@pytest.fixture
+def nominatim(monkeypatch, tmp_path):
+    """Fake Nominatim + a fresh on-disk cache; counts upstream requests and rate-limiter use."""
+    state = {"requests": 0, "rate_limited": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["requests"] += 1
+        q = request.url.params["q"]
+        return httpx.Response(200, json=PARIS if "paris" in q.lower() else [])
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        mcp_clients.httpx, "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(handler), **kw),
+    )
+
+    class CountingLimiter:
+        async def acquire(self):
+            state["rate_limited"] += 1
+            return 0.0
+
+    monkeypatch.setattr(mcp_clients, "nominatim_limiter", CountingLimiter())
+    monkeypatch.setattr(mcp_clients, "geocode_cache", GeocodeCache(str(tmp_path / "geocode.sqlite3")))
+    yield state
+    mcp_clients.geocode_cache.close()
+
+
+@pytest.mark.asyncio
+async def test_warm_lookup_skips_upstream_and_rate_limiter(nominatim):
+    first = await mcp_clients.geocode_address("Paris, France")
+    second = await mcp_clients.geocode_address("  paris,   FRANCE ")
+
+    assert first == second
+    assert first["latitude"] == "48.8588897"
+    assert nominatim["requests"] == 1
+    assert nominatim["rate_limited"] == 1
+
+    second["latitude"] = "0"   # callers get a copy, not the cached entry
+    assert (await mcp_clients.geocode_address("Paris, France"))["latitude"] == "48.8588897"
+
+
+@pytest.mark.asyncio
+async def test_no_results_are_negatively_cached(nominatim):
+    first = await mcp_clients.geocode_address("Atlantis")
+    second = await mcp_clients.geocode_address("atlantis")
+
+    assert first == second == {"error": mcp_clients.NO_RESULTS_ERROR}
+    assert nominatim["requests"] == 1
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "geocode.sqlite3")
+    cache = GeocodeCache(path)
+    cache.set("Paris", {"latitude": "48.85", "longitude": "2.35"})
+    cache.close()
+
+    reopened = GeocodeCache(path)
+    assert reopened.get("PARIS") == {"latitude": "48.85", "longitude": "2.35"}
+    assert reopened.stats()["disk_hits"] == 1
+    assert reopened.get("paris") is not None
+    assert reopened.stats()["memory_hits"] == 1
+    reopened.close()
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = GeocodeCache(str(tmp_path / "geocode.sqlite3"), ttl=-1)
+    cache.set("Paris", {"latitude": "48.85"})
+    assert cache.get("Paris") is None
+    assert cache.purge_expired() == 1
+    cache.close()
+
+
+def test_set_purges_expired_rows_from_disk(tmp_path):
+    cache = GeocodeCache(str(tmp_path / "geocode.sqlite3"), negative_ttl=-1, purge_interval=0)
+    cache.set("Atlantis", {"error": "No geocoding results found"}, negative=True)
+    cache.set("Paris", {"latitude": "48.85"})
+
+    assert [row[0] for row in cache._db.execute("SELECT key FROM geocode")] == ["paris"]
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_upstream_request(nominatim):
+    results = await asyncio.gather(*(mcp_clients.geocode_address("Paris") for _ in range(20)))
+
+    assert all(r["latitude"] == "48.8588897" for r in results)
+    assert nominatim["requests"] == 1
+    assert mcp_clients.geocode_flight.stats()["coalesced"] >= 19
@@ -0,0 +1,34 @@
+import pytest
+from prometheus_client import REGISTRY
+
+from geocoding_mcp.metrics import acquire_observed, metrics_response, observe_upstream
+from geocoding_mcp.ratelimit import RateLimitExceeded, TokenBucket
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_waits_and_rejections_are_recorded():
+    bucket = TokenBucket(rate=1, burst=1, max_wait=0.1)
+    waits = sample("mcp_rate_limit_wait_seconds_count", limiter="test")
+    rejections = sample("mcp_rate_limit_rejections_total", limiter="test")
+
+    await acquire_observed(bucket, "test")
+    with pytest.raises(RateLimitExceeded):
+        await acquire_observed(bucket, "test")
+
+    assert sample("mcp_rate_limit_wait_seconds_count", limiter="test") == waits + 1
+    assert sample("mcp_rate_limit_rejections_total", limiter="test") == rejections + 1
+
+
+def test_upstream_outcome_and_exposition():
+    errors = sample("mcp_upstream_seconds_count", upstream="test", outcome="error")
+
+    with pytest.raises(RuntimeError):
+        with observe_upstream("test"):
+            raise RuntimeError("upstream down")
+
+    assert sample("mcp_upstream_seconds_count", upstream="test", outcome="error") == errors + 1
+    assert b"mcp_upstream_seconds" in metrics_response().body
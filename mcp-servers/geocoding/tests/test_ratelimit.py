@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from geocoding_mcp.ratelimit import RateLimitExceeded, TokenBucket
+
+# The bucket reads time from an injected clock; the refill timers still run on the event loop,
+# so each step advances the clock by one token and sleeps just past the timer (one token at 20/s).
+TOKEN_SECONDS = 0.05
+
+
+async def tick(now, steps=1):
+    for _ in range(steps):
+        now[0] += TOKEN_SECONDS
+        await asyncio.sleep(TOKEN_SECONDS + 0.01)
+
+
+@pytest.mark.asyncio
+async def test_burst_is_served_immediately_then_queued_fifo():
+    """Synthetic burst: 15 callers against 20 tokens/s with a burst of 5."""
+    now = [0.0]
+    bucket = TokenBucket(rate=20, burst=5, clock=lambda: now[0])
+    order, waits = [], {}
+
+    async def caller(i):
+        waits[i] = await bucket.acquire()
+        order.append(i)
+
+    callers = [asyncio.create_task(caller(i)) for i in range(15)]
+    await asyncio.sleep(0)
+    assert order == list(range(5))                      # burst allowance, no queueing
+
+    await tick(now, steps=10)
+    await asyncio.gather(*callers)
+
+    assert order == list(range(15))                     # FIFO
+    expected = [0.0] * 5 + [(i - 4) * TOKEN_SECONDS for i in range(5, 15)]   # then one token every 50ms
+    assert [waits[i] for i in range(15)] == pytest.approx(expected)
+    stats = bucket.stats()
+    assert stats["acquired"] == 15
+    assert stats["max_wait"] == pytest.approx(10 * TOKEN_SECONDS)
+
+
+@pytest.mark.asyncio
+async def test_hopeless_backlog_is_rejected_with_retry_after():
+    now = [0.0]
+    bucket = TokenBucket(rate=1, burst=1, max_queue=2, clock=lambda: now[0])
+    await bucket.acquire()
+    waiters = [asyncio.create_task(bucket.acquire()) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(RateLimitExceeded) as exc:
+        await bucket.acquire()
+    assert exc.value.retry_after == pytest.approx(3.0)
+    assert bucket.stats()["rejected"] == 1
+
+    bounded = TokenBucket(rate=1, burst=1, max_wait=0.5, clock=lambda: now[0])
+    await bounded.acquire()
+    with pytest.raises(RateLimitExceeded):
+        await bounded.acquire()
+
+    for w in waiters:
+        w.cancel()
+    await asyncio.gather(*waiters, return_exceptions=True)
+    assert bucket.stats()["queued"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_lose_a_token():
+    now = [0.0]
+    bucket = TokenBucket(rate=20, burst=1, clock=lambda: now[0])
+    await bucket.acquire()
+    first = asyncio.create_task(bucket.acquire())
+    second = asyncio.create_task(bucket.acquire())
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    await tick(now)
+    waited = await asyncio.wait_for(second, timeout=1)
+
+    assert first.cancelled()
+    assert waited == pytest.approx(TOKEN_SECONDS)   # second took the first slot, not the second
+    assert bucket.stats()["queued"] == 0
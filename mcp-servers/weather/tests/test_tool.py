@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from weather_mcp import tool
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_for_same_location_are_coalesced(monkeypatch):
+    calls = []
+
+    async def fake_fetch(location):
+        calls.append(location)
+        await asyncio.sleep(0.05)
+        return {"location": location, "latitude": 51.5, "longitude": -0.12, "current": {"temperature_2m": 14.0}}
+
+    monkeypatch.setattr(tool, "_fetch_weather", fake_fetch)
+
+    locations = ["London"] * 25 + ["london "] * 25
+    results = await asyncio.gather(*(tool.get_weather(loc) for loc in locations))
+
+    assert len(calls) == 1
+    assert [r["location"] for r in results] == locations
+    assert all(r["current"]["temperature_2m"] == 14.0 for r in results)
+    assert tool.weather_flight.stats()["coalesced"] >= 49
+
+    results[0]["current"]["temperature_2m"] = 0.0   # callers do not share nested data
+    assert results[1]["current"]["temperature_2m"] == 14.0
+
+
+class FakeVariable:
+    def __init__(self, value):
+        self._value = value
+
+    def Value(self):
+        return self._value
+
+
+class FakeResponse:
+    def __init__(self, temperature):
+        self.temperature = temperature
+
+    def Current(self):
+        return self
+
+    def Variables(self, i):
+        return FakeVariable(self.temperature if i == 0 else 1.0)
+
+
+class FakeOpenMeteo:
+    def __init__(self):
+        self.requests = []
+
+    async def weather_api(self, url, params):
+        self.requests.append(params)
+        latitudes = params["latitude"].split(",")
+        return [FakeResponse(float(lat)) for lat in latitudes]
+
+
+@pytest.mark.asyncio
+async def test_batch_geocodes_concurrently_and_makes_one_upstream_call(monkeypatch):
+    places = {"london": (51.5, -0.12), "paris": (48.85, 2.35)}
+    geocoded = []
+
+    async def fake_geocoding(location):
+        geocoded.append(location)
+        coords = places.get(location.strip().lower())
+        if coords is None:
+            return {"error": "No geocoding results found"}
+        return {"latitude": coords[0], "longitude": coords[1]}
+
+    client = FakeOpenMeteo()
+    monkeypatch.setattr(tool, "call_geocoding", fake_geocoding)
+    monkeypatch.setattr(tool, "get_open_meteo_client", lambda: client)
+
+    result = await tool.get_weather_batch(["London", "Paris", "Atlantis", "london "])
+
+    assert sorted(geocoded) == ["Atlantis", "London", "Paris"]
+    assert len(client.requests) == 1
+    assert client.requests[0]["latitude"] == "51.5,48.85"
+
+    london, paris, atlantis, london_again = result["results"]
+    assert london["current"]["temperature_2m"] == 51.5
+    assert paris["current"]["temperature_2m"] == 48.85
+    assert atlantis == {"location": "Atlantis", "error": "No geocoding results found"}
+    assert london_again["location"] == "london "
+    assert london_again["current"] == london["current"]
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_oversized_requests():
+    result = await tool.get_weather_batch(["x"] * (tool.MAX_BATCH_LOCATIONS + 1))
+    assert "error" in result
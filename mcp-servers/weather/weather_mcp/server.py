@@ -1,5 +1,8 @@
 from fastmcp import FastMCP
-from weather_mcp.tool import get_weather
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from weather_mcp.tool import get_weather, get_weather_batch, open_meteo_limiter, weather_flight
+from weather_mcp.metrics import metrics_response
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -13,6 +16,24 @@ def main():
         """Return weather data for a location."""
         return await get_weather(location)
 
+    @mcp.tool
+    async def get_weather_batch_tool(locations: list[str]):
+        """Return weather data for several locations using a single upstream request."""
+        return await get_weather_batch(locations)
+
+    @mcp.custom_route("/stats", methods=["GET"])
+    async def stats(request: Request) -> JSONResponse:
+        """Request coalescing and rate limiter counters."""
+        return JSONResponse({
+            "singleflight": {"weather": weather_flight.stats()},
+            "rate_limit": {"open_meteo": open_meteo_limiter.stats()},
+        })
+
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def metrics(request: Request) -> Response:
+        """Prometheus metrics: upstream latency and rate-limit waits."""
+        return metrics_response()
+
     mcp.run(transport="http", host="0.0.0.0", port=50053)
     logger.info("Starting weather MCP WebSocket server on ws://0.0.0.0:50053")
 
@@ -1,7 +1,7 @@
 # weather_mcp/tool.py
 
-import time
 import asyncio
+import copy
 import logging
 from typing import List, Optional
 
@@ -9,6 +9,9 @@ import openmeteo_requests
 from pydantic import BaseModel, Field
 
 from weather_mcp.mcp_clients import call_geocoding
+from weather_mcp.metrics import acquire_observed, observe_upstream
+from weather_mcp.ratelimit import RateLimitExceeded, TokenBucket
+from weather_mcp.singleflight import SingleFlight
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("weather-mcp")
@@ -16,20 +19,26 @@ print("weather weather_mpc tool.py")
 
 
 # ============================================================
-# RATE LIMITING (1 request / second)
+# RATE LIMITING (token bucket: sustained rate + burst, FIFO)
 # ============================================================
 
-_last_request_ts = 0.0
-_rate_limit_lock = asyncio.Lock()
+# Open-Meteo's free tier allows 600 calls/minute; stay well inside it
+OPEN_METEO_RATE = 5.0        # tokens per second
+OPEN_METEO_BURST = 10
+OPEN_METEO_MAX_QUEUE = 200
+OPEN_METEO_MAX_WAIT = 30.0   # seconds; reject with a retry-after hint beyond this
 
-async def enforce_rate_limit():
-    global _last_request_ts
-    async with _rate_limit_lock:
-        now = time.time()
-        elapsed = now - _last_request_ts
-        if elapsed < 1.0:
-            await asyncio.sleep(1.0 - elapsed)
-        _last_request_ts = time.time()
+open_meteo_limiter = TokenBucket(
+    rate=OPEN_METEO_RATE,
+    burst=OPEN_METEO_BURST,
+    max_queue=OPEN_METEO_MAX_QUEUE,
+    max_wait=OPEN_METEO_MAX_WAIT,
+    name="Open-Meteo",
+)
+
+async def enforce_rate_limit() -> float:
+    """Wait for an Open-Meteo token. Raises RateLimitExceeded when the backlog is hopeless."""
+    return await acquire_observed(open_meteo_limiter, "open_meteo")
 
 
 # ============================================================
@@ -68,97 +77,59 @@ class WeatherResponse(BaseModel):
 # MAIN WEATHER FUNCTION
 # ============================================================
 
+# Concurrent requests for the same location share one geocode + Open-Meteo call
+weather_flight = SingleFlight("weather")
+
+
+def normalize_location(location: str) -> str:
+    return " ".join(location.lower().split())
+
+
 async def get_weather(location: str) -> dict:
-    """Get weather using geocoding MCP + Open-Meteo."""
+    """Get weather using geocoding MCP + Open-Meteo (coalescing identical concurrent requests)."""
 
     if not location or not isinstance(location, str):
         return {"error": "Invalid location input"}
 
+    result = await weather_flight.do(normalize_location(location), lambda: _fetch_weather(location))
+    # Each caller gets its own (deep) copy of the shared result, nested "current" included
+    own = copy.deepcopy(result)
+    if "error" not in own:
+        own["location"] = location
+    return own
+
+
+async def _fetch_weather(location: str) -> dict:
+    """Geocode `location` and fetch its current weather from Open-Meteo."""
+
     # -----------------------------------------
     # 1. GEOCODE LOCATION
     # -----------------------------------------
     geocode = await call_geocoding(location)
-    if "error" in geocode:
-        return {"error": geocode["error"]}
-
-    latitude = geocode.get("latitude")
-    longitude = geocode.get("longitude")
-
-    if not latitude or not longitude:
-        return {"error": "Geocoding returned no coordinates"}
+    coords = _coordinates(geocode)
+    if "error" in coords:
+        return coords
 
     # -----------------------------------------
     # 2. RATE LIMIT
     # -----------------------------------------
-    await enforce_rate_limit()
+    try:
+        await enforce_rate_limit()
+    except RateLimitExceeded as e:
+        logger.warning(f"Weather MCP rejected request: {e}")
+        return {"error": str(e), "retry_after": round(e.retry_after, 1)}
 
     # -----------------------------------------
     # 3. OPEN-METEO REQUEST
     # -----------------------------------------
     try:
-        client = openmeteo_requests.AsyncClient()
-        url = "https://api.open-meteo.com/v1/forecast"
-
-        params = {
-            "latitude": latitude,
-            "longitude": longitude,
-
-            # ---- CURRENT ----
-            "current": [
-                "temperature_2m",
-                "relative_humidity_2m",
-                "apparent_temperature",
-                "is_day",
-                "precipitation",
-                "rain",
-                "showers",
-                "snowfall",
-                "weather_code",
-                "cloud_cover",
-                "pressure_msl",
-                "surface_pressure",
-                "wind_speed_10m",
-                "wind_direction_10m",
-                "wind_gusts_10m",
-            ],
-        }
-
-        responses = await client.weather_api(url, params=params)
-        r = responses[0]
-
-        current = r.Current()
-        #daily = r.Daily()
-        #hourly = r.Hourly()
-
-        # -----------------------------------------
-        # EXTRACT CURRENT
-        # -----------------------------------------
-        curr = CurrentWeather(
-            temperature_2m=current.Variables(0).Value(),
-            relative_humidity_2m=current.Variables(1).Value(),
-            apparent_temperature=current.Variables(2).Value(),
-            is_day=bool(current.Variables(3).Value()),
-            precipitation=current.Variables(4).Value(),
-            rain=current.Variables(5).Value(),
-            showers=current.Variables(6).Value(),
-            snowfall=current.Variables(7).Value(),
-            weather_code=int(current.Variables(8).Value()),
-            cloud_cover=current.Variables(9).Value(),
-            pressure_msl=current.Variables(10).Value(),
-            surface_pressure=current.Variables(11).Value(),
-            wind_speed_10m=current.Variables(12).Value(),
-            wind_direction_10m=current.Variables(13).Value(),
-            wind_gusts_10m=current.Variables(14).Value(),
-        )
+        responses = await _fetch_current([coords["latitude"]], [coords["longitude"]])
 
-        # -----------------------------------------
-        # MODEL VALIDATION & RETURN
-        # -----------------------------------------
         validated = WeatherResponse(
             location=location,
-            latitude=float(latitude),
-            longitude=float(longitude),
-            current=curr,
+            latitude=float(coords["latitude"]),
+            longitude=float(coords["longitude"]),
+            current=_decode_current(responses[0]),
         )
 
         return validated.model_dump()
@@ -166,3 +137,160 @@ async def get_weather(location: str) -> dict:
     except Exception as e:
         logger.error(f"Weather MCP error: {e}")
         return {"error": str(e)}
+
+
+# ============================================================
+# BATCH WEATHER FUNCTION
+# ============================================================
+
+# Open-Meteo accepts up to 1000 coordinates per request; keep batches modest
+MAX_BATCH_LOCATIONS = 50
+
+
+async def get_weather_batch(locations: List[str]) -> dict:
+    """
+    Weather for several locations: geocode them concurrently, then fetch every
+    forecast in a single Open-Meteo request.
+
+    Returns {"results": [...]} in input order; each item is a WeatherResponse
+    dict or {"location", "error"} for locations that could not be resolved.
+    """
+
+    if not isinstance(locations, list) or not locations:
+        return {"error": "locations must be a non-empty list of strings"}
+    if len(locations) > MAX_BATCH_LOCATIONS:
+        return {"error": f"At most {MAX_BATCH_LOCATIONS} locations per batch"}
+
+    # -----------------------------------------
+    # 1. GEOCODE (once per distinct location, concurrently)
+    # -----------------------------------------
+    unique: dict = {}
+    for location in locations:
+        if location and isinstance(location, str):
+            unique.setdefault(normalize_location(location), location)
+
+    geocodes = await asyncio.gather(
+        *(call_geocoding(location) for location in unique.values()),
+        return_exceptions=True,
+    )
+    coords = {
+        key: _coordinates(g) if not isinstance(g, BaseException) else {"error": str(g)}
+        for key, g in zip(unique, geocodes)
+    }
+    resolved = [key for key, c in coords.items() if "error" not in c]
+
+    # -----------------------------------------
+    # 2. ONE RATE-LIMITED OPEN-METEO REQUEST FOR ALL COORDINATES
+    # -----------------------------------------
+    current: dict = {}
+    if resolved:
+        try:
+            await enforce_rate_limit()
+        except RateLimitExceeded as e:
+            logger.warning(f"Weather MCP rejected batch request: {e}")
+            return {"error": str(e), "retry_after": round(e.retry_after, 1)}
+
+        try:
+            responses = await _fetch_current(
+                [coords[key]["latitude"] for key in resolved],
+                [coords[key]["longitude"] for key in resolved],
+            )
+            # Responses come back in the order the coordinates were sent
+            current = {key: _decode_current(r) for key, r in zip(resolved, responses)}
+        except Exception as e:
+            logger.error(f"Weather MCP batch error: {e}")
+            return {"error": str(e)}
+
+    # -----------------------------------------
+    # 3. ASSEMBLE RESULTS IN INPUT ORDER
+    # -----------------------------------------
+    results = []
+    for location in locations:
+        key = normalize_location(location) if isinstance(location, str) and location else None
+        if key is None:
+            results.append({"location": location, "error": "Invalid location input"})
+        elif key not in current:
+            results.append({"location": location, "error": coords[key]["error"]})
+        else:
+            results.append(
+                WeatherResponse(
+                    location=location,
+                    latitude=float(coords[key]["latitude"]),
+                    longitude=float(coords[key]["longitude"]),
+                    current=current[key],
+                ).model_dump()
+            )
+
+    return {"results": results}
+
+
+# ============================================================
+# OPEN-METEO HELPERS
+# ============================================================
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Order matters: _decode_current reads the variables back by index
+CURRENT_VARIABLES = [
+    "temperature_2m",
+    "relative_humidity_2m",
+    "apparent_temperature",
+    "is_day",
+    "precipitation",
+    "rain",
+    "showers",
+    "snowfall",
+    "weather_code",
+    "cloud_cover",
+    "pressure_msl",
+    "surface_pressure",
+    "wind_speed_10m",
+    "wind_direction_10m",
+    "wind_gusts_10m",
+]
+
+_client: Optional[openmeteo_requests.AsyncClient] = None
+
+
+def get_open_meteo_client() -> openmeteo_requests.AsyncClient:
+    """Shared Open-Meteo client, created on first use."""
+    global _client
+    if _client is None:
+        _client = openmeteo_requests.AsyncClient()
+    return _client
+
+
+def _coordinates(geocode: dict) -> dict:
+    """Pull latitude/longitude out of a geocoding result, or return {"error": ...}."""
+    if "error" in geocode:
+        return {"error": geocode["error"]}
+
+    latitude = geocode.get("latitude")
+    longitude = geocode.get("longitude")
+
+    if not latitude or not longitude:
+        return {"error": "Geocoding returned no coordinates"}
+    return {"latitude": latitude, "longitude": longitude}
+
+
+async def _fetch_current(latitudes: List[float], longitudes: List[float]) -> list:
+    """One Open-Meteo request for any number of coordinates; one response per coordinate."""
+    params = {
+        "latitude": ",".join(str(lat) for lat in latitudes),
+        "longitude": ",".join(str(lon) for lon in longitudes),
+        "current": CURRENT_VARIABLES,
+    }
+    with observe_upstream("open_meteo"):
+        responses = await get_open_meteo_client().weather_api(OPEN_METEO_URL, params=params)
+    if len(responses) != len(latitudes):
+        raise ValueError(f"Open-Meteo returned {len(responses)} responses for {len(latitudes)} locations")
+    return responses
+
+
+def _decode_current(response) -> CurrentWeather:
+    """Decode the flatbuffer `current` block of one WeatherApiResponse."""
+    current = response.Current()
+    values = {name: current.Variables(i).Value() for i, name in enumerate(CURRENT_VARIABLES)}
+    values["is_day"] = bool(values["is_day"])
+    values["weather_code"] = int(values["weather_code"])
+    return CurrentWeather(**values)